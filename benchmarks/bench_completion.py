@@ -0,0 +1,56 @@
+"""
+Benchmark completing `craft new <TAB>` from the name index,
+compared to an interpreter that does nothing.
+
+Run from the root of the repository:
+
+    python -m benchmarks.bench_completion
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from craft_documents.configuration.Configuration import Configuration
+from craft_documents.templates.NameIndex import NameIndex
+from craft_documents.templates.TemplateManager import TemplateManager
+from benchmarks.bench_validation import create_library
+
+
+def run(code: str, environment: dict[str, str], runs: int) -> float:
+    start = time.perf_counter()
+    for _ in range(runs):
+        subprocess.run(
+            [sys.executable, "-c", code],
+            env=environment,
+            check=True,
+            stdout=subprocess.DEVNULL,
+        )
+    return (time.perf_counter() - start) / runs
+
+
+if __name__ == "__main__":
+    runs = 20
+
+    with tempfile.TemporaryDirectory() as directory:
+        folder = Path(directory) / ".config/craft"
+        create_library(folder, 500)
+        configuration = Configuration(main=folder / "craftrc", root=folder, cwd=folder)
+        NameIndex(folder).update(TemplateManager(configuration))
+
+        environment = os.environ | {
+            "HOME": directory,
+            NameIndex.variable: "complete_bash",
+            "COMP_WORDS": "craft new ",
+            "COMP_CWORD": "2",
+        }
+        baseline = run("pass", environment, runs)
+        completion = run(
+            "from craft_documents.cli import main; main()", environment, runs
+        )
+
+        print("%-20s %.2fms" % ("interpreter", baseline * 1000))
+        print("%-20s %.2fms" % ("completion", completion * 1000))
@@ -0,0 +1,32 @@
+"""
+Benchmark generating the values of placeholders for 100k variants.
+
+Run from the root of the repository:
+
+    python -m benchmarks.bench_generators [variants]
+"""
+
+import sys
+import time
+
+from craft_documents.common import Generator as module
+from craft_documents.common.Generator import Generator
+
+specs = {
+    "points": {"integers": [1, 10]},
+    "factor": {"uniform": [0.5, 1.5], "decimals": 2},
+    "interval-count": {"choices": [3, 4, 5, 6], "weights": [1, 2, 2, 1]},
+}
+
+
+if __name__ == "__main__":
+    variants = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    backend = "numpy" if module.numpy is not None else "random"
+
+    print("%d variants (%s)" % (variants, backend))
+    for name, spec in specs.items():
+        generator = Generator(name, spec, seed=1)
+        start = time.perf_counter()
+        generator.reserve(variants)
+        seconds = time.perf_counter() - start
+        print("%-20s %.2fms" % (name, seconds * 1000))
@@ -0,0 +1,67 @@
+"""
+Benchmark parsing a synthetic library of 5,000 exercises.
+
+Run from the root of the repository:
+
+    python -m benchmarks.bench_template_manager [exercises] [workers]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from craft_documents.configuration.Configuration import Configuration
+from craft_documents.templates.TemplateManager import TemplateManager
+
+EXERCISE = r"""
+\documentclass[../preambles/default.tex]{subfiles}
+
+\iffalse
+semester:
+  message: Which semester?
+number:
+  message: Which number?
+\fi
+
+\begin{document}
+% <<semester>>
+Exercise <<number>>: name the interval between <<first>> and <<second>>.
+\end{document}
+"""
+
+
+def create_library(folder: Path, exercises: int):
+    for directory in ["preambles", "headers", "exercises"]:
+        (folder / directory).mkdir(parents=True)
+    (folder / "preambles/default.tex").write_text(r"\documentclass{scrreport}")
+    (folder / "headers/exam.tex").write_text("<<craft-exercises>>")
+    for i in range(exercises):
+        (folder / ("exercises/%05d.tex" % i)).write_text(EXERCISE)
+
+
+def measure(folder: Path, **settings) -> float:
+    configuration = Configuration(
+        main=folder / "craftrc", root=folder, cwd=folder, **settings
+    )
+    start = time.perf_counter()
+    TemplateManager(configuration)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    exercises = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1
+
+    with tempfile.TemporaryDirectory() as directory:
+        folder = Path(directory)
+        create_library(folder, exercises)
+
+        sequential = measure(folder, parse_workers=1)
+        print("%d exercises" % exercises)
+        print("%-20s %.2fs" % ("sequential", sequential))
+        for executor in ["thread", "process"]:
+            seconds = measure(folder, parse_workers=workers, parse_executor=executor)
+            name = "%d %s workers" % (workers, executor)
+            print("%-20s %.2fs (%.1fx)" % (name, seconds, sequential / seconds))
@@ -0,0 +1,44 @@
+"""
+Benchmark validating a configuration that lists 500 exercises.
+
+Run from the root of the repository:
+
+    python -m benchmarks.bench_validation [exercises]
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from craft_documents.configuration.Configuration import Configuration
+
+
+def create_library(folder: Path, exercises: int):
+    for directory in ["preambles", "headers", "exercises"]:
+        (folder / directory).mkdir(parents=True)
+    (folder / "preambles/default.tex").write_text(r"\documentclass{scrreport}")
+    (folder / "headers/exam.tex").write_text("<<craft-exercises>>")
+    for i in range(exercises):
+        (folder / ("exercises/%05d.tex" % i)).write_text("<<number>>")
+
+
+if __name__ == "__main__":
+    exercises = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    runs = 20
+
+    with tempfile.TemporaryDirectory() as directory:
+        folder = Path(directory)
+        create_library(folder, exercises)
+        settings = {
+            "header": "exam",
+            "craft-exercises": ["%05d" % i for i in range(exercises)],
+        }
+
+        start = time.perf_counter()
+        for _ in range(runs):
+            Configuration(main=folder / "craftrc", root=folder, cwd=folder, **settings)
+        seconds = (time.perf_counter() - start) / runs
+
+        print("%d exercises" % exercises)
+        print("%-20s %.2fms" % ("validation", seconds * 1000))
@@ -0,0 +1,27 @@
+import os
+from pathlib import Path
+
+from craft_documents.templates.NameIndex import NameIndex
+
+
+def main():
+    """
+    The entry point of `craft`. Shell completion is answered from
+    the cached names of the templates before the CLI and all the
+    templates are loaded.
+    """
+    if NameIndex.variable in os.environ:
+        completion = NameIndex(Path.home() / ".config/craft").complete(os.environ)
+        if completion is not None:
+            print(completion)
+            return
+
+    from craft_documents.main import app
+    from craft_documents.new.main import subcommands
+
+    # The CLI answers the completions the index couldn't, update it for the next ones
+    if NameIndex.variable in os.environ:
+        template_manager = subcommands.template_manager
+        NameIndex(template_manager.folder.path).update(template_manager)
+
+    app()
@@ -0,0 +1,70 @@
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+
+class AnswersCache:
+    """
+    The last answers to the prompts of every template, kept by
+    project folder and header:
+
+    ```json
+    {
+        "/home/me/courses/he-2": {
+            "exam": {
+                "exercise/intervals-1": {
+                    "placeholders": ["interval-count", "points"],
+                    "answers": {"interval-count": "3", "points": "2"}
+                }
+            }
+        }
+    }
+    ```
+
+    An entry expires once the placeholders of its template
+    change. Without a `path` nothing is kept between runs.
+    """
+
+    def __init__(self, project: Path, path: Path | None = None):
+        self.project = str(project)
+        self.path = path
+        self._entries: dict[str, dict[str, Any]] = {}
+        self._changed = False
+        self.load()
+
+    def recall(self, scope: str, key: str, placeholders: list[str]) -> dict[str, Any]:
+        """The answers of `key` in `scope`, if its placeholders didn't change."""
+        entry = self._entries.get(self.project, {}).get(scope, {}).get(key, {})
+        if entry.get("placeholders") != sorted(placeholders):
+            return {}
+        return dict(entry["answers"])
+
+    def remember(
+        self, scope: str, key: str, placeholders: list[str], answers: dict[str, Any]
+    ):
+        entry = {"placeholders": sorted(placeholders), "answers": answers}
+        scopes = self._entries.setdefault(self.project, {})
+        if scopes.get(scope, {}).get(key) != entry:
+            scopes.setdefault(scope, {})[key] = entry
+            self._changed = True
+
+    def load(self):
+        if self.path is None or not self.path.is_file():
+            return
+        try:
+            entries = json.loads(self.path.read_text())
+        except ValueError:
+            return
+        if isinstance(entries, dict):
+            self._entries = entries
+
+    def save(self):
+        """Write the answers to `path` atomically, if they changed."""
+        if self.path is None or not self._changed:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.path.with_name(".%s.%d.tmp" % (self.path.name, os.getpid()))
+        temporary.write_text(json.dumps(self._entries, indent=2, sort_keys=True))
+        os.replace(temporary, self.path)
+        self._changed = False
@@ -0,0 +1,96 @@
+import tarfile
+import threading
+import zipfile
+from pathlib import Path
+from typing import Any
+
+from craft_documents.common.MemoryStorage import MemoryStorage
+
+
+class ArchiveStorage(MemoryStorage):
+    """
+    Files and folders in a zip or tar archive.
+
+    The archive is opened once and its members are read on
+    demand without extracting the archive. The members are
+    relative to `root`. The storage is read-only.
+
+    The archive is closed with `close()`, when the storage is
+    used as a context manager or when it is garbage collected.
+    """
+
+    _zip: zipfile.ZipFile | None = None
+    _tar: tarfile.TarFile | None = None
+
+    read_only = True
+
+    @property
+    def archive(self) -> Path:
+        return self._archive
+
+    def __init__(self, archive: Path, root: Path):
+        super().__init__(root=root)
+        self._archive = archive
+        self.open_archive()
+
+    def open_archive(self):
+        self._lock = threading.Lock()
+
+        if zipfile.is_zipfile(self.archive):
+            self._zip = zipfile.ZipFile(self.archive)
+            self._tar = None
+            for info in self._zip.infolist():
+                if info.is_dir():
+                    self.add_folder(info.filename.rstrip("/"))
+                else:
+                    self.add(info.filename, info)
+        else:
+            self._zip = None
+            self._tar = tarfile.open(self.archive)
+            for member in self._tar.getmembers():
+                if member.isdir():
+                    self.add_folder(member.name.rstrip("/"))
+                elif member.isfile():
+                    self.add(member.name, member)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def __del__(self):
+        self.close()
+
+    def close(self):
+        """Close the archive. Its members can't be read afterwards."""
+        if self._zip is not None:
+            self._zip.close()
+            self._zip = None
+        if self._tar is not None:
+            self._tar.close()
+            self._tar = None
+
+    def read(self, entry: Any) -> bytes:
+        with self._lock:
+            if self._zip is not None:
+                return self._zip.read(entry)
+            else:
+                return self._tar.extractfile(entry).read()  # type: ignore
+
+    def entry_size(self, entry: Any) -> int:
+        if isinstance(entry, zipfile.ZipInfo):
+            return entry.file_size
+        else:
+            return entry.size
+
+    def __getstate__(self) -> dict:
+        """Reopen the archive instead of pickling it."""
+        return {"_archive": self._archive, "_root": self._root}
+
+    def __setstate__(self, state: dict):
+        self._root = state["_root"]
+        self._archive = state["_archive"]
+        self._entries = {}
+        self._children = {"": set()}
+        self.open_archive()
@@ -0,0 +1,93 @@
+import os
+from pathlib import Path
+from typing import BinaryIO
+
+from craft_documents.common.DirectoryStorage import DirectoryStorage
+from craft_documents.common.Storage import Storage
+
+
+class CachedStorage(Storage):
+    """
+    Wraps another storage and remembers the results of
+    `resolve()`, `is_file()` and `is_dir()`.
+
+    It is meant to be short-lived, e.g. for one validation of
+    the configuration, where the same paths are checked by
+    several validators. Writes through the wrapper clear the
+    cache.
+
+    Paths on the disk are resolved from their resolved parent,
+    so the folders of many files in the same folder are only
+    walked once.
+    """
+
+    @property
+    def storage(self) -> Storage:
+        return self._storage
+
+    @property
+    def read_only(self) -> bool:  # type: ignore
+        return self.storage.read_only
+
+    def __init__(self, storage: Storage):
+        self._storage = storage
+        self.clear()
+
+    def clear(self):
+        self._resolved: dict[Path, Path] = {}
+        self._files: dict[Path, bool] = {}
+        self._dirs: dict[Path, bool] = {}
+
+    def resolve(self, path: Path) -> Path:
+        if path not in self._resolved:
+            self._resolved[path] = self.resolve_from_parent(path)
+        return self._resolved[path]
+
+    def resolve_from_parent(self, path: Path) -> Path:
+        if not isinstance(self.storage, DirectoryStorage) or path.name in ("", ".."):
+            return self.storage.resolve(path)
+
+        candidate = self.resolve(path.parent) / path.name
+        if os.path.islink(candidate):
+            return self.storage.resolve(candidate)
+        return candidate
+
+    def is_file(self, path: Path) -> bool:
+        if path not in self._files:
+            self._files[path] = self.storage.is_file(path)
+        return self._files[path]
+
+    def is_dir(self, path: Path) -> bool:
+        if path not in self._dirs:
+            self._dirs[path] = self.storage.is_dir(path)
+        return self._dirs[path]
+
+    def iterdir(self, path: Path) -> tuple[list[Path], list[Path]]:
+        return self.storage.iterdir(path)
+
+    def size(self, path: Path) -> int:
+        return self.storage.size(path)
+
+    def open(self, path: Path) -> BinaryIO:
+        return self.storage.open(path)
+
+    def read_text(self, path: Path) -> str:
+        return self.storage.read_text(path)
+
+    def write_text(self, path: Path, contents: str):
+        self.clear()
+        self.storage.write_text(path, contents)
+
+    def mkdir(self, path: Path):
+        self.clear()
+        self.storage.mkdir(path)
+
+    def contains(self, path: Path, pattern: str) -> bool:
+        return self.storage.contains(path, pattern)
+
+    def copy(self, path: Path, target: Path):
+        self.clear()
+        self.storage.copy(path, target)
+
+    def map(self, path: Path):
+        return self.storage.map(path)
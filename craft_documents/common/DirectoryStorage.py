@@ -0,0 +1,77 @@
+import mmap
+import os
+import threading
+from pathlib import Path
+from typing import BinaryIO
+
+from craft_documents.common.helpers import copy_file, file_contains
+from craft_documents.common.Storage import Storage
+
+
+class DirectoryStorage(Storage):
+    """
+    Files and folders in a directory on the disk.
+    """
+
+    def resolve(self, path: Path) -> Path:
+        return path.resolve()
+
+    def is_file(self, path: Path) -> bool:
+        return path.is_file()
+
+    def is_dir(self, path: Path) -> bool:
+        return path.is_dir()
+
+    def iterdir(self, path: Path) -> tuple[list[Path], list[Path]]:
+        files: list[Path] = []
+        folders: list[Path] = []
+
+        # The types of the entries are cached by `scandir`, so this
+        # only needs one system call for the whole folder.
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    files.append(path / entry.name)
+                elif entry.is_dir():
+                    folders.append(path / entry.name)
+
+        return files, folders
+
+    def size(self, path: Path) -> int:
+        return path.stat().st_size
+
+    def open(self, path: Path) -> BinaryIO:
+        return path.open("rb")
+
+    def read_text(self, path: Path) -> str:
+        with path.open("r") as file:
+            return file.read()
+
+    def write_text(self, path: Path, contents: str):
+        """
+        Replace the file atomically, so readers never see a
+        half-written file and hard links to it are not changed.
+        """
+        temporary = path.with_name(
+            ".%s.%d-%d.tmp" % (path.name, os.getpid(), threading.get_ident())
+        )
+        try:
+            temporary.write_text(contents)
+            os.replace(temporary, path)
+        finally:
+            temporary.unlink(missing_ok=True)
+
+    def mkdir(self, path: Path):
+        path.mkdir(parents=True, exist_ok=True)
+
+    def contains(self, path: Path, pattern: str) -> bool:
+        return file_contains(path, pattern)
+
+    def copy(self, path: Path, target: Path):
+        copy_file(path, target)
+
+    def map(self, path: Path) -> mmap.mmap | None:
+        with path.open("rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return None
+            return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
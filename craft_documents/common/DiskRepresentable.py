@@ -2,6 +2,9 @@ from abc import abstractmethod
 from pathlib import Path
 from typing import Protocol
 
+from craft_documents.common.DirectoryStorage import DirectoryStorage
+from craft_documents.common.Storage import Storage
+
 
 class DiskRepresentable(Protocol):
     """
@@ -10,9 +13,17 @@ class DiskRepresentable(Protocol):
     Conforming types:
     - Folder (ABC)
     - File (ABC)
+
+    The data is loaded through `storage`, which defaults
+    to the directories on the disk.
     """
 
     _path: Path
+    _storage: Storage = DirectoryStorage()
+
+    @property
+    def storage(self) -> Storage:
+        return self._storage
 
     @property
     def path(self) -> Path:
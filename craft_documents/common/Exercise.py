@@ -4,7 +4,8 @@ from pathlib import Path
 from rich import print
 
 from craft_documents.common.helpers import create_list
-from craft_documents.common.Prompter import Prompter
+from craft_documents.common.RawFile import RawFile
+from craft_documents.common.Scope import Scope
 from craft_documents.common.Template import Template
 from craft_documents.common.TexTemplate import TexTemplate
 from craft_documents.configuration.Configuration import Configuration
@@ -34,12 +35,14 @@ class Exercise(TexTemplate):
         return super().contents
 
     @property
-    def supplements(self) -> list[Template]:
-        return self._supplements
+    def supplements(self) -> list[Template | RawFile]:
+        """
+        The supplemental files of the exercise.
 
-    @property
-    def unique_placeholder_values(self) -> dict[str, str]:
-        return self._unique_placeholder_values
+        Only supplements containing placeholders are templates.
+        Any other supplement is a raw file that is copied as it is.
+        """
+        return self._supplements
 
     @property
     def unique_placeholders(self) -> list[str]:
@@ -53,6 +56,17 @@ class Exercise(TexTemplate):
     def disambiguation_suffix(self, newValue: int):
         self._disambiguation_suffix = newValue
 
+    @property
+    def name(self) -> str:
+        """
+        The path relative to the exercises folder without the
+        suffix, for example `harmony/cadences/v-i`.
+        """
+        exercises = self.configuration.library.root / "exercises"
+        if self.path.is_relative_to(exercises):
+            return self.path.relative_to(exercises).with_suffix("").as_posix()
+        return self.path.stem
+
     @property
     def disambiguated_name(self) -> str:
         if self.disambiguation_suffix is None:
@@ -60,6 +74,11 @@ class Exercise(TexTemplate):
         else:
             return self.name + "-" + str(self.disambiguation_suffix)
 
+    @property
+    def answers_key(self) -> str:
+        """Every copy of the exercise remembers its own answers."""
+        return "exercise/" + self.disambiguated_name
+
     def __init__(self, path: Path, configuration: Configuration):
         """
         Initialize `self` as the tex-template.
@@ -72,13 +91,10 @@ class Exercise(TexTemplate):
 
         self._disambiguation_suffix = None
 
-        self._supplements: list[Template] = []
+        self._supplements: list[Template | RawFile] = []
         for path in create_list(self.yaml.get("supplements", [])):
-            self._supplements.append(
-                Template(self.configuration, self.path.parent / path)
-            )
+            self._supplements.append(self.create_supplement(self.path.parent / path))
 
-        self._unique_placeholder_values: dict[str, str] = {}
         self._unique_placeholders = create_list(
             self.yaml.get("unique-placeholders", [])
         )
@@ -86,34 +102,70 @@ class Exercise(TexTemplate):
         self.remove_documentclass()
         self.remove_include_preamble()
 
+    def create_supplement(self, path: Path) -> Template | RawFile:
+        """
+        Create a template for the supplement at `path` if it
+        contains placeholders or its comments are removed.
+
+        Supplements with a binary extension or an extension
+        without tokens are never scanned.
+        """
+        tokens = self.configuration.settings.tokens.get(path.suffix, None)  # type: ignore
+        if (
+            path.suffix.lower() in self.configuration.binary_extensions
+            or tokens is None
+        ):
+            return RawFile(path, storage=self.storage)
+
+        if self.configuration.settings.remove_comments or self.storage.contains(
+            path, tokens["placeholder_prefix"]
+        ):
+            return Template(self.configuration, path)
+        else:
+            return RawFile(path, storage=self.storage)
+
+    def attach(self, configuration: Configuration):
+        super().attach(configuration)
+        for supplement in self.supplements:
+            if isinstance(supplement, Template):
+                supplement.attach(configuration)
+            else:
+                supplement._storage = self.storage
+
     def load(self):
         """
         Load the contents of the exercise template.
         """
-        with self.path.open() as file:
-            self._contents = file.read()
-            self._disk_contents = self.contents
+        self._contents = self.storage.read_text(self.path)
+        self._disk_contents = self.contents
 
-    def resolve_placeholders(self):
+    def resolve_placeholders(self, scope: Scope) -> Scope:
+        """
+        Prompt for the values of the placeholders and return the
+        scope of this copy of the exercise.
+
+        Answers to the unique placeholders, or to all of them with
+        `unique_exercise_placeholders`, only go into the layer of
+        the copy and are prompted for every copy. Other answers go
+        into `scope` and are shared with the following exercises.
+        """
         if self.configuration.unique_exercise_placeholders:
-            prompter = Prompter(self.unique_placeholder_values)
-            prompter.ask(self.prompts)
-            self.set_placeholders(self.unique_placeholder_values)
+            values = Scope()
+            self.ask(self.prompts, values)
         else:
-            # unique placeholders should always be prompted for
-            for placeholder in self.unique_placeholders:
-                self.configuration.pop(placeholder, None)
+            shared = [
+                p for p in self.prompts if p["name"] not in self.unique_placeholders
+            ]
+            self.ask(shared, scope)
 
-            prompter = Prompter(self.configuration)
-            prompter.ask(self.prompts)
-            self.set_placeholders(self.configuration)
+            # unique placeholders should always be prompted for
+            unique = [p for p in self.prompts if p["name"] in self.unique_placeholders]
+            copy: dict[str, str] = {}
+            self.ask(unique, copy)
+            values = scope.new_child(copy)
 
-    def clean_resolve_placeholders(self):
-        if self.configuration.unique_exercise_placeholders:
-            self._unique_placeholder_values = {}
-        else:
-            for placeholder in self.unique_placeholders:
-                self.configuration.pop(placeholder, None)
+        self.set_placeholders(values)
+        return values
 
     def rename_supplements(self):
         """
@@ -128,7 +180,7 @@ class Exercise(TexTemplate):
                 pattern, self.disambiguate_supplement(supplement), self.contents
             )
 
-    def disambiguate_supplement(self, supplement: Template) -> str:
+    def disambiguate_supplement(self, supplement: Template | RawFile) -> str:
         """
         Create a disambiguated name for the given supplement.
         """
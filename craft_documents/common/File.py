@@ -1,8 +1,13 @@
-import re
+import copy
+import hashlib
+import mmap
 from abc import ABC
 from pathlib import Path
+from typing import Callable
 
 from craft_documents.common.DiskRepresentable import DiskRepresentable
+from craft_documents.common.Lexer import Lexer
+from craft_documents.common.Storage import Storage
 
 
 class File(ABC, DiskRepresentable):
@@ -14,19 +19,60 @@ class File(ABC, DiskRepresentable):
 
     Subclasses should remember to call `super().__init__()`
     if they implement their own initializer.
+
+    ### Memory mapping
+
+    Files of at least `memory_map_threshold` bytes are mapped
+    into memory instead of being read. Their contents are only
+    decoded once `.contents` is accessed. Until then, subclasses
+    can scan the bytes in `_mapping` and `write()` streams them
+    to the target. `close()` releases the mapping, which also
+    happens when the file is used as a context manager. Copies
+    map the file again instead of decoding it.
     """
 
-    _contents: str
-    _disk_contents: str
+    _contents: str | None = None
+    _disk_contents: str | None = None
+    _mapping: mmap.mmap | None = None
+    _memory_map_threshold: int | None = None
+    # The contents that `_fingerprint` was computed for
+    _fingerprinted: str | None = None
+    _fingerprint: str | None = None
+    # Attributes that copies share instead of copying them
+    _shared_attributes: tuple[str, ...] = ("_mapping", "_storage")
 
     @property
     def contents(self) -> str:
-        return self._contents
+        if self._contents is None and self._mapping is not None:
+            self._contents = self.decode()
+        return self._contents  # type: ignore
 
     @property
     def disk_contents(self) -> str:
         """Should always return the contents on the disk."""
-        return self._disk_contents
+        if self._disk_contents is None and self._mapping is not None:
+            self._disk_contents = self._mapping[:].decode()
+        return self._disk_contents  # type: ignore
+
+    @property
+    def is_memory_mapped(self) -> bool:
+        """Whether the contents have not been decoded from the mapping."""
+        return self._contents is None and self._mapping is not None
+
+    @property
+    def fingerprint(self) -> str:
+        """
+        Hash of the current contents. It is only computed again
+        once the contents changed.
+        """
+        if self.is_memory_mapped:
+            digest = hashlib.sha256()
+            self.stream(digest.update)
+            return digest.hexdigest()
+        if self._fingerprinted is not self.contents:
+            self._fingerprint = hashlib.sha256(self.contents.encode()).hexdigest()
+            self._fingerprinted = self.contents
+        return self._fingerprint  # type: ignore
 
     @property
     def extension(self) -> str:
@@ -36,14 +82,103 @@ class File(ABC, DiskRepresentable):
     def parent(self) -> Path:
         return self.path.parent
 
-    def __init__(self, path: Path):
-        self._path = path.resolve()
+    def __init__(
+        self,
+        path: Path,
+        memory_map_threshold: int | None = None,
+        storage: Storage | None = None,
+    ):
+        if storage is not None:
+            self._storage = storage
+        self._path = self.storage.resolve(path)
+        self._memory_map_threshold = memory_map_threshold
         self.load()
 
+    def __getstate__(self) -> dict:
+        """
+        Decode mapped contents and drop the storage, so the file
+        can be sent to another process. The storage is restored
+        by the owner of the file.
+        """
+        state = self.__dict__.copy()
+        if self.is_memory_mapped:
+            state["_contents"] = self.decode()
+            state["_disk_contents"] = self.disk_contents
+        state.pop("_mapping", None)
+        state.pop("_storage", None)
+        return state
+
+    def __deepcopy__(self, memo: dict):
+        """
+        Copy the file without decoding mapped contents. The copy
+        maps the file again, so it can be closed on its own.
+        """
+        clone = type(self).__new__(type(self))
+        memo[id(self)] = clone
+        for name, value in self.__dict__.items():
+            if name not in self._shared_attributes:
+                value = copy.deepcopy(value, memo)
+            clone.__dict__[name] = value
+
+        if self._mapping is not None:
+            clone._mapping = self.storage.map(self.path)
+            if clone._mapping is None:
+                clone._contents = self.decode()
+                clone._disk_contents = self._mapping[:].decode()
+        return clone
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def __del__(self):
+        self.close()
+
+    def close(self):
+        """
+        Release the mapping of the contents. Contents that were
+        not decoded can't be read afterwards.
+        """
+        if self._mapping is not None:
+            self._mapping.close()
+            self._mapping = None
+
     def load(self):
-        with self.path.open("r") as file:
-            self._contents = file.read()
-            self._disk_contents = self.contents
+        threshold = self._memory_map_threshold
+        if threshold is not None and self.storage.size(self.path) >= max(threshold, 1):
+            self._mapping = self.storage.map(self.path)
+            if self._mapping is not None:
+                return
+
+        self._contents = self.storage.read_text(self.path)
+        self._disk_contents = self.contents
+
+    def decode(self) -> str:
+        """
+        Decode the mapped contents.
+
+        Subclasses can override this to apply any changes
+        that were recorded while the contents were mapped.
+        """
+        return self._mapping[:].decode()  # type: ignore
+
+    def stream(self, write: Callable[[bytes], object]):
+        """
+        Pass the mapped contents to `write` without copying
+        them into a string.
+        """
+        with memoryview(self._mapping) as view:  # type: ignore
+            write(view)
+
+    def write(self, target: Path):
+        """Write the current contents to `target`."""
+        if self.is_memory_mapped:
+            with target.open("wb") as file:
+                self.stream(file.write)
+        else:
+            target.write_text(self.contents)
 
     def remove_lines(self, prefix: str):
         """
@@ -71,16 +206,14 @@ class File(ABC, DiskRepresentable):
         Paragraph after...  ──┤
         ```
         """
+        condensed, general = Lexer.line_patterns(prefix)
+
         # Handle `test_single_line_and_contents_condensed_leading` and
         # `test_multiple_lines_and_contents_condensed_leading` first
-        pattern = re.compile(
-            "(?<=[^\n]\n)(?:^%s.*?\n?)+(?:^\n)+(?=[^\n])" % prefix, re.MULTILINE
-        )
-        self._contents = re.sub(pattern, "\n", self.contents)
+        self._contents = condensed.sub("\n", self.contents)
 
         # General cases
-        pattern = re.compile("^%s.*\n*" % prefix, re.MULTILINE)
-        self._contents = re.sub(pattern, "", self.contents)
+        self._contents = general.sub("", self.contents)
 
     def remove_blocks(self, prefix: str, suffix: str):
         r"""
@@ -109,13 +242,10 @@ class File(ABC, DiskRepresentable):
         Paragraph after...  ──┤
         ```
         """
+        special, general = Lexer.block_patterns(prefix, suffix)
+
         # Special case
-        pattern = re.compile(
-            "(?s)(?<=[^\n]\n)(%s(?:.*?)%s\n)+^\n+?(?=[^\n])" % (prefix, suffix),
-            re.MULTILINE,
-        )
-        self._contents = re.sub(pattern, "\n", self.contents)
+        self._contents = special.sub("\n", self.contents)
 
         # General case
-        pattern = re.compile("(?s)^%s(.*?)%s\n*" % (prefix, suffix), re.MULTILINE)
-        self._contents = re.sub(pattern, "", self.contents)
+        self._contents = general.sub("", self.contents)
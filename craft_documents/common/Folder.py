@@ -1,9 +1,11 @@
 import os
 from abc import ABC
+from fnmatch import fnmatch
 from pathlib import Path
 from typing import List
 
 from craft_documents.common.DiskRepresentable import DiskRepresentable
+from craft_documents.common.Storage import Storage
 
 
 class Folder(ABC, DiskRepresentable):
@@ -22,8 +24,10 @@ class Folder(ABC, DiskRepresentable):
     def subfolders(self) -> List[Path]:
         return self._subfolders
 
-    def __init__(self, path: Path):
-        self._path = path.resolve()
+    def __init__(self, path: Path, storage: Storage | None = None):
+        if storage is not None:
+            self._storage = storage
+        self._path = self.storage.resolve(path)
         self.load()
 
     def load(self):
@@ -38,14 +42,71 @@ class Folder(ABC, DiskRepresentable):
         to create those properties or best call
         `super().load()`.
         """
-        self._subfiles: List[Path] = []
-        self._subfolders: List[Path] = []
-
-        for subpath in self.path.iterdir():
-            if subpath.is_file():
-                self._subfiles.append(subpath)
-            elif subpath.is_dir():
-                self._subfolders.append(subpath)
+        self._subfiles: List[Path]
+        self._subfolders: List[Path]
+
+        self._subfiles, self._subfolders = self.storage.iterdir(self.path)
+
+    def walk(self) -> List[Path]:
+        """
+        List all files in the folder and its subfolders.
+
+        Hidden files and folders are skipped, as well as those
+        matching a pattern in a `.craftignore` file. Its patterns
+        apply to the folder of the file and all its subfolders:
+
+        ```text
+        # A name anywhere below this folder
+        draft-*.tex
+        # A path relative to this folder
+        harmony/old/
+        ```
+
+        A pattern ending in `/` only matches folders.
+        """
+        files: List[Path] = []
+
+        def visit(path: Path, patterns: List[tuple[Path, str]]):
+            subfiles, subfolders = self.storage.iterdir(path)
+
+            ignore = path / ".craftignore"
+            if ignore in subfiles:
+                patterns = patterns + [
+                    (path, line.strip())
+                    for line in self.storage.read_text(ignore).splitlines()
+                    if line.strip() != "" and not line.startswith("#")
+                ]
+
+            for file in subfiles:
+                if not self.is_ignored(file, False, patterns):
+                    files.append(file)
+            for folder in subfolders:
+                if not self.is_ignored(folder, True, patterns):
+                    visit(folder, patterns)
+
+        visit(self.path, [])
+        return sorted(files)
+
+    def is_ignored(
+        self, path: Path, is_dir: bool, patterns: List[tuple[Path, str]]
+    ) -> bool:
+        if path.name.startswith("."):
+            return True
+
+        for base, pattern in patterns:
+            if pattern.endswith("/"):
+                if not is_dir:
+                    continue
+                pattern = pattern.rstrip("/")
+
+            if "/" in pattern:
+                relative = path.relative_to(base).as_posix()
+                if fnmatch(relative, pattern.lstrip("/")):
+                    return True
+            elif fnmatch(path.name, pattern):
+                return True
+
+        return False
 
     def open(self):
         """`open <self.path>`"""
@@ -0,0 +1,126 @@
+import json
+import random
+import zlib
+from collections import deque
+from typing import Any, Sequence
+
+try:
+    import numpy
+except ImportError:
+    numpy = None  # type: ignore
+
+
+class Generator:
+    """
+    Draws the values of a placeholder from its `generate:` spec
+    in the YAML of a template:
+
+    ```yaml
+    points:
+      generate:
+        integers: [1, 5]
+    interval-count:
+      generate:
+        choices: [3, 4, 5]
+        weights: [1, 2, 1]
+    factor:
+      generate:
+        uniform: [0.5, 1.5]
+        decimals: 2
+    ```
+
+    Integer ranges include both ends. The values are drawn in
+    batches with one vectorized call, using NumPy if it is
+    installed, and only depend on the seed, the name of the
+    placeholder and its spec.
+    """
+
+    kinds = ("integers", "uniform", "choices")
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    def __init__(self, name: str, spec: dict[str, Any], seed: int | None = None):
+        self._name = name
+        self._spec = spec
+        kinds = [kind for kind in self.kinds if kind in spec]
+        if len(kinds) != 1 or not self.is_valid(kinds[0], spec):
+            raise Exception("Couldn't read the generator of '%s': %s" % (name, spec))
+        self._kind = kinds[0]
+
+        key = zlib.crc32(("%s\0%s" % (name, json.dumps(spec, sort_keys=True))).encode())
+        if numpy is not None:
+            self._random = numpy.random.default_rng(
+                None if seed is None else [seed, key]
+            )
+        else:
+            self._random = random.Random(
+                None if seed is None else "%d:%d" % (seed, key)
+            )
+
+        self._values: deque[str] = deque()
+        self._batch = 1
+
+    @staticmethod
+    def is_valid(kind: str, spec: dict[str, Any]) -> bool:
+        match kind, spec[kind]:
+            case "integers", [int(low), int(high)]:
+                return low <= high
+            case "uniform", [int() | float() as low, int() | float() as high]:
+                return low <= high and isinstance(spec.get("decimals", 0), int)
+            case "choices", [_, *_] as choices:
+                weights = spec.get("weights", [1] * len(choices))
+                return (
+                    isinstance(weights, list)
+                    and len(weights) == len(choices)
+                    and all(isinstance(w, (int, float)) and w >= 0 for w in weights)
+                    and sum(weights) > 0
+                )
+        return False
+
+    def draw(self, count: int) -> list[str]:
+        """Draw `count` values at once."""
+        spec = self._spec
+        match self._kind:
+            case "integers":
+                low, high = spec["integers"]
+                if numpy is not None:
+                    values = self._random.integers(low, high, size=count, endpoint=True)
+                else:
+                    values = self._random.choices(range(low, high + 1), k=count)
+                return [str(value) for value in self.to_list(values)]
+            case "uniform":
+                low, high = spec["uniform"]
+                if numpy is not None:
+                    values = self._random.uniform(low, high, size=count)
+                else:
+                    values = [self._random.uniform(low, high) for _ in range(count)]
+                decimals = spec.get("decimals", 2)
+                return ["%.*f" % (decimals, value) for value in self.to_list(values)]
+            case _:
+                choices = [str(choice) for choice in spec["choices"]]
+                weights = spec.get("weights", None)
+                if numpy is not None:
+                    p = None
+                    if weights is not None:
+                        p = numpy.asarray(weights, dtype=float)
+                        p /= p.sum()
+                    indices = self._random.choice(len(choices), size=count, p=p)
+                    return [choices[index] for index in indices.tolist()]
+                return self._random.choices(choices, weights, k=count)
+
+    @staticmethod
+    def to_list(values: Sequence) -> list:
+        return values.tolist() if hasattr(values, "tolist") else list(values)
+
+    def reserve(self, count: int):
+        """Draw the values of `count` documents in one call."""
+        self._batch = max(count, 1)
+        self._values.extend(self.draw(count))
+
+    def next(self) -> str:
+        """The next value, drawing another batch if needed."""
+        if len(self._values) == 0:
+            self._values.extend(self.draw(self._batch))
+        return self._values.popleft()
@@ -26,19 +26,11 @@ class Header(TexTemplate):
         """
         Remove the input statement of the preamble from the contents.
         """
-        with self.path.open("r") as file:
-            self._contents = file.read()
-            self._disk_contents = self.contents
+        self._contents = self.storage.read_text(self.path)
+        self._disk_contents = self.contents
 
     def set_craft_exercises(self, value: str):
-        pattern = re.compile(
-            r"%s%s%s"
-            % (
-                self.placeholder_prefix,
-                CraftExercisesValidator().key,
-                self.placeholder_suffix,
-            )
-        )
+        pattern = self.lexer.named(CraftExercisesValidator().key)
 
         # escape `\`
         value = re.sub("\\\\", "\\\\\\\\", value)
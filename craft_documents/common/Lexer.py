@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import re
+import threading
+from functools import lru_cache
+from typing import Any
+
+
+class Lexer:
+    """
+    The compiled patterns for one set of tokens in the
+    configuration, for example those of `.tex` files:
+
+    ```yaml
+    tokens:
+      .md:
+        placeholder_prefix: "<<"
+        placeholder_suffix: ">>"
+        single_line_comment_prefix: "<!--"
+        block_comment_prefix: "<!--"
+        block_comment_suffix: "-->"
+    ```
+
+    Lexers are registered by their tokens, so every template
+    with the same tokens shares the patterns. Use `Lexer.get()`
+    instead of creating them directly.
+    """
+
+    _registry: dict[tuple[tuple[str, str], ...], Lexer] = {}
+    _lock = threading.Lock()
+
+    @property
+    def tokens(self) -> dict[str, str]:
+        return self._tokens
+
+    def __init__(self, tokens: dict[str, str]):
+        self._tokens = dict(tokens)
+
+        self.placeholder_prefix: str = tokens["placeholder_prefix"]
+        self.placeholder_suffix: str = tokens["placeholder_suffix"]
+        self.single_line_comment_prefix: str = tokens["single_line_comment_prefix"]
+        self.block_comment_prefix: str = tokens["block_comment_prefix"]
+        self.block_comment_suffix: str = tokens["block_comment_suffix"]
+
+        placeholder = r"%s([^\s]+?)%s" % (
+            self.placeholder_prefix,
+            self.placeholder_suffix,
+        )
+        self.placeholder = re.compile(placeholder)
+        self.placeholder_bytes = re.compile(placeholder.encode())
+
+        block_comment = "%s(.*?)%s" % (
+            self.block_comment_prefix,
+            self.block_comment_suffix,
+        )
+        self.block_comment = re.compile(block_comment, re.DOTALL)
+        self.block_comment_bytes = re.compile(block_comment.encode(), re.DOTALL)
+
+        self._named: dict[str, re.Pattern] = {}
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        """Use the registered lexer after being sent to another process."""
+        return (Lexer.get, (self.tokens,))
+
+    @classmethod
+    def get(cls, tokens: dict[str, str]) -> Lexer:
+        """Return the lexer for `tokens`, compiling it on first use."""
+        key = tuple(sorted(tokens.items()))
+        lexer = cls._registry.get(key)
+        if lexer is None:
+            with cls._lock:
+                lexer = cls._registry.setdefault(key, cls(tokens))
+        return lexer
+
+    def named(self, name: str) -> re.Pattern:
+        """The pattern of the placeholder `name`."""
+        pattern = self._named.get(name)
+        if pattern is None:
+            pattern = re.compile(
+                "%s%s%s"
+                % (self.placeholder_prefix, re.escape(name), self.placeholder_suffix)
+            )
+            self._named[name] = pattern
+        return pattern
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def line_patterns(prefix: str) -> tuple[re.Pattern, re.Pattern]:
+        """The patterns used by `File.remove_lines()`."""
+        return (
+            re.compile(
+                "(?<=[^\n]\n)(?:^%s.*?\n?)+(?:^\n)+(?=[^\n])" % prefix, re.MULTILINE
+            ),
+            re.compile("^%s.*\n*" % prefix, re.MULTILINE),
+        )
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def block_patterns(prefix: str, suffix: str) -> tuple[re.Pattern, re.Pattern]:
+        """The patterns used by `File.remove_blocks()`."""
+        return (
+            re.compile(
+                "(?s)(?<=[^\n]\n)(%s(?:.*?)%s\n)+^\n+?(?=[^\n])" % (prefix, suffix),
+                re.MULTILINE,
+            ),
+            re.compile("(?s)^%s(.*?)%s\n*" % (prefix, suffix), re.MULTILINE),
+        )
@@ -0,0 +1,148 @@
+import io
+import os
+import re
+from pathlib import Path, PurePosixPath
+from typing import Any, BinaryIO
+
+from craft_documents.common.Storage import Storage
+
+
+class MemoryStorage(Storage):
+    """
+    Files and folders held in memory.
+
+    The files are passed with paths relative to `root`:
+
+    ```
+    MemoryStorage(
+        {"headers/exam.tex": r"\\begin{document}...", "exercises/": None},
+        root=Path("/craft"),
+    )
+    ```
+
+    A path ending in `/` creates an empty folder.
+    """
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    def __init__(
+        self,
+        files: dict[str, str | bytes | None] | None = None,
+        root: Path = Path("/"),
+    ):
+        self._root = Path(os.path.abspath(root))
+        self._entries: dict[str, Any] = {}
+        self._children: dict[str, set[str]] = {"": set()}
+
+        for name, contents in (files or {}).items():
+            if name.endswith("/"):
+                self.mkdir(self.root / name)
+            else:
+                self.add(
+                    name, contents.encode() if isinstance(contents, str) else contents
+                )
+
+    def add(self, name: str, entry: Any):
+        """
+        Add an entry for the file `name` relative to the root.
+
+        Subclasses can store any entry as long as `read()` and
+        `entry_size()` understand it.
+        """
+        name = PurePosixPath(name).as_posix()
+        self._entries[name] = entry
+        self.add_folder(str(PurePosixPath(name).parent))
+        self._children[self.parent_of(name)].add(name)
+
+    def add_folder(self, name: str):
+        name = "" if name == "." else name
+        if name in self._children:
+            return
+        self._children[name] = set()
+        self.add_folder(str(PurePosixPath(name).parent))
+        self._children[self.parent_of(name)].add(name)
+
+    def parent_of(self, name: str) -> str:
+        parent = str(PurePosixPath(name).parent)
+        return "" if parent == "." else parent
+
+    def name_of(self, path: Path) -> str | None:
+        """The name relative to the root or `None` if `path` is outside."""
+        try:
+            name = self.resolve(path).relative_to(self.root).as_posix()
+        except ValueError:
+            return None
+        return "" if name == "." else name
+
+    def entry(self, path: Path) -> Any:
+        name = self.name_of(path)
+        if name is None or name not in self._entries:
+            raise FileNotFoundError(path)
+        return self._entries[name]
+
+    def read(self, entry: Any) -> bytes:
+        return entry
+
+    def entry_size(self, entry: Any) -> int:
+        return len(entry)
+
+    def read_bytes(self, path: Path) -> bytes:
+        return self.read(self.entry(path))
+
+    def resolve(self, path: Path) -> Path:
+        return Path(os.path.abspath(path))
+
+    def is_file(self, path: Path) -> bool:
+        return self.name_of(path) in self._entries
+
+    def is_dir(self, path: Path) -> bool:
+        return self.name_of(path) in self._children
+
+    def iterdir(self, path: Path) -> tuple[list[Path], list[Path]]:
+        name = self.name_of(path)
+        if name is None or name not in self._children:
+            raise FileNotFoundError(path)
+
+        files: list[Path] = []
+        folders: list[Path] = []
+
+        for child in sorted(self._children[name]):
+            if child in self._entries:
+                files.append(self.root / child)
+            else:
+                folders.append(self.root / child)
+
+        return files, folders
+
+    def size(self, path: Path) -> int:
+        return self.entry_size(self.entry(path))
+
+    def open(self, path: Path) -> BinaryIO:
+        return io.BytesIO(self.read_bytes(path))
+
+    def read_text(self, path: Path) -> str:
+        return self.read_bytes(path).decode()
+
+    def write_text(self, path: Path, contents: str):
+        if self.read_only:
+            raise PermissionError("Cannot write to '%s'." % path)
+        name = self.name_of(path)
+        if name is None:
+            raise FileNotFoundError(path)
+        self.add(name, contents.encode())
+
+    def mkdir(self, path: Path):
+        if self.read_only:
+            raise PermissionError("Cannot create '%s'." % path)
+        name = self.name_of(path)
+        if name is None:
+            raise FileNotFoundError(path)
+        self.add_folder(name)
+
+    def contains(self, path: Path, pattern: str) -> bool:
+        return re.search(pattern.encode(), self.read_bytes(path)) is not None
+
+    def copy(self, path: Path, target: Path):
+        target.write_bytes(self.read_bytes(path))
@@ -1,3 +1,6 @@
+import hashlib
+import shlex
+import subprocess
 from pathlib import Path
 
 from craft_documents.common.TexTemplate import TexTemplate
@@ -21,6 +24,50 @@ class Preamble(TexTemplate):
         """
         Remove the document environment.
         """
-        with self.path.open("r") as file:
-            self._contents = file.read()
-            self._disk_contents = self.contents
+        self._contents = self.storage.read_text(self.path)
+        self._disk_contents = self.contents
+
+    def format_name(self, command: str) -> str:
+        """
+        The name of the format file for the current contents
+        when dumped with `command`.
+        """
+        key = hashlib.sha256((self.fingerprint + command).encode()).hexdigest()
+        return "craft-" + key[:16]
+
+    def dump_format(self, directory: Path, command: str) -> Path:
+        """
+        Dump the preamble into a precompiled format file in
+        `directory` and return its path.
+
+        Formats are cached by the contents of the preamble and
+        the command, so this only runs `command` if the preamble
+        changed since the last dump.
+
+        `command` is split like a shell command and can use the
+        fields `{jobname}` and `{source}`.
+        """
+        jobname = self.format_name(command)
+        format_file = directory / (jobname + ".fmt")
+        if format_file.is_file():
+            return format_file
+
+        directory.mkdir(parents=True, exist_ok=True)
+        source = directory / (jobname + ".tex")
+        source.write_text(self.contents + "\n\\begin{document}\n\\end{document}\n")
+
+        arguments = [
+            argument.format(jobname=jobname, source=source.name)
+            for argument in shlex.split(command)
+        ]
+        result = subprocess.run(
+            arguments, cwd=directory, capture_output=True, text=True
+        )
+
+        if result.returncode != 0 or not format_file.is_file():
+            raise Exception(
+                "Couldn't precompile the preamble with '%s':\n%s"
+                % (" ".join(arguments), result.stdout + result.stderr)
+            )
+
+        return format_file
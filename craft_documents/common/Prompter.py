@@ -1,4 +1,5 @@
 import collections.abc
+from typing import Any, Mapping, MutableMapping
 
 from rich import print
 
@@ -13,29 +14,58 @@ class Prompter:
     """
     Class to manage prompting the user for input.
     The answers are added to the storage passed in.
+
+    The `remembered` answers of an earlier run are offered as
+    defaults, or used without prompting if `reuse` is set.
     """
 
     @property
-    def storage(self) -> dict:
+    def storage(self) -> MutableMapping:
         return self._storage
 
-    def __init__(self, storage: dict):
+    def __init__(
+        self,
+        storage: MutableMapping,
+        remembered: Mapping[str, Any] | None = None,
+        reuse: bool = False,
+    ):
         self._storage = storage
+        self._remembered = remembered if remembered is not None else {}
+        self._reuse = reuse
+
+    @staticmethod
+    def remembers(question: Prompt) -> bool:
+        """Whether the answer to `question` can be remembered."""
+        return "generate" not in question and question["type"] != "password"
 
-    def ask(self, prompts: Prompt | list[Prompt]):
+    def with_default(self, question: Prompt) -> Prompt:
+        """The question with the remembered answer as its default."""
+        value = self._remembered.get(question["name"], None)
+        if value is None or not self.remembers(question):
+            return question
+        if question["type"] == "input" and isinstance(value, str):
+            return question | {"default": value}  # type: ignore
+        if question["type"] == "list" and value in question.get("choices", []):
+            return question | {"default": value}  # type: ignore
+        return question
+
+    def ask(self, prompts: Prompt | list[Prompt]) -> list[Prompt]:
         """
         Ask the prompts and add the answers to the configuration.
+        Returns the prompts that were answered by the user or with
+        a remembered answer.
+
+        Prompts with a generator are answered with its next value.
         """
         questions = prompts if isinstance(prompts, list) else [prompts]
+        answered = []
 
         # BUG: The answers will only be added if the storage is not empty
         if len(self.storage) == 0:
             self.storage["NuoXZl"] = ""
 
         for question in questions:
-            if question["name"] not in self.storage:
-                prompt(question, answers=self.storage)
-            else:
+            if question["name"] in self.storage:
                 # Print to the console which value was used.
                 print(
                     "[blue]:heavy_check_mark:[/blue] "
@@ -43,5 +73,26 @@ class Prompter:
                     + ": "
                     + self.storage[question["name"]]
                 )
+            elif "generate" in question:
+                self.storage[question["name"]] = question["generate"].next()
+                print(
+                    "[blue]:game_die:[/blue] "
+                    + question["name"]
+                    + ": "
+                    + self.storage[question["name"]]
+                )
+            elif self._reuse and question["name"] in self._remembered:
+                self.storage[question["name"]] = self._remembered[question["name"]]
+                print(
+                    "[blue]:repeat:[/blue] "
+                    + question["name"]
+                    + ": "
+                    + str(self.storage[question["name"]])
+                )
+                answered.append(question)
+            else:
+                prompt(self.with_default(question), answers=self.storage)
+                answered.append(question)
 
         self.storage.pop("NuoXZl", None)
+        return answered
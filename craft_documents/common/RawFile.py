@@ -0,0 +1,32 @@
+import hashlib
+from pathlib import Path
+
+from craft_documents.common.File import File
+
+
+class RawFile(File):
+    """
+    A file that is copied as it is.
+
+    The contents are never loaded into memory. This is used
+    for supplements that are binary or don't contain any
+    placeholders.
+    """
+
+    @property
+    def contents(self) -> str:
+        """Read from the disk on every access, nothing is kept."""
+        return self.storage.read_text(self.path)
+
+    @property
+    def fingerprint(self) -> str:
+        """Hash of the file on the disk."""
+        with self.storage.open(self.path) as file:
+            return hashlib.file_digest(file, "sha256").hexdigest()
+
+    def load(self):
+        pass
+
+    def write(self, target: Path):
+        """Copy the file to `target`."""
+        self.storage.copy(self.path, target)
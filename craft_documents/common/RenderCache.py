@@ -0,0 +1,92 @@
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable
+
+
+class RenderCache:
+    """
+    A bounded cache of rendered segments, such as the contents
+    of an exercise after its placeholders were replaced.
+
+    Keys are built from the hash of the template and the values
+    of the placeholders it uses. The least recently used entries
+    are dropped once the cache holds `size` entries. With a
+    `path`, the entries are loaded from and saved to the disk.
+    """
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups > 0 else 0.0
+
+    def __init__(self, size: int = 256, path: Path | None = None):
+        self.size = size
+        self.path = path
+        self._entries: OrderedDict[str, str] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self.load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def key(*parts: str) -> str:
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(part.encode())
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def memoize(self, key: str, render: Callable[[], str]) -> str:
+        """Return the cached segment for `key` or render and cache it."""
+        if key in self._entries:
+            self._hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+        self._misses += 1
+        segment = render()
+        if self.size > 0:
+            self._entries[key] = segment
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+        return segment
+
+    def load(self):
+        if self.size <= 0 or self.path is None or not self.path.is_file():
+            return
+        try:
+            entries = json.loads(self.path.read_text())
+        except ValueError:
+            return
+        for key, segment in list(entries.items())[-self.size :]:
+            self._entries[key] = segment
+
+    def save(self):
+        """Write the entries to `path` atomically, if there is one."""
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.path.with_name(".%s.%d.tmp" % (self.path.name, os.getpid()))
+        temporary.write_text(json.dumps(self._entries))
+        os.replace(temporary, self.path)
+
+    def report(self) -> str:
+        return "%d hits, %d misses (%.0f%%), %d entries" % (
+            self.hits,
+            self.misses,
+            self.hit_rate * 100,
+            len(self),
+        )
@@ -0,0 +1,19 @@
+from collections import ChainMap
+
+
+class Scope(ChainMap):
+    """
+    Layered values of the placeholders.
+
+    Lookups go from the innermost layer to the outermost one,
+    answers are written into the innermost layer:
+
+    ```text
+    copy of an exercise ──> document ──> configuration
+    ```
+
+    A layer is added with `new_child()` in constant time
+    without copying or changing the layers below, so answers
+    never leak between the exercises of a document or into
+    the configuration.
+    """
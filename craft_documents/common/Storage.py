@@ -0,0 +1,80 @@
+import mmap
+from abc import abstractmethod
+from pathlib import Path
+from typing import BinaryIO, Protocol
+
+
+class Storage(Protocol):
+    """
+    A protocol representing the place where files and
+    folders are stored.
+
+    Conforming types:
+    - DirectoryStorage
+    - MemoryStorage
+    - ArchiveStorage (MemoryStorage)
+    - CachedStorage
+
+    Paths are always absolute after being passed through
+    `resolve()`.
+    """
+
+    read_only: bool = False
+
+    @abstractmethod
+    def resolve(self, path: Path) -> Path:
+        """Return the absolute path for `path`."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def is_file(self, path: Path) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def is_dir(self, path: Path) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def iterdir(self, path: Path) -> tuple[list[Path], list[Path]]:
+        """Return the files and the folders in the folder at `path`."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def size(self, path: Path) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    def open(self, path: Path) -> BinaryIO:
+        """Open the file at `path` for reading bytes."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def read_text(self, path: Path) -> str:
+        raise NotImplementedError
+
+    @abstractmethod
+    def write_text(self, path: Path, contents: str):
+        raise NotImplementedError
+
+    @abstractmethod
+    def mkdir(self, path: Path):
+        """Create the folder at `path` and its parents."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def contains(self, path: Path, pattern: str) -> bool:
+        """Search the bytes of the file for the regular expression."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def copy(self, path: Path, target: Path):
+        """Copy the file at `path` to `target` on the disk."""
+        raise NotImplementedError
+
+    def map(self, path: Path) -> mmap.mmap | None:
+        """
+        Map the file at `path` into memory.
+
+        Returns `None` if the storage cannot map files.
+        """
+        return None
@@ -1,21 +1,22 @@
-import re
+import copy
+import json
 from pathlib import Path
-from typing import Any, Dict, List, Set
-
-import yaml
+from typing import Any, Callable, Dict, List, Mapping, MutableMapping, Set
 
 from craft_documents.common.File import File
-from craft_documents.common.helpers import combine_dictionaries
+from craft_documents.common.Lexer import Lexer
+from craft_documents.common.helpers import (
+    combine_dictionaries,
+    compile_expression,
+    load_yaml,
+)
 from craft_documents.common.Prompt import Prompt
 from craft_documents.common.Prompter import Prompter
+from craft_documents.common.Variants import Variants
 from craft_documents.configuration.Configuration import Configuration
 from craft_documents.configuration.CraftExercisesValidator import (
     CraftExercisesValidator,
 )
-from craft_documents.configuration.RemoveCommentsValidator import (
-    RemoveCommentsValidator,
-)
-from craft_documents.configuration.TokensValidator import TokensValidator
 
 
 class Template(File):
@@ -36,17 +37,25 @@ class Template(File):
     document.
     """
 
+    # The prompts are recreated by `attach()`
+    _shared_attributes = File._shared_attributes + ("_configuration", "_prompts")
+
     @property
     def configuration(self) -> Configuration:
         return self._configuration
 
+    @property
+    def lexer(self) -> Lexer:
+        """The compiled patterns for the tokens of the extension."""
+        return self._lexer
+
     @property
     def placeholder_prefix(self) -> str:
-        return self._placeholder_prefix
+        return self.lexer.placeholder_prefix
 
     @property
     def placeholder_suffix(self) -> str:
-        return self._placeholder_suffix
+        return self.lexer.placeholder_suffix
 
     @property
     def placeholders(self) -> Set[str]:
@@ -58,11 +67,11 @@ class Template(File):
 
     @property
     def block_comment_prefix(self) -> str:
-        return self._block_comment_prefix
+        return self.lexer.block_comment_prefix
 
     @property
     def block_comment_suffix(self) -> str:
-        return self._block_comment_suffix
+        return self.lexer.block_comment_suffix
 
     @property
     def yaml(self) -> Dict[str, Any]:
@@ -70,7 +79,7 @@ class Template(File):
 
     @property
     def single_line_comment_prefix(self) -> str:
-        return self._single_line_comment_prefix
+        return self.lexer.single_line_comment_prefix
 
     def __init__(self, configuration: Configuration, path: Path):
         """
@@ -78,24 +87,18 @@ class Template(File):
         in the initializer. The prompts rely on having
         the newest version of the configuration available.
         """
-        super().__init__(path=path)
         self._configuration = configuration
+        self._bindings: Dict[str, str] = {}
+        super().__init__(
+            path=path,
+            memory_map_threshold=configuration.settings.memory_map_threshold,
+            storage=configuration.storage,
+        )
 
         # get tokens from the configuration
-        assert "tokens" in self.configuration
+        assert configuration.settings.tokens is not None
         try:
-            tokens = self.configuration[TokensValidator().key][self.extension]
-
-            # YAML
-            self._block_comment_prefix: str = tokens["block_comment_prefix"]
-            self._block_comment_suffix: str = tokens["block_comment_suffix"]
-
-            # Placeholders
-            self._placeholder_prefix: str = tokens["placeholder_prefix"]
-            self._placeholder_suffix: str = tokens["placeholder_suffix"]
-
-            # Single Line comments
-            self._single_line_comment_prefix: str = tokens["single_line_comment_prefix"]
+            self._lexer = Lexer.get(configuration.settings.tokens[self.extension])
         except:
             raise Exception("Couldn't find tokens for %s." % self.extension)
             # TODO: Prompt for the tokens and add them to the configuration
@@ -106,19 +109,48 @@ class Template(File):
         # Prompts
         self.__init_prompts__()
 
-        if configuration.get(RemoveCommentsValidator().key, False):
+        if configuration.settings.remove_comments:
             self.remove_comments()
 
+    def __getstate__(self) -> dict:
+        """
+        Drop the configuration and the prompts, which can hold
+        evaluated functions. Call `attach()` after unpickling.
+        """
+        state = super().__getstate__()
+        state.pop("_configuration", None)
+        state.pop("_prompts", None)
+        return state
+
+    def attach(self, configuration: Configuration):
+        """
+        Attach the configuration to a template that was sent
+        from another process and recreate its prompts.
+        """
+        self._configuration = configuration
+        self._storage = configuration.storage
+        self.__init_prompts__()
+
+    def clone(self):
+        """
+        Return a copy of the template that is rendered separately,
+        e.g. for another variant of a document.
+        """
+        clone = copy.deepcopy(self)
+        clone.attach(self.configuration)
+        return clone
+
     def __init_placeholders__(self):
         """
         Extract handlebars like `<<semester>>` from the
         contents of the template.
         """
-        pattern = re.compile(
-            r"%s([^\s]+?)%s" % (self.placeholder_prefix, self.placeholder_suffix)
-        )
-        matches = pattern.findall(self.contents)
-        self._placeholders = set(matches)
+        if self.is_memory_mapped:
+            matches = self.lexer.placeholder_bytes.findall(self._mapping)  # type: ignore
+            placeholders = set(match.decode() for match in matches)
+            self._placeholders = placeholders - self._bindings.keys()
+        else:
+            self._placeholders = set(self.lexer.placeholder.findall(self.contents))
 
     def __init_yaml__(self):
         """
@@ -131,20 +163,22 @@ class Template(File):
         """
 
         # Extract all the block comments
-        pattern = re.compile(
-            "%s(.*?)%s" % (self.block_comment_prefix, self.block_comment_suffix),
-            re.DOTALL,
-        )
-        matches = pattern.findall(self.contents)
+        if self.is_memory_mapped:
+            # Only decode the block comments
+            matches = [
+                match.decode()
+                for match in self.lexer.block_comment_bytes.findall(self._mapping)  # type: ignore
+            ]
+        else:
+            matches = self.lexer.block_comment.findall(self.contents)
 
         dict: Dict[str, Any] = {}
 
         # Iterate over all the block comments
         for match in matches:
-            try:
-                dict = combine_dictionaries(dict, yaml.safe_load(match))
-            except:
-                pass
+            data = load_yaml(match)
+            if data is not None:
+                dict = combine_dictionaries(dict, data)
 
         self._yaml = dict
 
@@ -154,7 +188,9 @@ class Template(File):
         in the file if a value doesn't yet exist in the
         configuration.
 
-        They can be customized in any YAML-block.
+        They can be customized in any YAML-block. Placeholders
+        with a `generate:` spec are not prompted for but drawn
+        from the generator of the configuration.
         """
         prompts: List[Prompt] = []
 
@@ -177,12 +213,13 @@ class Template(File):
                     # the name cannot be customized
                     if key == "name":
                         continue
-                    elif key == "validate":
-                        if self.configuration.get("allow_eval", False):
-                            question[key] = eval(value)
-                    elif key == "when":
-                        if self.configuration.get("allow_eval", False):
-                            question[key] = eval(value)
+                    elif key == "generate":
+                        question[key] = self.configuration.generator(placeholder, value)
+                    elif key == "validate" or key == "when":
+                        if self.configuration.settings.allow_eval:
+                            question[key] = compile_expression(
+                                value, self.configuration.settings.restrict_eval
+                            )
                     else:
                         question[key] = value
 
@@ -193,40 +230,115 @@ class Template(File):
     def remove_comments(self):
         """
         Remove single line comments and block
-        comments from the string.
+        comments from the string. The guards of
+        variants are kept.
         """
-        self.remove_lines(prefix=self.single_line_comment_prefix)
+        self.remove_lines(prefix=Variants.protect + self.single_line_comment_prefix)
         self.remove_blocks(
             prefix=self.block_comment_prefix, suffix=self.block_comment_suffix
         )
 
-    def set_placeholders(self, values: dict[str, Any]):
+    def set_placeholders(self, values: Mapping[str, Any]):
         """
         Replaces the placeholders with their values.
-        """
 
-        for placeholder in self.placeholders:
-            if placeholder in values:
-                pattern = re.compile(
-                    r"%s%s%s"
-                    % (self.placeholder_prefix, placeholder, self.placeholder_suffix)
-                )
+        The result is memoized in the render cache of the
+        configuration by the contents and the values used.
 
-                if isinstance(values[placeholder], str):
-                    self._contents = re.sub(pattern, values[placeholder], self.contents)
+        While the contents are memory-mapped, the values are only
+        recorded and substituted in `write()`.
+        """
+        if self.is_memory_mapped:
+            for placeholder in self.placeholders:
+                if isinstance(values.get(placeholder, None), str):
+                    self._bindings[placeholder] = values[placeholder]
+            self.__init_placeholders__()
+            return
+
+        used = {
+            placeholder: values[placeholder]
+            for placeholder in sorted(self.placeholders)
+            if isinstance(values.get(placeholder, None), str)
+        }
+
+        def render() -> str:
+            contents = self.contents
+            for placeholder, value in used.items():
+                contents = self.lexer.named(placeholder).sub(value, contents)
+            return contents
+
+        cache = self.configuration.render_cache
+        key = cache.key("placeholders", self.fingerprint, json.dumps(used))
+        self._contents = cache.memoize(key, render)
 
         self.__init_placeholders__()
 
-    def resolve_placeholders(self, storage: dict):
-        prompter = Prompter(storage)
-        prompter.ask(self.prompts)
+    def decode(self) -> str:
+        """Decode the mapped contents with the recorded values."""
+        return self.lexer.placeholder.sub(
+            lambda match: self._bindings.get(match.group(1), match.group(0)),
+            super().decode(),
+        )
+
+    def stream(self, write: Callable[[bytes], object]):
+        """
+        Pass the literal ranges of the mapped contents and the
+        recorded values of the placeholders to `write`.
+        """
+        position = 0
+
+        with memoryview(self._mapping) as view:  # type: ignore
+            for match in self.lexer.placeholder_bytes.finditer(self._mapping):  # type: ignore
+                value = self._bindings.get(match.group(1).decode(), None)
+                if value is None:
+                    continue
+                write(view[position : match.start()])
+                write(value.encode())
+                position = match.end()
+            write(view[position:])
+
+    @property
+    def answers_key(self) -> str:
+        """The key of the remembered answers of the template."""
+        return "%s/%s" % (type(self).__name__.lower(), self.name)
+
+    def ask(self, prompts: List[Prompt], storage: MutableMapping[str, Any]):
+        """
+        Ask `prompts` and add the answers to `storage`.
+
+        The answers of the last run in the same folder with the same
+        header are offered as defaults and the new ones remembered.
+        Values that were not asked for, e.g. set in a craftrc, are
+        not remembered.
+        """
+        answers = self.configuration.answers
+        header = self.configuration.header
+        scope = header.stem if header is not None else ""
+        names = [prompt["name"] for prompt in self.prompts]
+
+        remembered = answers.recall(scope, self.answers_key, names)
+        prompter = Prompter(storage, remembered, self.configuration.reuse_answers)
+
+        for prompt in prompter.ask(prompts):
+            if Prompter.remembers(prompt) and prompt["name"] in storage:
+                remembered[prompt["name"]] = storage[prompt["name"]]
+        answers.remember(scope, self.answers_key, names, remembered)
+
+    def resolve_placeholders(self, storage: MutableMapping[str, Any]):
+        self.ask(self.prompts, storage)
         self.set_placeholders(storage)
 
-    def will_prompt(self) -> bool:
+    def will_prompt(self, values: Mapping[str, Any] | None = None) -> bool:
         """
         Returns a boolean indicating whether or not resolving the placeholders
         will need to prompt the user for input.
+
+        Checks the configuration if no `values` are given.
         """
+        values = self.configuration if values is None else values
         return any(
-            [prompt["name"] not in self.configuration for prompt in self.prompts]
+            [
+                prompt["name"] not in values and "generate" not in prompt
+                for prompt in self.prompts
+            ]
         )
@@ -0,0 +1,252 @@
+import fcntl
+import os
+import shutil
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Iterator
+
+from rich import print
+
+from craft_documents.common.DirectoryStorage import DirectoryStorage
+from craft_documents.common.helpers import copy_file
+from craft_documents.common.Storage import Storage
+
+
+class TemplateLibrary:
+    """
+    The templates folder with atomic, concurrency-safe updates.
+
+    The templates are kept in generations that are never
+    changed once they are published:
+
+    ```text
+    ~/.config/craft/
+    ├── .lock
+    ├── .generations/
+    │   ├── current -> 1718000000000000000
+    │   └── 1718000000000000000/{preambles,headers,exercises}/
+    ├── preambles -> .generations/current/preambles
+    ├── headers -> .generations/current/headers
+    └── exercises -> .generations/current/exercises
+    ```
+
+    Readers pin the current generation for the length of a
+    run with a shared lock on its `.pin` file. Writers take
+    an exclusive lock on `.lock`, stage their changes in a
+    new generation and publish it by swapping the `current`
+    link. Generations that are no longer pinned are removed.
+
+    The new generation only holds the changed files while it
+    is staged. The unchanged files are hard linked from the
+    current generation when it is published, so a write
+    doesn't copy the templates. Published files are shared
+    between generations and must never be changed in place.
+
+    A folder with plain directories is migrated on the first
+    write. Storages other than directories are written to
+    directly.
+    """
+
+    directories = ["preambles", "headers", "exercises"]
+
+    @property
+    def folder(self) -> Path:
+        return self._folder
+
+    @property
+    def root(self) -> Path:
+        """The pinned folder holding `preambles`, `headers` and `exercises`."""
+        return self._root
+
+    @property
+    def generations(self) -> Path:
+        return self.folder / ".generations"
+
+    @property
+    def current(self) -> Path:
+        return self.generations / "current"
+
+    @property
+    def is_versioned(self) -> bool:
+        return isinstance(self.storage, DirectoryStorage)
+
+    def __init__(self, folder: Path, storage: Storage):
+        self.storage = storage
+        self._folder = storage.resolve(folder)
+        self._pin: IO | None = None
+        self._staging: Path | None = None
+        self.pin()
+
+    def pin(self):
+        """Pin the current generation until the next call."""
+        if self._pin is not None:
+            self._pin.close()
+            self._pin = None
+
+        self._root = self.folder
+        if not self.is_versioned:
+            return
+
+        while self.current.is_symlink():
+            generation = self.generations / os.readlink(self.current)
+            try:
+                pin = (generation / ".pin").open("a")
+            except FileNotFoundError:
+                # Collected in the meantime, read the new `current`
+                continue
+            fcntl.flock(pin, fcntl.LOCK_SH)
+
+            # The generation could have been collected before it was locked
+            if generation.is_dir():
+                self._pin = pin
+                self._root = generation
+                return
+            pin.close()
+
+    @contextmanager
+    def lock(self) -> Iterator[None]:
+        """Hold the exclusive lock of the writers."""
+        with (self.folder / ".lock").open("a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    @contextmanager
+    def transaction(self) -> Iterator[Path]:
+        """
+        Stage changes in the yielded folder and publish them
+        atomically once the block exits without an error. The
+        template folders start out empty, read the unchanged
+        templates from `root`.
+
+        Nested transactions share the outermost staging folder.
+        """
+        if self._staging is not None:
+            yield self._staging
+            return
+
+        if not self.is_versioned:
+            yield self.root
+            return
+
+        self.storage.mkdir(self.folder)
+        with self.lock():
+            if not self.current.is_symlink():
+                self.migrate()
+
+            staging = self.new_generation()
+            for directory in self.directories:
+                (staging / directory).mkdir()
+            self._staging = staging
+            try:
+                yield staging
+                self.link_unchanged(staging)
+            except BaseException:
+                shutil.rmtree(staging, ignore_errors=True)
+                raise
+            finally:
+                self._staging = None
+
+            self.publish(staging)
+            self.pin()
+            self.collect()
+
+    def write(self, name: str, contents: str):
+        """Write a file relative to the templates folder in a transaction."""
+        with self.transaction() as root:
+            path = root / name
+            self.storage.mkdir(path.parent)
+            self.storage.write_text(path, contents)
+
+    def link_unchanged(self, staging: Path):
+        """
+        Hard link the files of the current generation that were
+        not staged into `staging`. Falls back to copying if the
+        file system doesn't support links.
+        """
+        for directory, folders, files in os.walk(self.current):
+            source = Path(directory)
+            target = staging / source.relative_to(self.current)
+            target.mkdir(exist_ok=True)
+            for name in folders + files:
+                if name == ".pin" or os.path.lexists(target / name):
+                    continue
+                if (source / name).is_symlink():
+                    (target / name).symlink_to(os.readlink(source / name))
+                elif name in files:
+                    try:
+                        os.link(source / name, target / name)
+                    except OSError:
+                        copy_file(source / name, target / name)
+
+    def new_generation(self) -> Path:
+        generation = self.generations / str(time.time_ns())
+        generation.mkdir(parents=True)
+        return generation
+
+    def publish(self, generation: Path):
+        """Point `current` to `generation` by atomically replacing the link."""
+        link = self.generations / (".current-%s" % generation.name)
+        link.symlink_to(generation.name)
+        os.replace(link, self.current)
+
+    def migrate(self):
+        """
+        Move plain template directories into the first generation
+        and report the links that replace them.
+        """
+        generation = self.new_generation()
+        moved = []
+        for directory in self.directories:
+            path = self.folder / directory
+            if path.is_dir() and not path.is_symlink():
+                os.rename(path, generation / directory)
+                moved.append(directory)
+            else:
+                (generation / directory).mkdir()
+
+        manifest = self.folder / ".manifest.json"
+        if manifest.is_file():
+            os.rename(manifest, generation / manifest.name)
+
+        self.publish(generation)
+
+        for directory in self.directories:
+            path = self.folder / directory
+            if not path.exists():
+                path.symlink_to(Path(".generations/current") / directory)
+
+        if len(moved) != 0:
+            print(
+                "[blue]==>[/blue] Moved %s in '%s' to '%s' and replaced them "
+                "with links to the current templates :sparkles:"
+                % (
+                    ", ".join("'%s/'" % directory for directory in moved),
+                    self.folder,
+                    generation.relative_to(self.folder),
+                )
+            )
+
+    def collect(self):
+        """Remove the generations that are neither current nor pinned."""
+        current = os.readlink(self.current)
+        for generation in self.generations.iterdir():
+            if generation.name.startswith(".trash-"):
+                shutil.rmtree(generation, ignore_errors=True)
+                continue
+            if generation.name.startswith(".") or generation.name in (
+                "current",
+                current,
+            ):
+                continue
+            with (generation / ".pin").open("a") as pin:
+                try:
+                    fcntl.flock(pin, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    continue
+                trash = self.generations / (".trash-%s" % generation.name)
+                os.rename(generation, trash)
+            shutil.rmtree(trash, ignore_errors=True)
@@ -26,13 +26,13 @@ class TexTemplate(Template, ABC):
 
     @property
     def body(self) -> str:
-        """Return the document body of the template."""
-        pattern = re.compile(r"\\begin{document}\n(.*?)\\end{document}", re.DOTALL)
-        match = re.search(pattern, self.contents)
-        if match:
-            return match.group(1)
-        else:
-            return ""
+        """
+        Return the document body of the template.
+
+        It is memoized in the render cache of the configuration.
+        """
+        cache = self.configuration.render_cache
+        return cache.memoize(cache.key("body", self.fingerprint), self.extract_body)
 
     @property
     def declarations(self) -> str:
@@ -40,14 +40,12 @@ class TexTemplate(Template, ABC):
         Return the declarations in the template.
         Those are the contents without the document body.
 
-        Caching the entire contents is done so that the
-        method `remove_document_body` can be used.
+        It is memoized in the render cache of the configuration.
         """
-        cache = self.contents
-        self.remove_document_body()
-        result = self.contents
-        self._contents = cache
-        return result
+        cache = self.configuration.render_cache
+        return cache.memoize(
+            cache.key("declarations", self.fingerprint), self.extract_declarations
+        )
 
     def __init__(self, path: Path, configuration: Configuration):
         super().__init__(configuration=configuration, path=path)
@@ -59,6 +57,25 @@ class TexTemplate(Template, ABC):
         """
         raise NotImplementedError
 
+    def extract_body(self) -> str:
+        pattern = re.compile(r"\\begin{document}\n(.*?)\\end{document}", re.DOTALL)
+        match = re.search(pattern, self.contents)
+        if match:
+            return match.group(1)
+        else:
+            return ""
+
+    def extract_declarations(self) -> str:
+        """
+        Caching the entire contents is done so that the
+        method `remove_document_body` can be used.
+        """
+        cache = self.contents
+        self.remove_document_body()
+        result = self.contents
+        self._contents = cache
+        return result
+
     def remove_document_body(self):
         super().remove_blocks(prefix=r"\\begin{document}", suffix=r"\\end{document}")
 
@@ -0,0 +1,78 @@
+import re
+
+
+class Variants:
+    """
+    Selects the variant-conditional blocks of a document, using
+    the guards of docstrip:
+
+    ```latex
+    %<*solutions>
+    \\answer{A minor third.}
+    %</solutions>
+    %<*!solutions>
+    \\answerlines{3}
+    %</!solutions>
+    %<solutions|grading>\\points{2}
+    ```
+
+    A guard is an expression of variant names combined with
+    `!`, `&` and `|`. Blocks are included if their guard holds
+    for the enabled variants. The guards themselves are removed.
+    """
+
+    guard = re.compile(r"^%<([*/]?)([!&|\w\-]+)>(.*\n?)", re.MULTILINE)
+
+    # Keeps the guards when it precedes the prefix of comments
+    protect = r"(?!%<[*/]?[!&|\w\-]+>)"
+
+    @property
+    def enabled(self) -> frozenset[str]:
+        return self._enabled
+
+    def __init__(self, enabled: list[str] | set[str] | tuple[str, ...] = ()):
+        self._enabled = frozenset(enabled)
+
+    def holds(self, expression: str) -> bool:
+        """Evaluate a guard such as `solutions|!grading`."""
+        return any(
+            all(
+                (
+                    (term[1:] not in self.enabled)
+                    if term.startswith("!")
+                    else (term in self.enabled)
+                )
+                for term in alternative.split("&")
+            )
+            for alternative in expression.split("|")
+        )
+
+    def select(self, contents: str) -> str:
+        """Return `contents` with the blocks of the enabled variants."""
+        if "%<" not in contents:
+            return contents
+
+        result: list[str] = []
+        excluded: list[bool] = []  # one entry per open block
+        position = 0
+
+        for match in self.guard.finditer(contents):
+            if not any(excluded):
+                result.append(contents[position : match.start()])
+            position = match.end()
+
+            kind, expression, rest = match.groups()
+            match kind:
+                case "*":
+                    excluded.append(not self.holds(expression))
+                case "/":
+                    if excluded:
+                        excluded.pop()
+                case _:
+                    # A single line
+                    if not any(excluded) and self.holds(expression):
+                        result.append(rest)
+
+        if not any(excluded):
+            result.append(contents[position:])
+        return "".join(result)
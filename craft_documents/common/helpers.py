@@ -1,13 +1,41 @@
+import ast
+import builtins
+import copy
+import mmap
+import os
+import re
+import shutil
+from functools import lru_cache
+from pathlib import Path
 from typing import Any, Dict, List
 
 import requests
+import yaml
+from requests.adapters import HTTPAdapter
 from rich import print
+from urllib3.util.retry import Retry
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader  # type: ignore
+
+GITHUB_API = "https://api.github.com"
+
+# Timeouts for connecting and reading in seconds
+TIMEOUT = (5, 30)
 
 
 def combine_dictionaries(
     dict1: Dict[Any, Any], dict2: Dict[Any, Any]
 ) -> Dict[Any, Any]:
-    result = dict1
+    """
+    Merge `dict2` into a copy of `dict1` without changing either.
+
+    Values in `dict1` take precedence. Lists in both are
+    concatenated and dictionaries in both are merged.
+    """
+    result = dict(dict1)
     for key, value in dict2.items():
         if key not in dict1:
             result[key] = value
@@ -21,6 +49,100 @@ def combine_dictionaries(
     return result
 
 
+# Matches a block that starts with a `---` marker or a `key:` line
+YAML_PATTERN = re.compile(r"\A(?:\s*#.*\n)*\s*(?:---|[\w\-\"'. ]+:(?:\s|\Z))")
+
+
+def load_yaml(text: str) -> Dict[Any, Any] | None:
+    """
+    Load a block of YAML into a dictionary.
+
+    Blocks that don't start with a `---` marker or a `key:` line,
+    such as commented-out LaTeX, are skipped without parsing them.
+    Uses the libyaml loader if it is available.
+
+    The blocks are parsed once and cached by their text. Every
+    call returns a copy that can be changed.
+    """
+    data = parse_yaml(text)
+    return copy.deepcopy(data) if data is not None else None
+
+
+@lru_cache(maxsize=4096)
+def parse_yaml(text: str) -> Dict[Any, Any] | None:
+    """The cached result of `load_yaml()`, which must not be changed."""
+    if YAML_PATTERN.match(text) is None:
+        return None
+    try:
+        data = yaml.load(text, Loader=SafeLoader)
+    except yaml.YAMLError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+# Names available to restricted expressions
+SAFE_NAMES: Dict[str, Any] = {
+    name: getattr(builtins, name)
+    for name in [
+        "abs", "all", "any", "bool", "float", "int", "isinstance",
+        "len", "max", "min", "round", "sorted", "str", "sum",
+        "True", "False", "None",
+    ]
+} | {"re": re}  # fmt: skip
+
+# Syntax allowed in restricted expressions
+SAFE_NODES = (
+    ast.Expression, ast.Lambda, ast.arguments, ast.arg, ast.Name, ast.Load,
+    ast.Constant, ast.BoolOp, ast.BinOp, ast.UnaryOp, ast.Compare, ast.IfExp,
+    ast.Call, ast.keyword, ast.Attribute, ast.Subscript, ast.Slice, ast.List,
+    ast.Tuple, ast.Set, ast.Dict, ast.boolop, ast.operator, ast.unaryop,
+    ast.cmpop,
+)  # fmt: skip
+
+
+class UnsafeExpressionError(Exception):
+    """A restricted expression uses a name or syntax that is not allowed."""
+
+
+@lru_cache(maxsize=1024)
+def compile_expression(source: str, restricted: bool = False) -> Any:
+    """
+    Evaluate the expression `source` of a prompt hook such as
+    `lambda answer: len(answer) > 0`.
+
+    The expression is compiled once and the result is cached
+    by its source, so it is shared by all templates. With
+    `restricted`, only simple expressions using `SAFE_NAMES`
+    and no private attributes are allowed, any other expression
+    raises an `UnsafeExpressionError`.
+    """
+    tree = ast.parse(source.strip(), mode="eval")
+
+    if not restricted:
+        code = compile(tree, "<expression>", "eval")
+        return eval(code, {"__builtins__": builtins, "re": re})
+
+    arguments = {node.arg for node in ast.walk(tree) if isinstance(node, ast.arg)}
+    for node in ast.walk(tree):
+        if not isinstance(node, SAFE_NODES):
+            raise UnsafeExpressionError(
+                "'%s' is not allowed in '%s'." % (type(node).__name__, source)
+            )
+        if isinstance(node, ast.Name) and node.id not in SAFE_NAMES | dict.fromkeys(
+            arguments
+        ):
+            raise UnsafeExpressionError(
+                "'%s' is not allowed in '%s'." % (node.id, source)
+            )
+        if isinstance(node, ast.Attribute) and node.attr.startswith("_"):
+            raise UnsafeExpressionError(
+                "'%s' is not allowed in '%s'." % (node.attr, source)
+            )
+
+    code = compile(tree, "<expression>", "eval")
+    return eval(code, {"__builtins__": {}, **SAFE_NAMES})
+
+
 def create_list(input: Any | List[Any]) -> List[Any]:
     if isinstance(input, list):
         return input
@@ -28,41 +150,58 @@ def create_list(input: Any | List[Any]) -> List[Any]:
         return [input]
 
 
-def fetch_github_directory(
-    owner: str, repo: str, path: str, verbose: bool = False
-) -> dict[str, str] | None:
+def copy_file(source: Path, target: Path):
     """
-    Fetch all files in a directory hosted on GitHub.
+    Copy `source` to `target` without reading it into memory.
 
-    Attribution to ChatGPT.
+    Uses `copy_file_range`, which reflinks on copy-on-write
+    file systems, and falls back to `shutil.copyfile`, which
+    uses `sendfile` or `fcopyfile` where available.
     """
-    url = f"https://api.github.com/repos/{owner}/{repo}/contents/{path}"
-    response = requests.get(url)
-
-    if response.status_code == 200:
-        data = response.json()
-        if isinstance(data, list):
-            documents = {}
-            for item in data:
-                if "type" in item and item["type"] == "file" and "download_url" in item:
-                    document_url = item["download_url"]
-                    document_response = requests.get(document_url)
-                    if document_response.status_code == 200:
-                        if verbose:
-                            print(
-                                "Fetching [bold white]%s[/bold white]..." % item["name"]
-                            )
-                        documents[item["name"]] = document_response.content.decode()
-                    else:
-                        print(
-                            "[red]Failed to fetch document: "
-                            + f"[bold white]{document_url}[/bold white][/red]"
-                        )
-            return documents
-    elif response.status_code == 404:
-        print("[red]Directory not found.[/red]")
-        # raise Abort()
-        return None
-    else:
-        print("[red]Failed to fetch directory.[/red]")
-        # raise Abort()
+    with source.open("rb") as input, target.open("wb") as output:
+        size = os.fstat(input.fileno()).st_size
+        try:
+            while size > 0:
+                copied = os.copy_file_range(input.fileno(), output.fileno(), size)
+                if copied == 0:
+                    break
+                size -= copied
+            else:
+                return
+        except (AttributeError, OSError):
+            pass
+
+    shutil.copyfile(source, target)
+
+
+def file_contains(path: Path, pattern: str) -> bool:
+    """
+    Search the bytes of the file at `path` for the regular
+    expression `pattern` without decoding the file.
+    """
+    with path.open("rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return False
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapping:
+            return re.search(pattern.encode(), mapping) is not None
+
+
+def create_session(pool_size: int = 16, retries: int = 3) -> requests.Session:
+    """
+    Create a session that keeps up to `pool_size` connections
+    alive and retries failed requests with an exponential backoff.
+    """
+    retry = Retry(
+        total=retries,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=("GET", "HEAD"),
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry
+    )
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
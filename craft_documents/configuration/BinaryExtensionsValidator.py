@@ -0,0 +1,42 @@
+from craft_documents.common.helpers import create_list
+from craft_documents.configuration.Semantic import Semantic
+from craft_documents.configuration.Validator import Validator
+
+
+class BinaryExtensionsValidator(Validator):
+    """
+    Required, defaults to common image and audio extensions.
+
+    Supplements with one of these extensions are copied
+    as they are and never read as text.
+    """
+
+    def __init__(self):
+        self._key = "binary_extensions"
+        self._semantic = Semantic.REQUIRED
+
+    def lint(self, value: str | list[str]) -> list[str]:
+        """Prepend `.` if necessary and lowercase the extensions."""
+        return [
+            (extension if extension.startswith(".") else "." + extension).lower()
+            for extension in create_list(value)
+            if isinstance(extension, str)
+        ]
+
+    def validate(self, value: list[str]) -> bool:
+        return True
+
+    def default(self) -> list[str]:
+        return [
+            ".pdf",
+            ".png",
+            ".jpg",
+            ".jpeg",
+            ".gif",
+            ".mid",
+            ".midi",
+            ".wav",
+            ".mp3",
+            ".ogg",
+            ".flac",
+        ]
@@ -1,25 +1,73 @@
 from __future__ import annotations
 
+import json
 from pathlib import Path
-from typing import Any, List
+from typing import Any, List, Mapping
 
 import yaml
 from rich import print
 
+from craft_documents.common.AnswersCache import AnswersCache
+from craft_documents.common.ArchiveStorage import ArchiveStorage
+from craft_documents.common.CachedStorage import CachedStorage
+from craft_documents.common.DirectoryStorage import DirectoryStorage
+from craft_documents.common.Generator import Generator
+from craft_documents.common.RenderCache import RenderCache
+from craft_documents.common.Storage import Storage
+from craft_documents.common.TemplateLibrary import TemplateLibrary
 from craft_documents.configuration.AllowEvalValidator import AllowEvalValidator
+from craft_documents.configuration.BinaryExtensionsValidator import (
+    BinaryExtensionsValidator,
+)
 from craft_documents.configuration.DocumentNameValidator import DocumentNameValidator
 from craft_documents.configuration.CraftExercisesValidator import (
     CraftExercisesValidator,
 )
+from craft_documents.configuration.FormatCommandValidator import FormatCommandValidator
 from craft_documents.configuration.HeaderValidator import HeaderValidator
+from craft_documents.configuration.MemoryMapThresholdValidator import (
+    MemoryMapThresholdValidator,
+)
 from craft_documents.configuration.MultipleExercisesValidator import (
     MultipleExercisesValidator,
 )
+from craft_documents.configuration.OutputsValidator import OutputsValidator
+from craft_documents.configuration.ParseExecutorValidator import (
+    ParseExecutorValidator,
+)
+from craft_documents.configuration.ParseWorkersValidator import ParseWorkersValidator
 from craft_documents.configuration.PreambleValidator import PreambleValidator
+from craft_documents.configuration.PrecompilePreambleValidator import (
+    PrecompilePreambleValidator,
+)
+from craft_documents.configuration.ProtectedMacrosValidator import (
+    ProtectedMacrosValidator,
+)
+from craft_documents.configuration.RememberAnswersValidator import (
+    RememberAnswersValidator,
+)
 from craft_documents.configuration.RemoveCommentsValidator import (
     RemoveCommentsValidator,
 )
+from craft_documents.configuration.RenderCachePathValidator import (
+    RenderCachePathValidator,
+)
+from craft_documents.configuration.RenderCacheSizeValidator import (
+    RenderCacheSizeValidator,
+)
+from craft_documents.configuration.RestrictEvalValidator import RestrictEvalValidator
+from craft_documents.configuration.ReuseAnswersValidator import ReuseAnswersValidator
+from craft_documents.configuration.SeedValidator import SeedValidator
+from craft_documents.configuration.Settings import Settings
+from craft_documents.configuration.SharedAssetsValidator import SharedAssetsValidator
+from craft_documents.configuration.SourcesValidator import SourcesValidator
+from craft_documents.configuration.TemplateLibraryValidator import (
+    TemplateLibraryValidator,
+)
 from craft_documents.configuration.TokensValidator import TokensValidator
+from craft_documents.configuration.TreeShakePreambleValidator import (
+    TreeShakePreambleValidator,
+)
 from craft_documents.configuration.UniqueExercisePlaceholdersValidator import (
     UniqueExercisePlaceholdersValidator,
 )
@@ -40,8 +88,55 @@ class Configuration(dict):
     - `craft-exercises`: optional
     - `multiple-exercises`: required, defaults to `True`
     - `tokens`: required, loads defaults for `.tex` and `.ly`
+    - `precompile_preamble`: required, defaults to `False`
+    - `format_command`: required, defaults to `pdflatex -ini` with `mylatexformat`
+    - `shared_assets`: required, defaults to `False`
+    - `binary_extensions`: required, defaults to image and audio extensions
+    - `memory_map_threshold`: required, defaults to 1 MiB
+    - `template_library`: optional, zip or tar archive of the templates
+    - `sources`: required, defaults to the templates on GitHub
+    - `parse_workers`: required, defaults to `1`
+    - `parse_executor`: required, defaults to `thread`
+    - `restrict_eval`: required, defaults to `False`
+    - `render_cache_size`: required, defaults to 256
+    - `render_cache_path`: optional, file that keeps rendered segments between runs
+    - `outputs`: required, defaults to only the document without variants
+    - `seed`: optional, seeds drawing exercises and generating values
+    - `tree_shake_preamble`: required, defaults to `False`
+    - `protected_macros`: required, defaults to an empty list
+    - `remember_answers`: required, defaults to `True`
+    - `reuse_answers`: required, defaults to `False`
+
+    The validated settings are read from an immutable snapshot
+    in `settings`. Settings that are changed after `validate()`
+    are validated again, along with the settings depending on
+    them, before the next snapshot is taken. The dictionary
+    itself also holds the values of the placeholders.
     """
 
+    setting_keys = frozenset(Settings.keys.values())
+    _settings: Settings | None = None
+    _validators: list[Validator] = []
+    # The settings that changed since the last snapshot
+    _changed: frozenset[str] = frozenset()
+    _storage: Storage = DirectoryStorage()
+    _cached_storage: CachedStorage | None = None
+    _library: TemplateLibrary | None = None
+    _render_cache: RenderCache | None = None
+    _answers: AnswersCache | None = None
+    _generators: dict[tuple[str, str, int | None], Generator] | None = None
+
+    @property
+    def settings(self) -> Settings:
+        """
+        The validated settings. The snapshot is taken again after
+        a setting was changed.
+        """
+        if self._settings is None:
+            self.revalidate()
+            self._settings = Settings.from_configuration(self)
+        return self._settings
+
     @property
     def validators(self) -> list[Validator]:
         return self._validators
@@ -58,13 +153,81 @@ class Configuration(dict):
     def cwd(self) -> Path:
         return self._cwd
 
+    @property
+    def storage(self) -> Storage:
+        """Where the templates are stored."""
+        return self._storage
+
+    @storage.setter
+    def storage(self, storage: Storage):
+        self._storage = storage
+        self._library = None
+        if self._cached_storage is not None:
+            self._cached_storage = CachedStorage(storage)
+
+    @property
+    def validation_storage(self) -> Storage:
+        """
+        The storage with a cache of the checked paths while the
+        configuration is validated, otherwise `storage`.
+        """
+        if self._cached_storage is not None:
+            return self._cached_storage
+        return self.storage
+
+    @property
+    def library(self) -> TemplateLibrary:
+        """
+        The templates folder. The current generation of the
+        templates is pinned on first access.
+        """
+        if self._library is None:
+            self._library = TemplateLibrary(self.main.parent, self.storage)
+        return self._library
+
+    @property
+    def render_cache(self) -> RenderCache:
+        """The cache of rendered segments, created on first access."""
+        if self._render_cache is None:
+            self._render_cache = RenderCache(
+                self.settings.render_cache_size, self.settings.render_cache_path
+            )
+        return self._render_cache
+
+    @property
+    def answers(self) -> AnswersCache:
+        """The remembered answers of the current folder, loaded on first access."""
+        if self._answers is None:
+            path = self.main.parent / ".answers.json"
+            self._answers = AnswersCache(
+                self.cwd.resolve(), path if self.settings.remember_answers else None
+            )
+        return self._answers
+
+    @property
+    def generators(self) -> list[Generator]:
+        """The generators of the placeholders of all templates."""
+        return list((self._generators or {}).values())
+
+    def generator(self, name: str, spec: dict[str, Any]) -> Generator:
+        """
+        The generator of the placeholder `name`, shared by all
+        templates with the same spec.
+        """
+        if self._generators is None:
+            self._generators = {}
+        key = (name, json.dumps(spec, sort_keys=True), self.seed)
+        if key not in self._generators:
+            self._generators[key] = Generator(name, spec, self.seed)
+        return self._generators[key]
+
     @property
     def preamble(self) -> Path:
-        return self[PreambleValidator().key]
+        return self.settings.preamble
 
     @property
     def header(self) -> Path | None:
-        return self.get(HeaderValidator().key, None)
+        return self.settings.header
 
     @header.setter
     def header(self, name: str | Path):
@@ -80,37 +243,157 @@ class Configuration(dict):
         self[v.key] = name
         v.run(self)
         if self.header is None:
-            self[v.key] = old_value
-            if self.header is None:
-                self.pop(v.key)
+            if old_value is None:
+                self.pop(v.key, None)
+            else:
+                self[v.key] = old_value
 
     @property
     def allow_eval(self) -> bool:
-        return self[AllowEvalValidator().key]
+        return self.settings.allow_eval
 
     @property
     def verbose(self) -> bool:
-        return self[VerboseValidator().key]
+        return self.settings.verbose
 
     @property
     def remove_comments(self) -> bool:
-        return self[RemoveCommentsValidator().key]
+        return self.settings.remove_comments
 
     @property
-    def craft_exercises(self) -> dict[str, dict[str, Any]] | None:
-        return self.get(CraftExercisesValidator().key, None)
+    def craft_exercises(self) -> Mapping[str, Mapping[str, Any]] | None:
+        return self.settings.craft_exercises
 
     @property
     def multiple_exercises(self) -> bool:
-        return self[AllowEvalValidator().key]
+        return self.settings.multiple_exercises
 
     @property
     def unique_exercise_placeholders(self) -> bool:
-        return self[UniqueExercisePlaceholdersValidator().key]
+        return self.settings.unique_exercise_placeholders
 
     @property
     def document_name(self) -> str:
-        return self.get(DocumentNameValidator().key, None)
+        return self.settings.document_name
+
+    @property
+    def precompile_preamble(self) -> bool:
+        return self.settings.precompile_preamble
+
+    @property
+    def format_command(self) -> str:
+        return self.settings.format_command
+
+    @property
+    def shared_assets(self) -> bool:
+        return self.settings.shared_assets
+
+    @property
+    def binary_extensions(self) -> tuple[str, ...]:
+        return self.settings.binary_extensions
+
+    @property
+    def memory_map_threshold(self) -> int:
+        return self.settings.memory_map_threshold
+
+    @property
+    def sources(self) -> tuple[str, ...]:
+        return self.settings.sources
+
+    @property
+    def parse_workers(self) -> int:
+        return self.settings.parse_workers
+
+    @property
+    def parse_executor(self) -> str:
+        return self.settings.parse_executor
+
+    @property
+    def restrict_eval(self) -> bool:
+        return self.settings.restrict_eval
+
+    @property
+    def outputs(self) -> Mapping[str, tuple[str, ...]]:
+        return self.settings.outputs
+
+    @property
+    def seed(self) -> int | None:
+        return self.settings.seed
+
+    @property
+    def tree_shake_preamble(self) -> bool:
+        return self.settings.tree_shake_preamble
+
+    @property
+    def protected_macros(self) -> tuple[str, ...]:
+        return self.settings.protected_macros
+
+    @property
+    def remember_answers(self) -> bool:
+        return self.settings.remember_answers
+
+    @property
+    def reuse_answers(self) -> bool:
+        return self.settings.reuse_answers
+
+    @property
+    def render_cache_size(self) -> int:
+        return self.settings.render_cache_size
+
+    @property
+    def render_cache_path(self) -> Path | None:
+        return self.settings.render_cache_path
+
+    def __setitem__(self, key: str, value: Any):
+        self.invalidate(key)
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key: str):
+        self.invalidate(key)
+        super().__delitem__(key)
+
+    def pop(self, key: str, *args) -> Any:
+        self.invalidate(key)
+        return super().pop(key, *args)
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def invalidate(self, key: str):
+        """Take a new snapshot of the settings if `key` is a setting."""
+        if key in self.setting_keys:
+            self._settings = None
+            self._changed = self._changed | {key}
+
+    def revalidate(self):
+        """
+        Run the validators of the settings that changed since the
+        last snapshot and of the settings depending on them.
+        """
+        changed = set(self._changed)
+        for validator in self.validators:
+            if validator.key in changed or changed.intersection(validator.dependencies):
+                validator.run(self)
+                changed.add(validator.key)
+                if isinstance(validator, TemplateLibraryValidator):
+                    self.open_template_library()
+        self._changed = frozenset()
+
+    def __getstate__(self) -> dict:
+        """The pinned library holds a lock and is not sent to other processes."""
+        state = self.__dict__.copy()
+        state.pop("_library", None)
+        state.pop("_cached_storage", None)
+        state.pop("_render_cache", None)
+        state.pop("_generators", None)
+        state.pop("_answers", None)
+        return state
 
     def __init__(
         self,
@@ -184,36 +467,119 @@ class Configuration(dict):
         """
         Validate the configuration and employ resolving strategies if
         necessary. This is done by setting and running every validator in
-        `self.validators`.
-        """
-        # Create the configuration if it doesn't exists
-        if (
-            not self.main.parent.is_dir()
-            or not (self.main.parent / "preambles/").is_dir()
-            or not (self.main.parent / "headers/").is_dir()
-            or not (self.main.parent / "exercises/").is_dir()
+        `self.validators` once, after the validators it depends on.
+
+        The validators share a cache of the checked paths for the
+        length of the run.
+        """
+        self._validators = self.order(
+            [
+                TemplateLibraryValidator(),
+                PreambleValidator(),
+                AllowEvalValidator(),
+                RemoveCommentsValidator(),
+                CraftExercisesValidator(),
+                MultipleExercisesValidator(),
+                TokensValidator(),
+                HeaderValidator(),
+                UniqueExercisePlaceholdersValidator(),
+                DocumentNameValidator(),
+                VerboseValidator(),
+                PrecompilePreambleValidator(),
+                FormatCommandValidator(),
+                SharedAssetsValidator(),
+                BinaryExtensionsValidator(),
+                MemoryMapThresholdValidator(),
+                SourcesValidator(),
+                ParseWorkersValidator(),
+                ParseExecutorValidator(),
+                RestrictEvalValidator(),
+                RenderCacheSizeValidator(),
+                RenderCachePathValidator(),
+                OutputsValidator(),
+                SeedValidator(),
+                TreeShakePreambleValidator(),
+                ProtectedMacrosValidator(),
+                RememberAnswersValidator(),
+                ReuseAnswersValidator(),
+            ]
+        )
+
+        self._cached_storage = CachedStorage(self.storage)
+        try:
+            for validator in self.validators:
+                validator.run(self)
+
+                # The templates could be stored in an archive
+                if isinstance(validator, TemplateLibraryValidator):
+                    self.open_template_library()
+                    self.create_folders()
+        finally:
+            self._cached_storage = None
+
+        self._changed = frozenset()
+        self._settings = Settings.from_configuration(self)
+
+    def order(self, validators: list[Validator]) -> list[Validator]:
+        """
+        Sort the validators so that every validator comes after the
+        validators it depends on, and drop duplicate keys. Otherwise
+        the order is kept.
+        """
+        by_key: dict[str, Validator] = {}
+        for validator in validators:
+            by_key.setdefault(validator.key, validator)
+
+        ordered: list[Validator] = []
+        done: set[str] = set()
+        pending = list(by_key.values())
+        while pending:
+            ready = next(
+                (
+                    validator
+                    for validator in pending
+                    if all(d in done or d not in by_key for d in validator.dependencies)
+                ),
+                None,
+            )
+            if ready is None:
+                raise Exception(
+                    "The validators %s depend on each other."
+                    % ", ".join("'%s'" % validator.key for validator in pending)
+                )
+            pending.remove(ready)
+            done.add(ready.key)
+            ordered.append(ready)
+        return ordered
+
+    def open_template_library(self):
+        """
+        Read the templates from the archive of `template_library`
+        if it is set. An archive that was opened before is closed.
+        """
+        library = self.get(TemplateLibraryValidator().key, None)
+        if library is None or (
+            isinstance(self.storage, ArchiveStorage) and self.storage.archive == library
+        ):
+            return
+
+        if isinstance(self.storage, ArchiveStorage):
+            self.storage.close()
+        self.storage = ArchiveStorage(Path(library), root=self.main.parent)
+
+    def create_folders(self):
+        """Create the templates folder if it doesn't exist."""
+        folders = [
+            self.main.parent / "preambles/",
+            self.main.parent / "headers/",
+            self.main.parent / "exercises/",
+        ]
+        if not self.storage.read_only and not all(
+            self.storage.is_dir(folder) for folder in folders
         ):
-            self.main.parent.mkdir(parents=True, exist_ok=True)
-            (self.main.parent / "preambles/").mkdir(parents=True, exist_ok=True)
-            (self.main.parent / "headers/").mkdir(parents=True, exist_ok=True)
-            (self.main.parent / "exercises/").mkdir(parents=True, exist_ok=True)
+            for folder in folders:
+                self.storage.mkdir(folder)
             print(
                 "[blue]==>[/blue] Created the templates folder at '%s' :sparkles:"
                 % self.main.parent
             )
-
-        self._validators = [
-            PreambleValidator(),
-            AllowEvalValidator(),
-            RemoveCommentsValidator(),
-            AllowEvalValidator(),
-            CraftExercisesValidator(),
-            MultipleExercisesValidator(),
-            TokensValidator(),
-            HeaderValidator(),
-            UniqueExercisePlaceholdersValidator(),
-            DocumentNameValidator(),
-            VerboseValidator(),
-        ]
-        for validator in self.validators:
-            validator.run(self)
@@ -1,6 +1,10 @@
+import re
 from pathlib import Path
 
 from craft_documents.configuration.Semantic import Semantic
+from craft_documents.configuration.TemplateLibraryValidator import (
+    TemplateLibraryValidator,
+)
 from craft_documents.configuration.Validator import Validator
 
 
@@ -17,6 +21,9 @@ class ExerciseConfiguration(dict):
 
         - `count: int`
         - `path: str | Path`
+
+        An exercise drawn from a pool of exercises sets `pool`
+        instead of `path`, e.g. `harmony/*`.
         """
         name = name.removesuffix(".tex")
 
@@ -34,8 +41,10 @@ class ExerciseConfiguration(dict):
             raise Exception("Couldn't convert count to an integer.")
 
         # Ensure path
-        if "path" not in self:
-            self["path"] = configuration.main.parent / ("exercises/%s.tex" % name)
+        if "pool" in self:
+            self["path"] = configuration.library.root / "exercises"
+        elif "path" not in self:
+            self["path"] = configuration.library.root / ("exercises/%s.tex" % name)
         # Convert relative path to absolute path
         else:
             match self["path"]:
@@ -44,17 +53,17 @@ class ExerciseConfiguration(dict):
                     if path.is_absolute():
                         self["path"] = path
                     else:
-                        self["path"] = configuration.main.parent / "exercises" / path
+                        self["path"] = configuration.library.root / "exercises" / path
                 case Path():
                     # TODO: Conditionally append `.tex`
                     path = self["path"]
                     if path.is_absolute():
                         self["path"] = path
                     else:
-                        self["path"] = configuration.main.parent / "exercises" / path
+                        self["path"] = configuration.library.root / "exercises" / path
 
         # Absolute path
-        self["path"] = self["path"].resolve()
+        self["path"] = configuration.validation_storage.resolve(self["path"])
 
 
 class CraftExercisesValidator(Validator):
@@ -69,26 +78,50 @@ class CraftExercisesValidator(Validator):
         }
     }
     ```
+
+    Exercises can also be drawn at random from the exercises
+    matching a pattern, e.g. `3 from harmony/*`:
+
+    ```
+    {
+        "3 from harmony/*": {
+            "count": 3,
+            "pool": "harmony/*",
+            "path": Path(...),
+        }
+    }
+    ```
     """
 
+    pool_pattern = re.compile(r"^\s*(\d+)\s+from\s+(\S+)\s*$")
+
     def __init__(self):
         self._key = "craft-exercises"
         self._semantic = Semantic.OPTIONAL
+        self._dependencies = (TemplateLibraryValidator().key,)
 
     def remove_tex(self, value: str) -> str:
         return value.removesuffix(".tex")
 
+    def create(self, exercise_name: str, **kwargs) -> ExerciseConfiguration:
+        """Create the configuration of an exercise or a pool selector."""
+        match = self.pool_pattern.match(exercise_name)
+        if match is not None:
+            count, pool = match.groups()
+            kwargs = {"count": int(count)} | kwargs | {"pool": pool}
+        return ExerciseConfiguration(self.configuration, exercise_name, **kwargs)
+
     def exercise_path_appending(self, component: str | Path) -> Path:
         match component:
             case str():
-                return (
-                    self.configuration.main.parent
+                return self.storage.resolve(
+                    self.configuration.library.root
                     / ("exercises/" + self.remove_tex(component) + ".tex")
-                ).resolve()
+                )
             case Path():
-                return (
-                    self.configuration.main.parent / "exercises/" / component
-                ).resolve()
+                return self.storage.resolve(
+                    self.configuration.library.root / "exercises/" / component
+                )
 
     def lint(self, value) -> dict:
         result = {}
@@ -102,9 +135,7 @@ class CraftExercisesValidator(Validator):
         match value:
             # craft-exercises: intervals
             case str(exercise_name):
-                result[exercise_name] = ExerciseConfiguration(
-                    self.configuration, exercise_name
-                )
+                result[exercise_name] = self.create(exercise_name)
 
             # craft-exercises:
             case list(items):
@@ -112,21 +143,19 @@ class CraftExercisesValidator(Validator):
                     match item:
                         # - intervals
                         case str(exercise_name):
-                            result[exercise_name] = ExerciseConfiguration(
-                                self.configuration, exercise_name
-                            )
+                            result[exercise_name] = self.create(exercise_name)
                         # - intervals: 2
                         case dict(item) if dict_types(item, str, int):
                             for exercise_name, count in item.items():
-                                result[exercise_name] = ExerciseConfiguration(
-                                    self.configuration, exercise_name, count=count
+                                result[exercise_name] = self.create(
+                                    exercise_name, count=count
                                 )
 
                         # - intervals:
                         case dict(item) if dict_types(item, str, dict):
                             for exercise_name, kwargs in item.items():
-                                result[exercise_name] = ExerciseConfiguration(
-                                    self.configuration, exercise_name, **kwargs
+                                result[exercise_name] = self.create(
+                                    exercise_name, **kwargs
                                 )
 
             # craft-exercises:
@@ -135,15 +164,13 @@ class CraftExercisesValidator(Validator):
                     match v:
                         # 2
                         case int(count):
-                            result[exercise_name] = ExerciseConfiguration(
-                                self.configuration, exercise_name, count=count
+                            result[exercise_name] = self.create(
+                                exercise_name, count=count
                             )
 
                         # count: 3
                         case dict(config):
-                            result[exercise_name] = ExerciseConfiguration(
-                                self.configuration, exercise_name, **config
-                            )
+                            result[exercise_name] = self.create(exercise_name, **config)
 
         return {self.remove_tex(key): value for key, value in result.items()}
 
@@ -158,7 +185,7 @@ class CraftExercisesValidator(Validator):
 
         for exercise_name, config in value.items():
             # path points to existing file
-            if not config["path"].is_file():
+            if "pool" not in config and not self.storage.is_file(config["path"]):
                 invalid_keys.append(exercise_name)
 
             # count is greater than 0
@@ -26,7 +26,7 @@ class DocumentNameValidator(Validator):
 
     def validate(self, value: str) -> bool:
         """Check if the name exists in the current directory."""
-        if Path(value).is_file():
+        if self.storage.is_file(Path(value)):
             self.configuration.pop(self.key, None)
             return False
         else:
@@ -0,0 +1,42 @@
+import shlex
+
+from craft_documents.configuration.Semantic import Semantic
+from craft_documents.configuration.Validator import Validator
+
+
+class FormatCommandValidator(Validator):
+    """
+    Required, defaults to an `-ini` run of `pdflatex` with `mylatexformat`.
+
+    The command used to dump a preamble into a format file. It
+    is run in the directory of the cached formats and can use
+    the fields `{jobname}` and `{source}`:
+
+    ```
+    format_command: pdflatex -ini -jobname={jobname} "&pdflatex" mylatexformat.ltx {source}
+    ```
+    """
+
+    def __init__(self):
+        self._key = "format_command"
+        self._semantic = Semantic.REQUIRED
+
+    def lint(self, value: str | list[str]) -> str:
+        """Join a command given as a list of arguments."""
+        match value:
+            case list():
+                return shlex.join([str(argument) for argument in value])
+            case _:
+                return value
+
+    def validate(self, value: str) -> bool:
+        if isinstance(value, str) and "{jobname}" in value:
+            return True
+        else:
+            return False
+
+    def default(self) -> str:
+        return (
+            "pdflatex -ini -interaction=batchmode -jobname={jobname} "
+            '"&pdflatex" mylatexformat.ltx {source}'
+        )
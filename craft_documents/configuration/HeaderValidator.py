@@ -1,6 +1,9 @@
 from pathlib import Path
 
 from craft_documents.configuration.Semantic import Semantic
+from craft_documents.configuration.TemplateLibraryValidator import (
+    TemplateLibraryValidator,
+)
 from craft_documents.configuration.Validator import Validator
 
 
@@ -16,6 +19,7 @@ class HeaderValidator(Validator):
     def __init__(self):
         self._key = "header"
         self._semantic = Semantic.OPTIONAL
+        self._dependencies = (TemplateLibraryValidator().key,)
 
     def lint(self, value: str | Path) -> Path:
         match value:
@@ -25,13 +29,15 @@ class HeaderValidator(Validator):
                 path = value
 
         if path.is_absolute():
-            return path.resolve()
+            return self.storage.resolve(path)
         else:
-            return (self.configuration.main.parent / "headers/" / path).resolve()
+            return self.storage.resolve(
+                self.configuration.library.root / "headers/" / path
+            )
 
     def validate(self, value: str) -> bool:
         path = Path(value)
-        if path.is_file():
+        if self.storage.is_file(path):
             return True
         else:
             self.configuration.pop(self.key, None)
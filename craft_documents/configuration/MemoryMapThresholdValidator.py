@@ -0,0 +1,24 @@
+from craft_documents.configuration.Semantic import Semantic
+from craft_documents.configuration.Validator import Validator
+
+
+class MemoryMapThresholdValidator(Validator):
+    """
+    Required, defaults to 1 MiB.
+
+    Supplemental templates of at least this many bytes are
+    memory-mapped and scanned without decoding them.
+    """
+
+    def __init__(self):
+        self._key = "memory_map_threshold"
+        self._semantic = Semantic.REQUIRED
+
+    def validate(self, value: int) -> bool:
+        if isinstance(value, int) and not isinstance(value, bool) and value >= 0:
+            return True
+        else:
+            return False
+
+    def default(self) -> int:
+        return 1024 * 1024
@@ -0,0 +1,60 @@
+import re
+
+from craft_documents.common.helpers import create_list
+from craft_documents.configuration.Semantic import Semantic
+from craft_documents.configuration.Validator import Validator
+
+
+class OutputsValidator(Validator):
+    """
+    Required, defaults to only the document itself.
+
+    The documents that are rendered from one compilation and
+    the variants they include. The name of an output is added
+    to the name of the document, `""` is the document itself:
+
+    ```yaml
+    outputs:
+      - solutions         # exam.tex, exam-solutions.tex
+
+    outputs:
+      "": []
+      solutions: [solutions]
+      grading: [solutions, grading]
+    ```
+
+    Blocks between `%<*solutions>` and `%</solutions>` in the
+    templates are only included in outputs with that variant.
+    """
+
+    def __init__(self):
+        self._key = "outputs"
+        self._semantic = Semantic.REQUIRED
+
+    def lint(self, value) -> dict[str, list[str]] | None:
+        match value:
+            case str() | list():
+                outputs: dict[str, list[str]] = {"": []}
+                for name in create_list(value):
+                    outputs[str(name)] = [str(name)]
+                return outputs
+            case dict():
+                return {
+                    str(name or ""): [
+                        str(variant) for variant in create_list(variants or [])
+                    ]
+                    for name, variants in value.items()
+                }
+        return None
+
+    def validate(self, value: dict[str, list[str]] | None) -> bool:
+        if not isinstance(value, dict) or len(value) == 0:
+            return False
+        return all(
+            "/" not in name
+            and all(re.fullmatch(r"[\w\-]+", variant) for variant in variants)
+            for name, variants in value.items()
+        )
+
+    def default(self) -> dict[str, list[str]]:
+        return {"": []}
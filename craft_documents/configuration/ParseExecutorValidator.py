@@ -0,0 +1,24 @@
+from craft_documents.configuration.Semantic import Semantic
+from craft_documents.configuration.Validator import Validator
+
+
+class ParseExecutorValidator(Validator):
+    """
+    Required, defaults to `thread`.
+
+    Whether the templates are parsed in a pool of `process`es
+    or `thread`s.
+    """
+
+    def __init__(self):
+        self._key = "parse_executor"
+        self._semantic = Semantic.REQUIRED
+
+    def lint(self, value: str) -> str:
+        return value.lower() if isinstance(value, str) else value
+
+    def validate(self, value: str) -> bool:
+        return value in ("process", "thread")
+
+    def default(self) -> str:
+        return "thread"
@@ -0,0 +1,26 @@
+from craft_documents.configuration.Semantic import Semantic
+from craft_documents.configuration.Validator import Validator
+
+
+class ParseWorkersValidator(Validator):
+    """
+    Required, defaults to `1`.
+
+    The number of workers parsing the templates of a large
+    library in parallel. `1` parses them one at a time, which
+    `benchmarks/bench_template_manager.py` measured to be as
+    fast as a pool, see `TemplateManager.parse()`.
+    """
+
+    def __init__(self):
+        self._key = "parse_workers"
+        self._semantic = Semantic.REQUIRED
+
+    def validate(self, value: int) -> bool:
+        if isinstance(value, int) and not isinstance(value, bool) and value >= 1:
+            return True
+        else:
+            return False
+
+    def default(self) -> int:
+        return 1
@@ -4,6 +4,9 @@ import typer
 from rich import print
 
 from craft_documents.configuration.Semantic import Semantic
+from craft_documents.configuration.TemplateLibraryValidator import (
+    TemplateLibraryValidator,
+)
 from craft_documents.configuration.Validator import Validator
 
 
@@ -19,6 +22,7 @@ class PreambleValidator(Validator):
     def __init__(self):
         self._key = "preamble"
         self._semantic = Semantic.REQUIRED
+        self._dependencies = (TemplateLibraryValidator().key,)
 
     def lint(self, value: str | Path) -> Path:
         match value:
@@ -27,13 +31,15 @@ class PreambleValidator(Validator):
             case Path():
                 path = value
         if path.is_absolute():
-            return path.resolve()
+            return self.storage.resolve(path)
         else:
-            return (self.configuration.main.parent / "preambles/" / path).resolve()
+            return self.storage.resolve(
+                self.configuration.library.root / "preambles/" / path
+            )
 
     def validate(self, value: str) -> bool:
         path = Path(value)
-        if path.is_file():
+        if self.storage.is_file(path):
             return True
         else:
             return False
@@ -44,18 +50,17 @@ class PreambleValidator(Validator):
         """
         default = "default.tex"
 
-        path: Path = self.configuration.main.parent / ("preambles/" + default)
-        if path.is_file():
-            return path.resolve()
+        path: Path = self.configuration.library.root / ("preambles/" + default)
+        if self.storage.is_file(path) or self.storage.read_only:
+            return self.storage.resolve(path)
         else:
             print(
                 "[blue]==>[/blue] Created the default preamble at '%s' :sparkles:\n"
                 % path
             )
-            path.parent.mkdir(parents=True, exist_ok=True)
-            path.touch(exist_ok=True)
-            path.write_text(r"\documentclass{scrreport}")
+            library = self.configuration.library
+            library.write("preambles/" + default, r"\documentclass{scrreport}")
             print(
                 "Run 'craft templates fetch --verbose' to fetch more templates from GitHub.\n"
             )
-            return path
+            return self.storage.resolve(library.root / ("preambles/" + default))
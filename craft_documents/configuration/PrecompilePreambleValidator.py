@@ -0,0 +1,25 @@
+from craft_documents.configuration.Semantic import Semantic
+from craft_documents.configuration.Validator import Validator
+
+
+class PrecompilePreambleValidator(Validator):
+    """
+    Boolean that defaults to False.
+
+    Controls whether the preamble should be dumped into a
+    precompiled format file instead of being inlined into
+    the compiled document.
+    """
+
+    def __init__(self):
+        self._key = "precompile_preamble"
+        self._semantic = Semantic.REQUIRED
+
+    def validate(self, value: bool) -> bool:
+        if isinstance(value, bool):
+            return True
+        else:
+            return False
+
+    def default(self) -> bool:
+        return False
@@ -0,0 +1,31 @@
+from craft_documents.common.helpers import create_list
+from craft_documents.configuration.Semantic import Semantic
+from craft_documents.configuration.Validator import Validator
+
+
+class ProtectedMacrosValidator(Validator):
+    """
+    Required, defaults to an empty list.
+
+    Names of macros and environments that are always kept
+    when the preamble is tree-shaken, e.g. `\\points` or
+    `solution`.
+    """
+
+    def __init__(self):
+        self._key = "protected_macros"
+        self._semantic = Semantic.REQUIRED
+
+    def lint(self, value: str | list[str]) -> list[str]:
+        """Remove the leading `\\`."""
+        return [
+            name.removeprefix("\\")
+            for name in create_list(value)
+            if isinstance(name, str)
+        ]
+
+    def validate(self, value: list[str]) -> bool:
+        return True
+
+    def default(self) -> list[str]:
+        return []
@@ -0,0 +1,25 @@
+from craft_documents.configuration.Semantic import Semantic
+from craft_documents.configuration.Validator import Validator
+
+
+class RememberAnswersValidator(Validator):
+    """
+    Boolean that defaults to True.
+
+    Controls whether the answers to the prompts are kept in
+    `~/.config/craft/.answers.json` and offered as defaults
+    in the same project folder with the same header.
+    """
+
+    def __init__(self):
+        self._key = "remember_answers"
+        self._semantic = Semantic.REQUIRED
+
+    def validate(self, value: bool) -> bool:
+        if isinstance(value, bool):
+            return True
+        else:
+            return False
+
+    def default(self) -> bool:
+        return True
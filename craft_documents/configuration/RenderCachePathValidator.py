@@ -0,0 +1,34 @@
+from pathlib import Path
+
+from craft_documents.configuration.Semantic import Semantic
+from craft_documents.configuration.Validator import Validator
+
+
+class RenderCachePathValidator(Validator):
+    """
+    Accepts an absolute or relative path to a file where the
+    rendered segments are kept between runs. Relative paths
+    will be interpreted as being inside `~/.config/craft/`.
+
+    Optional
+    """
+
+    def __init__(self):
+        self._key = "render_cache_path"
+        self._semantic = Semantic.OPTIONAL
+
+    def lint(self, value: str | Path) -> Path | None:
+        if not isinstance(value, (str, Path)):
+            return None
+        path = Path(value).expanduser()
+        if path.is_absolute():
+            return path
+        else:
+            return self.configuration.main.parent / path
+
+    def validate(self, value: Path | None) -> bool:
+        if value is None or value.is_dir():
+            self.configuration.pop(self.key, None)
+            return False
+        else:
+            return True
@@ -0,0 +1,24 @@
+from craft_documents.configuration.Semantic import Semantic
+from craft_documents.configuration.Validator import Validator
+
+
+class RenderCacheSizeValidator(Validator):
+    """
+    Required, defaults to 256.
+
+    The number of rendered segments that are kept in memory.
+    `0` disables the cache.
+    """
+
+    def __init__(self):
+        self._key = "render_cache_size"
+        self._semantic = Semantic.REQUIRED
+
+    def validate(self, value: int) -> bool:
+        if isinstance(value, int) and not isinstance(value, bool) and value >= 0:
+            return True
+        else:
+            return False
+
+    def default(self) -> int:
+        return 256
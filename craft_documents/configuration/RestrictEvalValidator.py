@@ -0,0 +1,24 @@
+from craft_documents.configuration.Semantic import Semantic
+from craft_documents.configuration.Validator import Validator
+
+
+class RestrictEvalValidator(Validator):
+    """
+    Boolean that defaults to False.
+
+    Restricts the `validate` and `when` expressions of prompts
+    to a safe subset of Python if `allow_eval` is enabled.
+    """
+
+    def __init__(self):
+        self._key = "restrict_eval"
+        self._semantic = Semantic.REQUIRED
+
+    def validate(self, value: bool) -> bool:
+        if isinstance(value, bool):
+            return True
+        else:
+            return False
+
+    def default(self) -> bool:
+        return False
@@ -0,0 +1,24 @@
+from craft_documents.configuration.Semantic import Semantic
+from craft_documents.configuration.Validator import Validator
+
+
+class ReuseAnswersValidator(Validator):
+    """
+    Boolean that defaults to False.
+
+    Controls whether the remembered answers are used without
+    prompting for them again.
+    """
+
+    def __init__(self):
+        self._key = "reuse_answers"
+        self._semantic = Semantic.REQUIRED
+
+    def validate(self, value: bool) -> bool:
+        if isinstance(value, bool):
+            return True
+        else:
+            return False
+
+    def default(self) -> bool:
+        return False
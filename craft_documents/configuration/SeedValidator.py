@@ -0,0 +1,22 @@
+from craft_documents.configuration.Semantic import Semantic
+from craft_documents.configuration.Validator import Validator
+
+
+class SeedValidator(Validator):
+    """
+    Non-negative integer that seeds drawing exercises from pools
+    and generating the values of placeholders.
+
+    Optional
+    """
+
+    def __init__(self):
+        self._key = "seed"
+        self._semantic = Semantic.OPTIONAL
+
+    def validate(self, value: int) -> bool:
+        if isinstance(value, int) and not isinstance(value, bool) and value >= 0:
+            return True
+        else:
+            self.configuration.pop(self.key, None)
+            return False
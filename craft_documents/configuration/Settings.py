@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, ClassVar, Mapping
+
+from craft_documents.configuration.AllowEvalValidator import AllowEvalValidator
+from craft_documents.configuration.BinaryExtensionsValidator import (
+    BinaryExtensionsValidator,
+)
+from craft_documents.configuration.CraftExercisesValidator import (
+    CraftExercisesValidator,
+)
+from craft_documents.configuration.DocumentNameValidator import DocumentNameValidator
+from craft_documents.configuration.FormatCommandValidator import FormatCommandValidator
+from craft_documents.configuration.HeaderValidator import HeaderValidator
+from craft_documents.configuration.MemoryMapThresholdValidator import (
+    MemoryMapThresholdValidator,
+)
+from craft_documents.configuration.MultipleExercisesValidator import (
+    MultipleExercisesValidator,
+)
+from craft_documents.configuration.OutputsValidator import OutputsValidator
+from craft_documents.configuration.ParseExecutorValidator import (
+    ParseExecutorValidator,
+)
+from craft_documents.configuration.ParseWorkersValidator import ParseWorkersValidator
+from craft_documents.configuration.PreambleValidator import PreambleValidator
+from craft_documents.configuration.PrecompilePreambleValidator import (
+    PrecompilePreambleValidator,
+)
+from craft_documents.configuration.ProtectedMacrosValidator import (
+    ProtectedMacrosValidator,
+)
+from craft_documents.configuration.RememberAnswersValidator import (
+    RememberAnswersValidator,
+)
+from craft_documents.configuration.RemoveCommentsValidator import (
+    RemoveCommentsValidator,
+)
+from craft_documents.configuration.RenderCachePathValidator import (
+    RenderCachePathValidator,
+)
+from craft_documents.configuration.RenderCacheSizeValidator import (
+    RenderCacheSizeValidator,
+)
+from craft_documents.configuration.RestrictEvalValidator import RestrictEvalValidator
+from craft_documents.configuration.ReuseAnswersValidator import ReuseAnswersValidator
+from craft_documents.configuration.SeedValidator import SeedValidator
+from craft_documents.configuration.SharedAssetsValidator import SharedAssetsValidator
+from craft_documents.configuration.SourcesValidator import SourcesValidator
+from craft_documents.configuration.TemplateLibraryValidator import (
+    TemplateLibraryValidator,
+)
+from craft_documents.configuration.TokensValidator import TokensValidator
+from craft_documents.configuration.TreeShakePreambleValidator import (
+    TreeShakePreambleValidator,
+)
+from craft_documents.configuration.UniqueExercisePlaceholdersValidator import (
+    UniqueExercisePlaceholdersValidator,
+)
+from craft_documents.configuration.VerboseValidator import VerboseValidator
+
+
+def freeze(value: Any) -> Any:
+    """Turn dictionaries into read-only mappings and lists into tuples."""
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Turn the read-only mappings of `freeze()` into dictionaries."""
+    if isinstance(value, Mapping):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return tuple(thaw(item) for item in value)
+    return value
+
+
+@dataclass(frozen=True, slots=True)
+class Settings:
+    """
+    An immutable snapshot of the validated settings in the
+    configuration.
+
+    It is created once by `Configuration.validate()` and again
+    only when a setting changes. Nested dictionaries and lists
+    are frozen into read-only copies, so the snapshot can be
+    shared between threads. It is cheap to send to other
+    processes.
+    """
+
+    preamble: Path | None = None
+    header: Path | None = None
+    allow_eval: bool = False
+    restrict_eval: bool = False
+    remove_comments: bool = False
+    craft_exercises: Mapping[str, Mapping[str, Any]] | None = None
+    multiple_exercises: bool = True
+    unique_exercise_placeholders: bool = False
+    tokens: Mapping[str, Mapping[str, str]] | None = None
+    document_name: str | None = None
+    verbose: bool = False
+    precompile_preamble: bool = False
+    format_command: str | None = None
+    shared_assets: bool = False
+    binary_extensions: tuple[str, ...] = ()
+    memory_map_threshold: int | None = None
+    template_library: Path | None = None
+    sources: tuple[str, ...] = ()
+    parse_workers: int = 1
+    parse_executor: str = "thread"
+    render_cache_size: int = 256
+    render_cache_path: Path | None = None
+    outputs: Mapping[str, tuple[str, ...]] = field(default_factory=lambda: {"": ()})
+    seed: int | None = None
+    tree_shake_preamble: bool = False
+    protected_macros: tuple[str, ...] = ()
+    remember_answers: bool = True
+    reuse_answers: bool = False
+
+    # The keys of the settings in the configuration
+    keys: ClassVar[dict[str, str]] = {
+        "preamble": PreambleValidator().key,
+        "header": HeaderValidator().key,
+        "allow_eval": AllowEvalValidator().key,
+        "restrict_eval": RestrictEvalValidator().key,
+        "remove_comments": RemoveCommentsValidator().key,
+        "craft_exercises": CraftExercisesValidator().key,
+        "multiple_exercises": MultipleExercisesValidator().key,
+        "unique_exercise_placeholders": UniqueExercisePlaceholdersValidator().key,
+        "tokens": TokensValidator().key,
+        "document_name": DocumentNameValidator().key,
+        "verbose": VerboseValidator().key,
+        "precompile_preamble": PrecompilePreambleValidator().key,
+        "format_command": FormatCommandValidator().key,
+        "shared_assets": SharedAssetsValidator().key,
+        "binary_extensions": BinaryExtensionsValidator().key,
+        "memory_map_threshold": MemoryMapThresholdValidator().key,
+        "template_library": TemplateLibraryValidator().key,
+        "sources": SourcesValidator().key,
+        "parse_workers": ParseWorkersValidator().key,
+        "parse_executor": ParseExecutorValidator().key,
+        "render_cache_size": RenderCacheSizeValidator().key,
+        "render_cache_path": RenderCachePathValidator().key,
+        "outputs": OutputsValidator().key,
+        "seed": SeedValidator().key,
+        "tree_shake_preamble": TreeShakePreambleValidator().key,
+        "protected_macros": ProtectedMacrosValidator().key,
+        "remember_answers": RememberAnswersValidator().key,
+        "reuse_answers": ReuseAnswersValidator().key,
+    }
+
+    def __post_init__(self):
+        for setting in fields(self):
+            object.__setattr__(self, setting.name, freeze(getattr(self, setting.name)))
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        """Read-only mappings can't be pickled, send dictionaries instead."""
+        return (
+            type(self),
+            tuple(thaw(getattr(self, setting.name)) for setting in fields(self)),
+        )
+
+    @classmethod
+    def from_configuration(cls, configuration: dict[str, Any]) -> Settings:
+        """Take the values of the settings that are in `configuration`."""
+        values = {}
+        for setting in fields(cls):
+            key = cls.keys[setting.name]
+            if key in configuration:
+                values[setting.name] = configuration[key]
+        return cls(**values)
@@ -0,0 +1,24 @@
+from craft_documents.configuration.Semantic import Semantic
+from craft_documents.configuration.Validator import Validator
+
+
+class SharedAssetsValidator(Validator):
+    """
+    Boolean that defaults to False.
+
+    Controls whether identical assets of the compiled documents
+    are stored once in a content-addressed `shared/` folder.
+    """
+
+    def __init__(self):
+        self._key = "shared_assets"
+        self._semantic = Semantic.REQUIRED
+
+    def validate(self, value: bool) -> bool:
+        if isinstance(value, bool):
+            return True
+        else:
+            return False
+
+    def default(self) -> bool:
+        return False
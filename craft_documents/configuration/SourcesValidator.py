@@ -0,0 +1,38 @@
+from craft_documents.common.helpers import create_list
+from craft_documents.configuration.Semantic import Semantic
+from craft_documents.configuration.Validator import Validator
+
+
+class SourcesValidator(Validator):
+    """
+    Required, defaults to the templates on GitHub.
+
+    The sources of `craft templates fetch` in the order of
+    their precedence:
+
+    ```yaml
+    sources:
+      - github:tobiashauser/craft-templates
+      - /mnt/mirror/craft-templates       # directory
+      - ~/Downloads/craft-templates.zip   # zip or tar archive
+      - file:///mnt/mirror/templates.tgz
+    ```
+
+    Relative paths are interpreted as being inside
+    `~/.config/craft/`.
+    """
+
+    def __init__(self):
+        self._key = "sources"
+        self._semantic = Semantic.REQUIRED
+
+    def lint(self, value: str | list[str]) -> list[str]:
+        return [
+            source.strip() for source in create_list(value) if isinstance(source, str)
+        ]
+
+    def validate(self, value: list[str]) -> bool:
+        return len(value) > 0
+
+    def default(self) -> list[str]:
+        return ["github:tobiashauser/craft-templates"]
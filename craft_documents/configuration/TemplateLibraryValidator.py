@@ -0,0 +1,38 @@
+import tarfile
+import zipfile
+from pathlib import Path
+
+from craft_documents.configuration.Semantic import Semantic
+from craft_documents.configuration.Validator import Validator
+
+
+class TemplateLibraryValidator(Validator):
+    """
+    Accepts an absolute or relative path to a zip or tar archive
+    of the templates. Relative paths will be interpreted as being
+    inside `~/.config/craft/`.
+
+    The configuration then reads the templates from the archive
+    instead of the folders next to it, see `Configuration.validate()`.
+
+    Optional
+    """
+
+    def __init__(self):
+        self._key = "template_library"
+        self._semantic = Semantic.OPTIONAL
+
+    def lint(self, value: str | Path) -> Path:
+        path = Path(value).expanduser()
+        if path.is_absolute():
+            return path.resolve()
+        else:
+            return (self.configuration.main.parent / path).resolve()
+
+    def validate(self, value: Path) -> bool:
+        path = Path(value)
+        if path.is_file() and (zipfile.is_zipfile(path) or tarfile.is_tarfile(path)):
+            return True
+        else:
+            self.configuration.pop(self.key, None)
+            return False
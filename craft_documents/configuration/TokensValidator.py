@@ -5,12 +5,20 @@ from craft_documents.configuration.Validator import Validator
 class TokensValidator(Validator):
     """
     Required, defaults to token sets for `.tex` and `.ly`.
+
+    Token sets for other extensions, e.g. `.md` or `.typ`, are
+    added to the defaults.
     """
 
     def __init__(self):
         self._key = "tokens"
         self._semantic = Semantic.REQUIRED
 
+    def lint(self, value) -> dict[str, dict[str, str]]:
+        if isinstance(value, dict):
+            return self.default() | value
+        return value
+
     def validate(self, value: dict[str, dict[str, str]]) -> bool:
         invalid_keys = []
 
@@ -0,0 +1,24 @@
+from craft_documents.configuration.Semantic import Semantic
+from craft_documents.configuration.Validator import Validator
+
+
+class TreeShakePreambleValidator(Validator):
+    """
+    Boolean that defaults to False.
+
+    Controls whether macros and environments of the preamble
+    that the document never uses are left out.
+    """
+
+    def __init__(self):
+        self._key = "tree_shake_preamble"
+        self._semantic = Semantic.REQUIRED
+
+    def validate(self, value: bool) -> bool:
+        if isinstance(value, bool):
+            return True
+        else:
+            return False
+
+    def default(self) -> bool:
+        return False
@@ -2,6 +2,8 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from typing import TypeVar
 
+from craft_documents.common.DirectoryStorage import DirectoryStorage
+from craft_documents.common.Storage import Storage
 from craft_documents.configuration.Semantic import Semantic
 
 # Untyped reference to Configuration.. never could resolve the circular import
@@ -16,10 +18,15 @@ class Validator(ABC):
 
     Subclasses need to implement `validate()` and `resolve()`.
     If `validate()` returns `False`, `resolve()` will be run.
+
+    Subclasses can list the keys of other validators in
+    `_dependencies`, which are then run before them.
     """
 
     _semantic: Semantic
     _key: str
+    _dependencies: tuple[str, ...] = ()
+    _configuration = None
 
     @property
     def semantic(self) -> Semantic:
@@ -29,10 +36,24 @@ class Validator(ABC):
     def key(self) -> str:
         return self._key
 
+    @property
+    def dependencies(self) -> tuple[str, ...]:
+        return self._dependencies
+
     @property
     def configuration(self):
         return self._configuration
 
+    @property
+    def storage(self) -> Storage:
+        """
+        The storage of the templates in the configuration, with
+        a cache of the checked paths while it is validated.
+        """
+        if self.configuration is None:
+            return DirectoryStorage()
+        return self.configuration.validation_storage
+
     def __init__(self):
         """
         Set values for `_key` and `_semantic`.
@@ -1,5 +1,11 @@
 import collections.abc
+import json
+import os
+import random
+from collections import Counter
+from fnmatch import fnmatch
 from pathlib import Path
+from typing import Any
 
 from rich import print
 from rich.console import Console
@@ -10,18 +16,23 @@ collections.Mapping = collections.abc.Mapping  # type: ignore
 from PyInquirer import prompt  # bugfix collections
 
 from craft_documents.common.Exercise import Exercise
+from craft_documents.common.File import File
 from craft_documents.common.Folder import Folder
 from craft_documents.common.Header import Header
+from craft_documents.common.helpers import copy_file
 from craft_documents.common.Preamble import Preamble
 from craft_documents.common.Prompt import Checkbox, Input
+from craft_documents.common.Scope import Scope
+from craft_documents.common.Template import Template
+from craft_documents.common.Variants import Variants
 from craft_documents.configuration.Configuration import Configuration
 from craft_documents.configuration.CraftExercisesValidator import (
     CraftExercisesValidator,
     ExerciseConfiguration,
 )
-from craft_documents.configuration.MultipleExercisesValidator import (
-    MultipleExercisesValidator,
-)
+from craft_documents.configuration.SeedValidator import SeedValidator
+from craft_documents.new.Declarations import Declarations
+from craft_documents.new.SharedAssets import SharedAssets
 from craft_documents.new.Validators import (
     DocumentNamePromptValidator,
     ExerciseCountValidator,
@@ -59,13 +70,52 @@ class Compiler:
         return self._template_manager
 
     @property
-    def jobs(self) -> dict[Path, str]:
+    def jobs(self) -> dict[Path, str | Path | File]:
         """
         A dictionary of documents to create in the current
         working directory.
+
+        Values are either the contents of the document, the
+        path to a file on the disk that will be linked or a
+        file that will be copied.
         """
         return self._jobs
 
+    @property
+    def documents(self) -> list[Path]:
+        """The compiled documents among the jobs."""
+        return list(self.outputs)
+
+    @property
+    def outputs(self) -> dict[Path, Variants]:
+        """
+        The documents rendered from the compiled document and the
+        variants they include, e.g. `exam.tex` and
+        `exam-solutions.tex`.
+        """
+        if self.configuration.document_name is None:
+            return {}
+
+        document = Path(self.configuration.document_name)
+        return {
+            (
+                document
+                if name == ""
+                else document.with_stem(document.stem + "-" + name)
+            ): Variants(variants)
+            for name, variants in self.configuration.outputs.items()
+        }
+
+    @property
+    def shared_path(self) -> Path:
+        """The folder of the assets shared between documents."""
+        return Path("shared/")
+
+    @property
+    def formats_path(self) -> Path:
+        """The folder of the precompiled preambles."""
+        return self.configuration.main.parent / "formats/"
+
     @property
     def document(self) -> str:
         """The compiled document."""
@@ -83,16 +133,40 @@ class Compiler:
         if self.configuration.document_name is not None:
             self.jobs[Path(self.configuration.document_name)] = newValue
 
-    def __init__(self, configuration: Configuration):
+    @property
+    def scope(self) -> Scope:
+        """The answers for the compiled documents."""
+        return self._scope
+
+    @property
+    def output_path(self) -> Path:
+        """The folder in which the jobs are created."""
+        return self._output_path
+
+    def __init__(self, configuration: Configuration, seed: int | None = None):
         """
         You should guarantee values for `preamble` and `header` in the
         configuration when creating an instance of a Compiler.
+
+        Exercises drawn from pools and generated values are chosen
+        reproducibly for a given `seed`, which overrides the one in
+        the configuration.
         """
+        if seed is not None:
+            configuration[SeedValidator().key] = seed
+        seed = configuration.seed
 
         self._configuration = configuration
         self._preamble = Preamble(configuration.preamble, configuration)
         self._template_manager = TemplateManager(self.configuration)
         self._jobs = {}
+        self._scope = Scope(configuration).new_child()
+        self._output_path = Path()
+        self._seed = seed
+        self._random = random.Random(seed)
+        self._parsed: dict[Path, Exercise] = {
+            exercise.path: exercise for exercise in self.template_manager.exercises
+        }
 
         if configuration.header is not None:
             self._header = Header(configuration.header, configuration)
@@ -106,12 +180,7 @@ class Compiler:
                 CraftExercisesValidator().key
             ] = self.prompt_for_exercises()
 
-        self._exercises: list[Exercise] = []
-        for config in self.configuration[CraftExercisesValidator().key].values():
-            self._exercises += [
-                Exercise(config["path"], self.configuration)
-                for _ in range(config["count"])
-            ]
+        self._exercises: list[Exercise] = self.draw_exercises()
         self.disambiguate_exercises()
 
         if DocumentNameValidator().key not in self.configuration:
@@ -130,18 +199,21 @@ class Compiler:
             % (self.header.name, self.preamble.name)
         )
 
+        # The answers are shared by all documents of the compiler
+        scope = self.scope
+
         # preamble
-        if self.preamble.will_prompt():
+        if self.preamble.will_prompt(scope):
             print("")
             console.rule("[bold red]preamble")
-        self.preamble.resolve_placeholders(self.configuration)
+        self.preamble.resolve_placeholders(scope)
         print("[blue]==>[/blue] [bold]Compiled preamble :sparkles:")
 
         # header
-        if self.header.will_prompt():
+        if self.header.will_prompt(scope):
             print("")
             console.rule("[bold red]header")
-        self.header.resolve_placeholders(self.configuration)
+        self.header.resolve_placeholders(scope)
         print("[blue]==>[/blue] [bold]Compiled header :sparkles:")
 
         # exercises
@@ -154,7 +226,7 @@ class Compiler:
                 if exercise.name != exercise.disambiguated_name
                 else ""
             )
-            exercise.resolve_placeholders()
+            values = exercise.resolve_placeholders(scope)
             exercise.rename_supplements()
             print("[blue]==>[/blue] [bold]Compiled exercise :sparkles:\n")
 
@@ -165,47 +237,27 @@ class Compiler:
                     % (exercise.disambiguated_name, supplement.extension)
                 )
 
-                supplement.resolve_placeholders(
-                    exercise.unique_placeholder_values
-                    if self.configuration.unique_exercise_placeholders
-                    else self.configuration
-                )
-                print("[blue]==>[/blue] [bold]Compiled supplemental file :sparkles:")
-
                 supplement_file = Path(exercise.disambiguate_supplement(supplement))
-                self.jobs[supplement_file] = supplement.contents
+                match supplement:
+                    case Template():
+                        supplement.resolve_placeholders(values)
+                        print(
+                            "[blue]==>[/blue] [bold]Compiled supplemental file :sparkles:"
+                        )
+                        self.jobs[supplement_file] = (
+                            supplement
+                            if supplement.is_memory_mapped
+                            else supplement.contents
+                        )
+                    case _:
+                        self.jobs[supplement_file] = supplement
                 print("[blue]==>[/blue] [bold]Copied to current directory :printer:\n")
 
-            exercise.clean_resolve_placeholders()
-
         # Glue together the compiled document.
 
-        # Preamble
-        self.document += "% Preamble " + "-" * 66 + " %\n"
-        self.document += self.preamble.contents  # preamble
-
-        # Header
-        if len(self.header.declarations) != 0:
-            self.document += "\n% Header " + "-" * 67 + " %\n"
-        self.document += self.header.declarations  # declarations in header
-
-        # Exercises
-        extracted_declarations = set()
+        # Body
         body_exercises = ""
         for exercise in self.exercises:
-            if (
-                len(exercise.declarations) != 0
-                and exercise.name not in extracted_declarations
-            ):
-                self.document += (
-                    "% "
-                    + exercise.name
-                    + " "
-                    + "-" * (79 - 5 - len(exercise.name))
-                    + " %\n"
-                )
-                self.document += exercise.declarations  # declarations in exercises
-                extracted_declarations.add(exercise.name)
             if len(exercise.body) != 0:
                 body_exercises += (
                     "% "
@@ -217,23 +269,205 @@ class Compiler:
                 body_exercises += exercise.body
                 if not exercise.body.endswith("\n\n"):
                     body_exercises += "\n"
-
         self.header.set_craft_exercises(body_exercises)
+
+        # Every declaration is only kept once
+        precompile = self.configuration.precompile_preamble
+        declarations = Declarations()
+        preamble = declarations.add(self.preamble.contents, frozen=precompile)
+        header = declarations.add(self.header.declarations)
+        exercises = [
+            declarations.add(exercise.declarations) for exercise in self.exercises
+        ]
+
+        # Leave out the macros of the preamble that are never used
+        if self.configuration.tree_shake_preamble and not precompile:
+            dropped = declarations.shake(
+                preamble, self.header.body, self.configuration.protected_macros
+            )
+            print(
+                "[blue]==>[/blue] [bold]Left out %d unused definitions of the preamble :scissors:"
+                % len(dropped)
+            )
+
+        # Preamble
+        if precompile:
+            format_file = self.preamble.dump_format(
+                self.formats_path, self.configuration.format_command
+            )
+            self.jobs[Path(format_file.name)] = format_file
+            self.document += "%&" + format_file.stem + "\n"
+            self.document += "% Preamble " + "-" * 66 + " %\n"
+            self.document += "%% Precompiled into '%s'\n" % format_file.name
+        else:
+            self.document += "% Preamble " + "-" * 66 + " %\n"
+            self.document += self.include(declarations.render(preamble))  # preamble
+
+        # Header
+        if len(declarations.render(header)) != 0:
+            self.document += "\n% Header " + "-" * 67 + " %\n"
+        self.document += self.include(declarations.render(header))  # header
+
+        # Exercises
+        for exercise, section in zip(self.exercises, exercises):
+            if len(declarations.render(section)) != 0:
+                self.document += (
+                    "% "
+                    + exercise.name
+                    + " "
+                    + "-" * (79 - 5 - len(exercise.name))
+                    + " %\n"
+                )
+                self.document += self.include(declarations.render(section))
+
         self.document += "\\begin{document}\n"
         self.document += self.header.body
         self.document += "\\end{document}\n"
+        self.render_outputs()
 
         self.work_jobs()
+        for contents in self.jobs.values():
+            if isinstance(contents, File):
+                contents.close()
+
+        self.configuration.answers.save()
+        cache = self.configuration.render_cache
+        cache.save()
+        if self.configuration.verbose:
+            print("[blue]==>[/blue] Render cache: %s" % cache.report())
+
+    def compile_variants(self, count: int):
+        """
+        Compile `count` variants of the document, each with its own
+        draw of exercises from the pools, into folders named after
+        the document, e.g. `exam-01/exam.tex`.
+
+        The answers are asked for once, generated values are drawn
+        for every variant. The exercises of every variant are
+        recorded in `exam-variants.json`.
+        """
+        document = Path(self.configuration.document_name)
+        header, preamble = self.header, self.preamble
+        manifest: dict[str, Any] = {"seed": self._seed, "variants": {}}
+
+        generators = self.configuration.generators
+        for generator in generators:
+            generator.reserve(count)
+
+        for number in range(1, count + 1):
+            name = "%s-%0*d" % (document.stem, len(str(count)), number)
+            for generator in generators:
+                self.scope.pop(generator.name, None)
+            if number > 1:
+                self._exercises = self.draw_exercises()
+                self.disambiguate_exercises()
+            self._header = header.clone()
+            self._preamble = preamble.clone()
+            self._jobs = {}
+            self._output_path = Path(name)
+
+            manifest["variants"][name] = [exercise.name for exercise in self.exercises]
+            self.compile()
+
+        self._output_path = Path()
+        Path(document.stem + "-variants.json").write_text(
+            json.dumps(manifest, indent=2) + "\n"
+        )
+        print("[blue]==>[/blue] [bold]Compiled %d variants :sparkles:" % count)
+
+    def draw_exercises(self) -> list[Exercise]:
+        """
+        Create the exercises of one document. Every exercise is
+        only parsed once and cloned for each of its copies.
+        """
+        exercises: list[Exercise] = []
+        for config in self.configuration[CraftExercisesValidator().key].values():
+            if "pool" in config:
+                drawn = self.draw(config["pool"], config["count"])
+                exercises += [exercise.clone() for exercise in drawn]
+            else:
+                exercise = self.parse_exercise(config["path"])
+                exercises += [exercise.clone() for _ in range(config["count"])]
+        return exercises
+
+    def draw(self, pattern: str, count: int) -> list[Exercise]:
+        """Draw `count` different exercises whose name matches `pattern`."""
+        pool = sorted(
+            (
+                exercise
+                for exercise in self.template_manager.exercises
+                if fnmatch(exercise.name, pattern)
+            ),
+            key=lambda exercise: exercise.name,
+        )
+        if count > len(pool):
+            raise Exception(
+                "Couldn't draw %d exercises from the %d matching '%s'."
+                % (count, len(pool), pattern)
+            )
+        return self._random.sample(pool, count)
+
+    def parse_exercise(self, path: Path) -> Exercise:
+        if path not in self._parsed:
+            self._parsed[path] = Exercise(path, self.configuration)
+        return self._parsed[path]
+
+    def render_outputs(self):
+        """
+        Render every output from the one compiled document by
+        selecting the blocks of its variants.
+        """
+        if self.configuration.document_name is None:
+            return
+
+        document = self.jobs.pop(Path(self.configuration.document_name), "")
+        for path, variants in self.outputs.items():
+            self.jobs[path] = variants.select(document)  # type: ignore
+
+    def include(self, declarations: str) -> str:
+        """
+        Return the declarations to glue into the document.
+
+        With `shared_assets` the declarations are moved into the
+        shared folder and the document only inputs them.
+        """
+        if not self.configuration.shared_assets or len(declarations) == 0:
+            return declarations
+
+        asset = SharedAssets(self.shared_path).address(declarations, ".tex")
+        self.jobs[asset] = declarations
+        relative = Path(os.path.relpath(asset, self.output_path))
+        return "\\input{%s}\n" % relative.as_posix()
 
     def work_jobs(self):
         """
         Create the files.
 
+        With `shared_assets` every file but the documents is created
+        from the shared folder, which is only written to for assets
+        that don't exist yet.
+
         This is overridden in the test_implementation to instead print
         to the console.
         """
+        shared = SharedAssets(self.shared_path)
         for path, contents in self.jobs.items():
-            path.write_text(contents)
+            target = (
+                path if path.parent == self.shared_path else self.output_path / path
+            )
+            target.parent.mkdir(parents=True, exist_ok=True)
+
+            if self.configuration.shared_assets and path not in self.documents:
+                shared.provide(target, contents)
+                continue
+
+            match contents:
+                case Path():
+                    copy_file(contents, target)
+                case File():
+                    contents.write(target)
+                case _:
+                    target.write_text(contents)
 
     def prompt_for_document_name(self) -> str:
         """
@@ -273,7 +507,7 @@ class Compiler:
         }
 
         # multiple exercises
-        if self.configuration[MultipleExercisesValidator().key]:
+        if self.configuration.multiple_exercises:
             for exercise_name, config in answer.items():
                 question = Input(
                     "count",
@@ -287,9 +521,9 @@ class Compiler:
         return answer
 
     def disambiguate_exercises(self):
-        count = {}
+        totals = Counter(exercise.name for exercise in self.exercises)
+        count: dict[str, int] = {}
         for exercise in self.exercises:
-            if self.configuration["craft-exercises"][exercise.name]["count"] > 1:
-                add = count.get(exercise.name, 1)
-                exercise.disambiguation_suffix = add
-                count[exercise.name] = count.get(exercise.name, 1) + 1
+            if totals[exercise.name] > 1:
+                count[exercise.name] = count.get(exercise.name, 0) + 1
+                exercise.disambiguation_suffix = count[exercise.name]
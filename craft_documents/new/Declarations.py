@@ -0,0 +1,235 @@
+import re
+
+
+class Declarations:
+    r"""
+    The declarations of the sections of a document, e.g. the
+    preamble, the header and every exercise, with every
+    package and definition kept only once.
+
+    Sections are split into statements that span lines until
+    their braces are balanced. A `\usepackage` or a definition
+    is dropped if the same statement, ignoring whitespace and
+    comments, was already declared in an earlier section. Other
+    statements, e.g. `\makeatletter` or `\setlength`, are kept
+    every time. Packages are only loaded once with all the
+    options requested for them:
+
+    ```text
+    \usepackage[a]{pkg}  ──> \usepackage[a,b]{pkg}
+    \usepackage{pkg}     ──> dropped
+    \usepackage[b]{pkg}  ──> dropped
+    ```
+
+    Sections added with `frozen` are not changed, because they
+    were already compiled, e.g. into a precompiled preamble.
+
+    ### Tree-shaking
+
+    `shake()` drops the macros and environments defined in a
+    section that the document never reaches, starting from the
+    body and every statement that is not a definition.
+    """
+
+    usepackage = re.compile(
+        r"^\\usepackage\s*(?:\[([^\]]*)\])?\s*\{([^}]*)\}\s*$", re.DOTALL
+    )
+    comment = re.compile(r"(?<!\\)%.*")
+    # A comment also swallows the line ending and the next indentation
+    comment_line = re.compile(r"(?<!\\)%.*(\n[ \t]*)?")
+
+    # Definitions that can be dropped if their name is never used
+    definition = re.compile(
+        r"\\(?:(?:new|provide)command\*?|DeclareMathOperator\*?|def)"
+        r"\s*\{?\s*(\\[A-Za-z@]+)"
+        r"|\\newenvironment\*?\s*\{\s*([^}\s]+)\s*\}"
+    )
+    control_sequence = re.compile(r"\\[A-Za-z@]+")
+    environment = re.compile(r"\\begin\s*\{\s*([^}\s]+)\s*\}")
+
+    def __init__(self):
+        # Every chunk of a section is `[text, key]`. Chunks without
+        # a key are blank lines or comments and are always kept.
+        self._sections: list[list[list]] = []
+        self._seen: set[str] = set()
+        # package -> (options, first chunk loading it, whether it can change)
+        self._packages: dict[str, tuple[list[str], list, bool]] = {}
+
+    def add(self, text: str, frozen: bool = False) -> int:
+        """Add a section and return its index for `render()`."""
+        chunks = []
+        for statement in self.split(text):
+            key = self.normalize(statement)
+            if key == "":
+                chunks.append([statement, None])
+            elif not self.is_unique(key):
+                chunks.append([statement, key])
+            elif key in self._seen:
+                continue
+            else:
+                chunk = [statement, key]
+                if self.merge(chunk, frozen):
+                    chunks.append(chunk)
+                self._seen.add(key)
+
+        self._sections.append(chunks)
+        return len(self._sections) - 1
+
+    def render(self, index: int) -> str:
+        """The statements of a section that were not declared before."""
+        rendered = "".join(text for text, _ in self._sections[index])
+        return rendered if rendered.strip() != "" else ""
+
+    def shake(
+        self, index: int, body: str, protected: tuple[str, ...] = ()
+    ) -> list[str]:
+        """
+        Drop the definitions of section `index` that are not
+        reached from `body`, the other statements or the
+        `protected` names. Environments are named without a
+        backslash. Returns the names that were dropped.
+        """
+        definitions: dict[str, list[list]] = {}
+        roots = body
+        for section in self._sections:
+            for chunk in section:
+                names = []
+                if section is self._sections[index] and chunk[1] is not None:
+                    names = self.defines(chunk[1])
+                if len(names) == 0:
+                    roots += chunk[0]
+                for name in names:
+                    definitions.setdefault(name, []).append(chunk)
+
+        reached: set[str] = set()
+        queue = list(self.uses(roots))
+        queue += ["\\" + name for name in protected]
+        queue += ["{%s}" % name for name in protected]
+        while len(queue) != 0:
+            name = queue.pop()
+            if name in reached:
+                continue
+            reached.add(name)
+            for chunk in definitions.get(name, []):
+                # A statement is kept with everything it defines
+                queue += self.uses(chunk[0])
+                queue += self.defines(chunk[1])
+
+        dropped = [name for name in definitions if name not in reached]
+        for name in dropped:
+            for chunk in definitions[name]:
+                chunk[0] = ""
+        return dropped
+
+    @classmethod
+    def is_unique(cls, key: str) -> bool:
+        """Whether the normalized statement only needs to be declared once."""
+        return (
+            cls.usepackage.match(key) is not None
+            or cls.definition.match(key) is not None
+        )
+
+    @classmethod
+    def defines(cls, key: str) -> list[str]:
+        """
+        The macros and environments defined by the normalized
+        statement, if it starts with a definition.
+        """
+        if cls.definition.match(key) is None:
+            return []
+        return [
+            match.group(1) or "{%s}" % match.group(2)
+            for match in cls.definition.finditer(key)
+        ]
+
+    @classmethod
+    def uses(cls, text: str) -> set[str]:
+        """The macros and environments used in `text`."""
+        text = cls.comment.sub("", text)
+        return set(cls.control_sequence.findall(text)) | {
+            "{%s}" % name for name in cls.environment.findall(text)
+        }
+
+    def merge(self, chunk: list, frozen: bool) -> bool:
+        """
+        Merge the options of the packages loaded by `chunk` into
+        the statements that loaded them first. Returns whether
+        the chunk still loads any package.
+        """
+        match = self.usepackage.match(self.comment.sub("", chunk[0]).strip())
+        if match is None:
+            return True
+
+        options = self.split_list(match.group(1))
+        requested = self.split_list(match.group(2))
+        packages = []
+        for package in requested:
+            if package not in self._packages:
+                packages.append(package)
+                continue
+
+            loaded, first, mergeable = self._packages[package]
+            missing = [option for option in options if option not in loaded]
+            if len(missing) == 0:
+                continue
+            if not mergeable:
+                # The first statement can't change, load the package again
+                packages.append(package)
+                continue
+            loaded.extend(missing)
+            first[0] = self.format(loaded, package, first[0])
+
+        if len(packages) == 0:
+            return False
+
+        if packages != requested:
+            chunk[0] = self.format(options, ",".join(packages), chunk[0])
+        for package in packages:
+            self._packages.setdefault(
+                package, (list(options), chunk, not frozen and len(packages) == 1)
+            )
+        return True
+
+    @staticmethod
+    def format(options: list[str], packages: str, original: str) -> str:
+        ending = original[len(original.rstrip()) :]
+        if len(options) == 0:
+            return "\\usepackage{%s}%s" % (packages, ending)
+        return "\\usepackage[%s]{%s}%s" % (",".join(options), packages, ending)
+
+    @staticmethod
+    def split_list(value: str | None) -> list[str]:
+        if value is None:
+            return []
+        return [item.strip() for item in value.split(",") if item.strip() != ""]
+
+    @classmethod
+    def normalize(cls, statement: str) -> str:
+        """The statement without comments and with collapsed whitespace."""
+        return " ".join(cls.comment_line.sub("", statement).split())
+
+    @classmethod
+    def split(cls, text: str) -> list[str]:
+        """
+        Split `text` into statements, blank lines and comments
+        with their line endings.
+        """
+        statements: list[str] = []
+        statement = ""
+        depth = 0
+        for line in text.splitlines(keepends=True):
+            code = cls.comment.sub("", line).replace("\\{", "").replace("\\}", "")
+            if depth == 0 and code.strip() == "":
+                statements.append(line)
+                continue
+
+            statement += line
+            depth += code.count("{") - code.count("}")
+            if depth <= 0:
+                statements.append(statement)
+                statement = ""
+                depth = 0
+
+        if statement != "":
+            statements.append(statement)
+        return statements
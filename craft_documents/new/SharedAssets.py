@@ -0,0 +1,78 @@
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+from craft_documents.common.File import File
+from craft_documents.common.helpers import copy_file
+
+
+class SharedAssets:
+    """
+    A content-addressed folder of assets that are shared
+    between compiled documents.
+
+    Every asset is stored once under the hash of its contents.
+    Documents either `\\input` the asset from the folder or get
+    a copy of it, which is a reflink on copy-on-write file
+    systems. Copies can be edited without changing the asset.
+
+    ```text
+    shared/
+    ├── 2c26b46b68ffc68f.tex  <── \\input{shared/2c26b46b68ffc68f.tex}
+    └── fcde2b2edba56bf4.ly   <── exercise-1.ly, exercise-2.ly
+    ```
+    """
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def __init__(self, path: Path):
+        self._path = path
+
+    def address(self, contents: str | File, suffix: str) -> Path:
+        """The path at which `contents` are stored."""
+        match contents:
+            case File():
+                key = contents.fingerprint
+            case _:
+                key = hashlib.sha256(contents.encode()).hexdigest()
+        return self.path / (key[:16] + suffix)
+
+    def store(self, contents: str | File, suffix: str) -> Path:
+        """
+        Store `contents` and return the path of the asset.
+
+        Assets that already exist are not written again.
+        """
+        asset = self.address(contents, suffix)
+        if not asset.is_file():
+            self.path.mkdir(parents=True, exist_ok=True)
+
+            # Write atomically in case another process stores the same asset
+            descriptor, temporary = tempfile.mkstemp(dir=self.path, suffix=suffix)
+            os.close(descriptor)
+            match contents:
+                case File():
+                    contents.write(Path(temporary))
+                case _:
+                    Path(temporary).write_text(contents)
+            os.replace(temporary, asset)
+
+        return asset
+
+    def provide(self, target: Path, contents: str | Path | File):
+        """
+        Create `target` from the shared assets.
+
+        Targets inside the folder are only stored. Any other target
+        is a copy of the asset with the same contents.
+        """
+        match contents:
+            case Path():
+                copy_file(contents, target)
+            case _ if target.parent == self.path:
+                self.store(contents, target.suffix)
+            case _:
+                copy_file(self.store(contents, target.suffix), target)
@@ -1,4 +1,4 @@
-from typing import Callable
+from typing import Callable, List, Optional
 
 import typer
 from rich import print
@@ -7,6 +7,10 @@ from typing_extensions import Annotated
 
 from craft_documents.common.Header import Header
 from craft_documents.configuration.Configuration import Configuration
+from craft_documents.configuration.CraftExercisesValidator import (
+    CraftExercisesValidator,
+)
+from craft_documents.configuration.ReuseAnswersValidator import ReuseAnswersValidator
 from craft_documents.configuration.VerboseValidator import VerboseValidator
 from craft_documents.debug.Debugger import Debugger
 from craft_documents.templates.TemplateManager import TemplateManager
@@ -45,19 +49,58 @@ class Subcommands:
                 self.create_subcommand_for(header)
             )
 
+    def complete_exercises(self, incomplete: str) -> list[str]:
+        return [
+            exercise.name
+            for exercise in self.template_manager.exercises
+            if exercise.name.startswith(incomplete)
+        ]
+
     def create_subcommand_for(self, header: Header) -> Callable[..., None]:
         def subcommand(
             verbose: Annotated[
                 bool, typer.Option(help="Output additional information.")
             ] = False,
+            variants: Annotated[
+                int,
+                typer.Option(
+                    min=1, help="Number of variants with their own exercises."
+                ),
+            ] = 1,
+            seed: Annotated[
+                Optional[int],
+                typer.Option(help="Seed for drawing exercises from pools."),
+            ] = None,
+            exercise: Annotated[
+                Optional[List[str]],
+                typer.Option(
+                    "--exercise",
+                    "-e",
+                    help="Include this exercise, can be repeated.",
+                    autocompletion=self.complete_exercises,
+                ),
+            ] = None,
+            reuse_answers: Annotated[
+                Optional[bool],
+                typer.Option(help="Use the answers of the last run without prompting."),
+            ] = None,
         ):
             self.configuration[VerboseValidator().key] = verbose
+            # Only override the craftrc if the flag is given
+            if reuse_answers is not None:
+                self.configuration[ReuseAnswersValidator().key] = reuse_answers
             self.configuration.header = header.name
-            compiler = Compiler(self.configuration)  # type: ignore
+            if exercise:
+                self.configuration[CraftExercisesValidator().key] = exercise
+                CraftExercisesValidator().run(self.configuration)
+            compiler = Compiler(self.configuration, seed=seed)  # type: ignore
 
             if self.configuration.verbose:
                 Debugger(self.configuration).run()
 
-            compiler.compile()
+            if variants > 1:
+                compiler.compile_variants(variants)
+            else:
+                compiler.compile()
 
         return subcommand
@@ -0,0 +1,84 @@
+from typing import Any
+
+import requests
+
+from craft_documents.common.helpers import GITHUB_API, TIMEOUT, create_session
+from craft_documents.templates.Source import Fetched, Source
+
+
+class GitHubSource(Source):
+    """
+    Templates in a repository on GitHub.
+
+    Listings and files are requested conditionally on their
+    ETag and Last-Modified, and the git hash of a file is its
+    version.
+    """
+
+    def __init__(
+        self,
+        owner: str,
+        repo: str,
+        path: str = "",
+        api: str = GITHUB_API,
+        session: requests.Session | None = None,
+    ):
+        self._name = "github:%s/%s" % (owner, repo) + ("/" + path if path else "")
+        self.owner = owner
+        self.repo = repo
+        self.path = path.strip("/") + "/" if path.strip("/") else ""
+        self.api = api
+        self.session = session or create_session()
+
+    def get(self, url: str, entry: dict[str, Any]) -> requests.Response | None:
+        """Request `url` conditionally on the validators in `entry`."""
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+        try:
+            return self.session.get(url, headers=headers, timeout=TIMEOUT)
+        except requests.RequestException:
+            return None
+
+    def list_directory(
+        self, directory: str, cache: dict[str, Any]
+    ) -> list[dict[str, Any]] | None:
+        url = (
+            f"{self.api}/repos/{self.owner}/{self.repo}/contents/{self.path}{directory}"
+        )
+        cached = cache.get(directory, {})
+        response = self.get(url, cached)
+
+        if response is None or response.status_code not in (200, 304):
+            return None
+        if response.status_code == 304:
+            return cached["items"]
+
+        items = [
+            {
+                "name": item["name"],
+                "version": item.get("sha"),
+                "url": item["download_url"],
+            }
+            for item in response.json()
+            if item.get("type") == "file" and item.get("download_url")
+        ]
+        cache[directory] = {"etag": response.headers.get("ETag"), "items": items}
+        return items
+
+    def fetch(self, item: dict[str, Any], entry: dict[str, Any]) -> Fetched | None:
+        response = self.get(item["url"], entry)
+
+        if response is None or response.status_code not in (200, 304):
+            return None
+        if response.status_code == 304:
+            return Fetched(None, entry.get("etag"), entry.get("last_modified"))
+
+        return Fetched(
+            response.content.decode(),
+            response.headers.get("ETag"),
+            response.headers.get("Last-Modified"),
+        )
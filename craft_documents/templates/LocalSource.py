@@ -0,0 +1,40 @@
+from pathlib import Path
+from typing import Any
+
+from craft_documents.common.Storage import Storage
+from craft_documents.templates.Source import Fetched, Source
+
+
+class LocalSource(Source):
+    """
+    Templates in a storage such as a directory on a mirror
+    or an archive.
+
+    The folders `preambles`, `headers` and `exercises` are
+    expected inside `root`.
+    """
+
+    def __init__(self, name: str, storage: Storage, root: Path):
+        self._name = name
+        self.storage = storage
+        self.root = root
+
+    def list_directory(
+        self, directory: str, cache: dict[str, Any]
+    ) -> list[dict[str, Any]] | None:
+        path = self.root / directory
+        if not self.storage.is_dir(path):
+            return []
+
+        files, _ = self.storage.iterdir(path)
+        return [
+            {"name": file.name, "version": None, "path": str(file)}
+            for file in sorted(files)
+            if not file.name.startswith(".")
+        ]
+
+    def fetch(self, item: dict[str, Any], entry: dict[str, Any]) -> Fetched | None:
+        try:
+            return Fetched(self.storage.read_text(Path(item["path"])))
+        except (OSError, UnicodeDecodeError):
+            return None
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import json
+import os
+import shlex
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING, Mapping
+
+if TYPE_CHECKING:
+    from craft_documents.templates.TemplateManager import TemplateManager
+
+
+class NameIndex:
+    """
+    The names of the templates, cached for shell completion in
+    `~/.config/craft/.name-index.json`:
+
+    ```json
+    {
+        "stamps": {"headers": 1718000000000000000, "exercises/harmony": ...},
+        "headers": ["exam", "worksheet"],
+        "exercises": ["harmony/cadences", "intervals"],
+        "preambles": ["default"]
+    }
+    ```
+
+    The index is stale once the modification time of one of the
+    template folders changes. Completions are then answered by
+    the CLI, which writes the index again.
+
+    This module only imports the standard library, so that
+    completing from the index doesn't load the CLI.
+    """
+
+    # The environment variable of the completion requests of Typer
+    variable = "_CRAFT_COMPLETE"
+    kinds = ["headers", "exercises", "preambles"]
+
+    @property
+    def path(self) -> Path:
+        return self.folder / ".name-index.json"
+
+    def __init__(self, folder: Path):
+        self.folder = folder
+
+    def load(self) -> dict[str, list[str]] | None:
+        """The names by kind, or `None` if the index is missing or stale."""
+        try:
+            index = json.loads(self.path.read_text())
+            for directory, stamp in index["stamps"].items():
+                if os.stat(self.folder / directory).st_mtime_ns != stamp:
+                    return None
+            return {kind: index[kind] for kind in self.kinds}
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def save(self, names: dict[str, list[str]], directories: list[str]):
+        """Write the index atomically, stamped with `directories`."""
+        index: dict = {
+            "stamps": {
+                directory: os.stat(self.folder / directory).st_mtime_ns
+                for directory in directories
+            }
+        }
+        index.update(names)
+
+        descriptor, temporary = tempfile.mkstemp(
+            dir=self.folder, prefix=".name-index-", suffix=".json"
+        )
+        with os.fdopen(descriptor, "w") as file:
+            json.dump(index, file)
+        os.replace(temporary, self.path)
+
+    def update(self, template_manager: TemplateManager):
+        """Write the names of the parsed templates if they changed."""
+        names = {
+            "headers": [header.name for header in template_manager.headers],
+            "exercises": [exercise.name for exercise in template_manager.exercises],
+            "preambles": [preamble.name for preamble in template_manager.preambles],
+        }
+        if self.load() == names or not self.folder.is_dir():
+            return
+
+        # Every folder with exercises, the folders above them and
+        # their `.craftignore` files
+        folders = {Path("headers"), Path("preambles"), Path("exercises")}
+        for name in names["exercises"]:
+            parent = Path("exercises", name).parent
+            folders.update([parent, *parent.parents][:-1])
+        stamped = [folder for folder in folders if (self.folder / folder).is_dir()]
+        stamped += [
+            folder / ".craftignore"
+            for folder in stamped
+            if (self.folder / folder / ".craftignore").is_file()
+        ]
+        self.save(names, sorted(folder.as_posix() for folder in stamped))
+
+    def complete(self, environ: Mapping[str, str]) -> str | None:
+        """
+        Answer a completion request of the shell from the index:
+
+        - `craft new <TAB>` completes the headers
+        - `craft new exam --exercise <TAB>` completes the exercises
+
+        Returns `None` if the request can't be answered from the
+        index and the CLI has to answer it.
+        """
+        request = self.arguments(environ)
+        if request is None:
+            return None
+        shell, args, incomplete = request
+        if len(args) == 0 or args[0] != "new" or incomplete.startswith("-"):
+            return None
+
+        if len(args) == 1:
+            kind = "headers"
+        elif len(args) > 2 and args[-1] in ("--exercise", "-e"):
+            kind = "exercises"
+        else:
+            return None
+
+        names = self.load()
+        if names is None:
+            return None
+
+        completions = [
+            (name, "Create a new %s." % name if kind == "headers" else None)
+            for name in names[kind]
+            if name.startswith(incomplete)
+        ]
+        return self.format(shell, completions)
+
+    @classmethod
+    def arguments(cls, environ: Mapping[str, str]) -> tuple[str, list[str], str] | None:
+        """The shell, the complete arguments and the incomplete one."""
+        shell = environ.get(cls.variable, "").removeprefix("complete_")
+        try:
+            if shell == "bash":
+                words = shlex.split(environ["COMP_WORDS"])
+                index = int(environ["COMP_CWORD"])
+                incomplete = words[index] if index < len(words) else ""
+                return shell, words[1:index], incomplete
+            if shell in ("zsh", "fish"):
+                line = environ.get("_TYPER_COMPLETE_ARGS", "")
+                args = shlex.split(line)[1:]
+                if len(args) != 0 and not line.endswith(" "):
+                    return shell, args[:-1], args[-1]
+                return shell, args, ""
+        except (KeyError, ValueError):
+            pass
+        return None
+
+    @staticmethod
+    def format(shell: str, completions: list[tuple[str, str | None]]) -> str:
+        """Format the completions like Typer does for `shell`."""
+        if shell == "zsh":
+            if len(completions) == 0:
+                return "_files"
+
+            def escape(text: str) -> str:
+                return (
+                    text.replace('"', '""')
+                    .replace("'", "''")
+                    .replace("$", "\\$")
+                    .replace("`", "\\`")
+                    .replace(":", r"\\:")
+                )
+
+            items = [
+                (
+                    '"%s":"%s"' % (escape(value), escape(help))
+                    if help is not None
+                    else '"%s"' % escape(value)
+                )
+                for value, help in completions
+            ]
+            return "_arguments '*: :((%s))'" % "\n".join(items)
+
+        if shell == "fish":
+            return "\n".join(
+                value if help is None else "%s\t%s" % (value, help)
+                for value, help in completions
+            )
+        return "\n".join(value for value, _ in completions)
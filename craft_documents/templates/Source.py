@@ -0,0 +1,58 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass
+class Fetched:
+    """
+    The result of fetching a template from a source.
+
+    `contents` is `None` if the source reported that the
+    template didn't change since it was last fetched.
+    """
+
+    contents: str | None
+    etag: str | None = None
+    last_modified: str | None = None
+
+
+class Source(ABC):
+    """
+    Abstract class representing a place to fetch templates from.
+
+    Conforming types:
+    - GitHubSource
+    - LocalSource
+
+    Sources list the templates in a directory such as
+    `headers` as items with a `name` and a `version`. The
+    version is opaque and `None` if the source can't tell
+    whether a template changed without fetching it.
+    """
+
+    @property
+    def name(self) -> str:
+        """Identifies the source in the manifest."""
+        return self._name
+
+    @abstractmethod
+    def list_directory(
+        self, directory: str, cache: dict[str, Any]
+    ) -> list[dict[str, Any]] | None:
+        """
+        List the templates in `directory` or return `None`
+        if the directory couldn't be listed.
+
+        `cache` is persisted in the manifest for this source.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def fetch(self, item: dict[str, Any], entry: dict[str, Any]) -> Fetched | None:
+        """
+        Fetch the template `item` or return `None` on failure.
+
+        `entry` is the manifest entry of the installed version.
+        """
+        raise NotImplementedError
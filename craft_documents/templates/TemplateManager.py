@@ -1,22 +1,80 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 
+from rich import print
+
 from craft_documents.common.Exercise import Exercise
 from craft_documents.common.Folder import Folder
 from craft_documents.common.Header import Header
+from craft_documents.common.helpers import UnsafeExpressionError
 from craft_documents.common.Preamble import Preamble
+from craft_documents.common.Storage import Storage
+from craft_documents.common.TemplateLibrary import TemplateLibrary
+from craft_documents.common.TexTemplate import TexTemplate
 from craft_documents.configuration.Configuration import Configuration
 
+# The configuration of a worker process, see `TemplateManager.parse()`
+_configuration: Configuration | None = None
+
+
+def initialize_worker(configuration: Configuration):
+    global _configuration
+    _configuration = configuration
+
+
+def parse_template(task: tuple[type, Path]) -> TexTemplate | None:
+    kind, path = task
+    return create_template(kind, path, _configuration)  # type: ignore
+
+
+def create_template(
+    kind: type, path: Path, configuration: Configuration
+) -> TexTemplate | None:
+    """
+    Create the template at `path`, or report it and return `None`
+    if one of its prompts has an expression that is not allowed.
+    """
+    try:
+        return kind(path, configuration)
+    except UnsafeExpressionError as error:
+        print("[red]Skipped the template '%s': %s[/red]" % (path, error))
+        return None
+
 
 class TemplateManager:
     """
     A class that manages the templates installed on the system.
+
+    Exercises can be organized in nested folders, their names
+    are relative to the exercises folder: `harmony/cadences/v-i`.
+
+    Libraries of at least `parallel_threshold` templates are
+    parsed in parallel by `parse_workers` workers.
+
+    The templates are read from and written to the storage
+    of the configuration. They are read from the generation
+    pinned by the configuration and written in transactions.
     """
 
+    parallel_threshold = 64
+
+    @property
+    def configuration(self) -> Configuration:
+        return self._configuration
+
     @property
     def folder(self) -> Folder:
         """The folder of the templates: `~/.config/craft/`."""
         return self._folder
 
+    @property
+    def storage(self) -> Storage:
+        return self.folder.storage
+
+    @property
+    def library(self) -> TemplateLibrary:
+        return self.configuration.library
+
     @property
     def headers(self) -> list[Header]:
         """List of all Headers."""
@@ -24,7 +82,7 @@ class TemplateManager:
 
     @property
     def headers_path(self) -> Path:
-        return self.folder.path / "headers/"
+        return self.library.root / "headers/"
 
     @property
     def exercises(self) -> list[Exercise]:
@@ -33,7 +91,7 @@ class TemplateManager:
 
     @property
     def exercises_path(self) -> Path:
-        return self.folder.path / "exercises/"
+        return self.library.root / "exercises/"
 
     @property
     def preambles(self) -> list[Preamble]:
@@ -42,46 +100,95 @@ class TemplateManager:
 
     @property
     def preambles_path(self) -> Path:
-        return self.folder.path / "preambles/"
+        return self.library.root / "preambles/"
 
     def __init__(self, configuration: Configuration):
-        self._folder = Folder(configuration.main.parent)
-
-        self._headers = [
-            Header(path, configuration)
-            for headers in self.folder.subfolders
-            for path in Folder(headers).subfiles
-            if headers.name == "headers"
-            if path.suffix == ".tex"
-        ]
-
-        self._exercises = [
-            Exercise(path, configuration)
-            for exercises in self.folder.subfolders
-            for path in Folder(exercises).subfiles
-            if exercises.name == "exercises"
-            if path.suffix == ".tex"
-        ]
-
-        self._preambles = [
-            Preamble(path, configuration)
-            for preambles in self.folder.subfolders
-            for path in Folder(preambles).subfiles
-            if preambles.name == "preambles"
-            if path.suffix == ".tex"
+        self._configuration = configuration
+        self._folder = Folder(configuration.main.parent, storage=configuration.storage)
+
+        tasks: list[tuple[type, Path]] = [
+            (kind, path)
+            for kind, folder, recursive in [
+                (Header, self.headers_path, False),
+                (Exercise, self.exercises_path, True),
+                (Preamble, self.preambles_path, False),
+            ]
+            for path in sorted(self.template_paths(folder, recursive))
         ]
+        templates = self.parse(tasks)
+
+        self._headers = [t for t in templates if isinstance(t, Header)]
+        self._exercises = [t for t in templates if isinstance(t, Exercise)]
+        self._preambles = [t for t in templates if isinstance(t, Preamble)]
+
+    def parse(self, tasks: list[tuple[type, Path]]) -> list[TexTemplate]:
+        """
+        Create the templates in the order of `tasks`, skipping the
+        templates that can't be created, see `create_template()`.
+
+        Large libraries are parsed by a pool of threads or, if
+        `parse_executor` is `process`, of processes. Templates from
+        other processes come back without their configuration and
+        are attached to it again, which compiles their prompts a
+        second time.
+        """
+        workers = self.configuration.parse_workers
+        if workers <= 1 or len(tasks) < self.parallel_threshold:
+            templates = [
+                create_template(kind, path, self.configuration) for kind, path in tasks
+            ]
+            return [template for template in templates if template is not None]
+
+        if self.configuration.parse_executor == "thread":
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                templates = list(
+                    executor.map(
+                        lambda t: create_template(t[0], t[1], self.configuration),
+                        tasks,
+                    )
+                )
+            return [template for template in templates if template is not None]
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=initialize_worker,
+            initargs=(self.configuration,),
+        ) as executor:
+            chunksize = max(1, len(tasks) // (4 * workers))
+            parsed = list(executor.map(parse_template, tasks, chunksize=chunksize))
+
+        templates = [template for template in parsed if template is not None]
+        for template in templates:
+            template.attach(self.configuration)
+        return templates
+
+    def template_paths(self, path: Path, recursive: bool = False) -> list[Path]:
+        """
+        The tex-files in the folder at `path` and, if `recursive`,
+        in its subfolders. See `Folder.walk()`.
+        """
+        if not self.storage.is_dir(path):
+            return []
+        folder = Folder(path, storage=self.storage)
+        files = folder.walk() if recursive else folder.subfiles
+        return [file for file in files if file.suffix == ".tex"]
+
+    def transaction(self):
+        """
+        Publish all templates written in the block at once.
+        See `TemplateLibrary.transaction()`.
+        """
+        return self.library.transaction()
+
+    def new_file(self, name: str, contents: str):
+        """Write a file relative to the templates folder."""
+        self.library.write(name, contents)
 
     def new_preamble(self, name: str, contents: str):
-        self.preambles_path.mkdir(parents=True, exist_ok=True)
-        path = self.preambles_path / name
-        path.write_text(contents)
+        self.new_file("preambles/" + name, contents)
 
     def new_header(self, name: str, contents: str):
-        self.headers_path.mkdir(parents=True, exist_ok=True)
-        path = self.headers_path / name
-        path.write_text(contents)
+        self.new_file("headers/" + name, contents)
 
     def new_exercise(self, name: str, contents: str):
-        self.exercises_path.mkdir(parents=True, exist_ok=True)
-        path = self.exercises_path / name
-        path.write_text(contents)
+        self.new_file("exercises/" + name, contents)
@@ -0,0 +1,194 @@
+import hashlib
+import json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from craft_documents.templates.Source import Fetched, Source
+from craft_documents.templates.TemplateManager import TemplateManager
+
+
+@dataclass
+class SyncReport:
+    """The names of the templates by what happened to them."""
+
+    added: list[str] = field(default_factory=list)
+    changed: list[str] = field(default_factory=list)
+    unchanged: list[str] = field(default_factory=list)
+    kept: list[str] = field(default_factory=list)
+    failed: list[str] = field(default_factory=list)
+
+
+class TemplateSync:
+    """
+    Synchronizes the templates with one or more sources.
+
+    If several sources provide the same template, the first
+    source wins. The templates that were installed by a sync
+    are recorded in a manifest in the templates folder:
+
+    ```json
+    {
+        "files": {
+            "headers/exam.tex": {
+                "source": "github:tobiashauser/craft-templates",
+                "sha256": "...",
+                "version": "...",
+                "etag": "...",
+                "last_modified": "..."
+            }
+        },
+        "sources": {
+            "github:tobiashauser/craft-templates": {
+                "headers": {"etag": "...", "items": [...]}
+            }
+        }
+    }
+    ```
+
+    A template is only fetched if its version in the listing
+    changed, and then conditionally on the manifest entry.
+    Templates that were edited locally are never overwritten.
+    """
+
+    directories = ["preambles", "headers", "exercises"]
+
+    @property
+    def manifest_path(self):
+        return self.templates_manager.library.root / ".manifest.json"
+
+    def __init__(
+        self,
+        templates_manager: TemplateManager,
+        sources: list[Source],
+        workers: int = 8,
+    ):
+        self.templates_manager = templates_manager
+        self.sources = sources
+        self.workers = workers
+        self.manifest = self.load_manifest()
+
+    def load_manifest(self) -> dict[str, Any]:
+        storage = self.templates_manager.storage
+        try:
+            manifest = json.loads(storage.read_text(self.manifest_path))
+        except (FileNotFoundError, ValueError):
+            manifest = {}
+        manifest.setdefault("files", {})
+        manifest.setdefault("sources", {})
+        return manifest
+
+    def save_manifest(self):
+        self.templates_manager.new_file(
+            ".manifest.json", json.dumps(self.manifest, indent=2, sort_keys=True)
+        )
+
+    def creator(self, directory: str) -> Callable[[str, str], None]:
+        return {
+            "preambles": self.templates_manager.new_preamble,
+            "headers": self.templates_manager.new_header,
+            "exercises": self.templates_manager.new_exercise,
+        }[directory]
+
+    def local_hash(self, key: str) -> str | None:
+        storage = self.templates_manager.storage
+        path = self.templates_manager.library.root / key
+        if not storage.is_file(path):
+            return None
+        return hashlib.sha256(storage.read_text(path).encode()).hexdigest()
+
+    def sync(self) -> SyncReport:
+        """
+        Install new and changed templates and return what happened.
+        """
+        report = SyncReport()
+
+        # List every directory of every source in parallel
+        listings = [
+            (source, directory)
+            for source in self.sources
+            for directory in self.directories
+        ]
+
+        def list_directory(listing: tuple[Source, str]):
+            source, directory = listing
+            cache = self.manifest["sources"].setdefault(source.name, {})
+            return source.list_directory(directory, cache)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            items = list(executor.map(list_directory, listings))
+
+        # The first source providing a template wins
+        candidates: dict[str, tuple[Source, dict[str, Any]]] = {}
+        for (source, directory), directory_items in zip(listings, items):
+            if directory_items is None:
+                report.failed.append("%s (%s/)" % (source.name, directory))
+                continue
+            for item in directory_items:
+                candidates.setdefault(directory + "/" + item["name"], (source, item))
+
+        fetches: list[tuple[str, Source, dict[str, Any], dict[str, Any]]] = []
+        for key, (source, item) in candidates.items():
+            entry = self.manifest["files"].get(key)
+            version = None if entry is None else entry.get("version")
+            local_hash = self.local_hash(key)
+
+            if local_hash is None or entry is None:
+                fetches.append((key, source, item, {}))
+            elif local_hash != entry["sha256"]:
+                report.kept.append(key)
+            elif entry.get("source") != source.name:
+                fetches.append((key, source, item, {}))
+            elif item["version"] is not None and item["version"] == version:
+                report.unchanged.append(key)
+            else:
+                fetches.append((key, source, item, entry))
+
+        def fetch(task) -> Fetched | None:
+            _, source, item, entry = task
+            return source.fetch(item, entry)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            results = list(executor.map(fetch, fetches))
+
+        with self.templates_manager.transaction():
+            self.install(report, fetches, results)
+            self.save_manifest()
+        return report
+
+    def install(self, report: SyncReport, fetches: list, results: list):
+        """Write the fetched templates in the current transaction."""
+        for (key, source, item, entry), fetched in zip(fetches, results):
+            if fetched is None:
+                report.failed.append(key)
+                continue
+
+            if fetched.contents is None:
+                entry["version"] = item["version"]
+                report.unchanged.append(key)
+                continue
+
+            directory, name = key.split("/", 1)
+            remote_hash = hashlib.sha256(fetched.contents.encode()).hexdigest()
+            local_hash = self.local_hash(key)
+
+            if local_hash is None:
+                self.creator(directory)(name, fetched.contents)
+                report.added.append(key)
+            elif local_hash == remote_hash:
+                report.unchanged.append(key)
+            elif key not in self.manifest["files"]:
+                # Created by the user and not by a sync
+                report.kept.append(key)
+                continue
+            else:
+                self.creator(directory)(name, fetched.contents)
+                report.changed.append(key)
+
+            self.manifest["files"][key] = {
+                "source": source.name,
+                "sha256": remote_hash,
+                "version": item["version"],
+                "etag": fetched.etag,
+                "last_modified": fetched.last_modified,
+            }
@@ -26,10 +26,10 @@ def open():
     templates_manager.folder.open()
 
 
-@app.command(name="fetch", help="Fetch templates from GitHub")
+@app.command(name="fetch", help="Fetch templates from the configured sources.")
 def fetch(
     verbose: Annotated[
-        bool, typer.Option(help="Don't overwrite any local templates.")
+        bool, typer.Option(help="Also list the unchanged templates.")
     ] = False
 ):
     fetch_implementation(verbose, templates_manager, app)
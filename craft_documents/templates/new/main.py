@@ -14,10 +14,29 @@ template_manager = TemplateManager(configuration)
 
 import os
 import subprocess
+import tempfile
 
 DEFAULT_EDITOR = "/usr/bin/vim"  # backup, if not defined in environment vars
 
 
+def edit(path: Path, contents: str):
+    """
+    Open a staging copy of the new template at `path` in the
+    editor and publish it once the editor exits. Published
+    templates are never edited in place.
+    """
+    # Keep the subfolders of nested templates
+    name = path.relative_to(template_manager.library.root).as_posix()
+    with tempfile.TemporaryDirectory() as folder:
+        staging = Path(folder) / path.name
+        staging.write_text(contents)
+
+        # Open in default editor
+        editor = os.environ.get("EDITOR", DEFAULT_EDITOR)
+        subprocess.call([editor, staging])
+        template_manager.new_file(name, staging.read_text())
+
+
 @app.command(name="preamble", help="Create a new preamble.")
 def create_template_preamble(
     name: Annotated[str, typer.Argument(help="Specify the name of the new preamble.")]
@@ -42,11 +61,7 @@ def create_template_preamble(
 Hello, world!
 \end{document}
 """
-    path.write_text(contents)
-
-    # Open in default editor
-    editor = os.environ.get("EDITOR", DEFAULT_EDITOR)
-    subprocess.call([editor, path])
+    edit(path, contents)
 
 
 @app.command(name="header", help="Create a new header.")
@@ -81,10 +96,7 @@ def create_template_header(
 
 \end{document}
 """
-    path.write_text(contents)
-
-    editor = os.environ.get("EDITOR", DEFAULT_EDITOR)
-    subprocess.call([editor, path])
+    edit(path, contents)
 
 
 @app.command(name="exercise", help="Create a new exercise.")
@@ -122,7 +134,4 @@ def create_template_exercise(
 
 \end{document}
 """
-    path.write_text(contents)
-
-    editor = os.environ.get("EDITOR", DEFAULT_EDITOR)
-    subprocess.call([editor, path])
+    edit(path, contents)
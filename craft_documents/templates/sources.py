@@ -0,0 +1,55 @@
+import tarfile
+import zipfile
+from pathlib import Path
+from urllib.parse import unquote, urlparse
+
+import requests
+
+from craft_documents.common.ArchiveStorage import ArchiveStorage
+from craft_documents.common.DirectoryStorage import DirectoryStorage
+from craft_documents.templates.GitHubSource import GitHubSource
+from craft_documents.templates.LocalSource import LocalSource
+from craft_documents.templates.Source import Source
+
+
+def create_source(
+    spec: str, base: Path, session: requests.Session | None = None
+) -> Source:
+    """
+    Create the source described by `spec`:
+
+    - `github:owner/repo` or `github:owner/repo/path`
+    - `https://github.com/owner/repo`
+    - a directory, zip or tar archive, relative to `base`
+    - a `file://` URL of a directory or an archive
+    """
+    if spec.startswith("github:") or spec.startswith("https://github.com/"):
+        components = (
+            spec.removeprefix("github:")
+            .removeprefix("https://github.com/")
+            .strip("/")
+            .split("/")
+        )
+        if len(components) < 2:
+            raise Exception("Couldn't read the GitHub repository in '%s'." % spec)
+        return GitHubSource(
+            components[0],
+            components[1],
+            "/".join(components[2:]),
+            session=session,
+        )
+
+    if spec.startswith("file://"):
+        path = Path(unquote(urlparse(spec).path))
+    else:
+        path = Path(spec).expanduser()
+        if not path.is_absolute():
+            path = base / path
+
+    if path.is_dir():
+        return LocalSource(spec, DirectoryStorage(), path.resolve())
+    elif path.is_file() and (zipfile.is_zipfile(path) or tarfile.is_tarfile(path)):
+        path = path.resolve()
+        return LocalSource(spec, ArchiveStorage(path, root=path), path)
+    else:
+        raise Exception("Couldn't find the template source '%s'." % spec)
@@ -0,0 +1,65 @@
+from pathlib import Path
+
+from craft_documents.common.AnswersCache import AnswersCache
+from craft_documents.common.Template import Template
+from tests.common.test_common_Configuration import Configuration
+
+
+def test_remember(tmp_path):
+    path = tmp_path / ".answers.json"
+    cache = AnswersCache(Path("/courses/he-2"), path)
+    cache.remember("exam", "header/exam", ["semester", "course"], {"course": "HE 2"})
+    cache.save()
+
+    cache = AnswersCache(Path("/courses/he-2"), path)
+    assert cache.recall("exam", "header/exam", ["course", "semester"]) == {
+        "course": "HE 2"
+    }
+    assert cache.recall("worksheet", "header/exam", ["course", "semester"]) == {}
+    assert (
+        AnswersCache(Path("/courses/he-3"), path).recall(
+            "exam", "header/exam", ["course", "semester"]
+        )
+        == {}
+    )
+
+    # The placeholders of the template changed
+    assert cache.recall("exam", "header/exam", ["course"]) == {}
+
+
+def test_template(tmp_path, monkeypatch):
+    path = tmp_path / "exam.tex"
+    path.write_text("<<course>> <<secret>>\n\\iffalse\nsecret:\n  type: password\n\\fi")
+    questions = []
+
+    def prompt(question, answers):
+        questions.append(question)
+        answers[question["name"]] = "HE 2"
+
+    monkeypatch.setattr("craft_documents.common.Prompter.prompt", prompt)
+
+    c = Configuration()
+    c._answers = AnswersCache(tmp_path, tmp_path / ".answers.json")
+    Template(c, path).resolve_placeholders({})
+    assert [q.get("default") for q in questions] == [None, None]
+
+    # The answers are offered as defaults, but never passwords
+    questions.clear()
+    Template(c, path).resolve_placeholders({})
+    defaults = {q["name"]: q.get("default") for q in questions}
+    assert defaults == {"course": "HE 2", "secret": None}
+
+    # Or used without prompting
+    questions.clear()
+    c["reuse_answers"] = True
+    values: dict[str, str] = {}
+    Template(c, path).resolve_placeholders(values)
+    assert [q["name"] for q in questions] == ["secret"]
+    assert values == {"course": "HE 2", "secret": "HE 2"}
+
+    # Values that were not asked for are not remembered
+    path.write_text("<<course>> <<semester>>")
+    Template(c, path).resolve_placeholders({"semester": "SoSe 2023"})
+    assert c.answers.recall("", "template/exam", ["course", "semester"]) == {
+        "course": "HE 2"
+    }
@@ -0,0 +1,68 @@
+import pickle
+import tarfile
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from craft_documents.common.ArchiveStorage import ArchiveStorage
+
+root = Path("/craft")
+
+
+def create_zip(path: Path) -> Path:
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("headers/exam.tex", "<<semester>>")
+        archive.writestr("exercises/", "")
+        archive.writestr("preambles/default.tex", r"\documentclass{scrreport}")
+    return path
+
+
+def create_tar(tmp_path: Path) -> Path:
+    folder = tmp_path / "library"
+    (folder / "headers").mkdir(parents=True)
+    (folder / "headers/exam.tex").write_text("<<semester>>")
+    (folder / "exercises").mkdir()
+
+    path = tmp_path / "library.tar.gz"
+    with tarfile.open(path, "w:gz") as archive:
+        archive.add(folder / "headers", arcname="headers")
+        archive.add(folder / "exercises", arcname="exercises")
+    return path
+
+
+def test_zip(tmp_path):
+    s = ArchiveStorage(create_zip(tmp_path / "library.zip"), root=root)
+
+    assert s.read_only
+    assert s.is_dir(root / "exercises")
+    assert s.iterdir(root / "headers") == ([root / "headers/exam.tex"], [])
+    assert s.read_text(root / "headers/exam.tex") == "<<semester>>"
+    assert s.size(root / "headers/exam.tex") == len("<<semester>>")
+
+    with pytest.raises(PermissionError):
+        s.write_text(root / "headers/new.tex", "")
+
+
+def test_tar(tmp_path):
+    s = ArchiveStorage(create_tar(tmp_path), root=root)
+
+    assert s.iterdir(root) == ([], [root / "exercises", root / "headers"])
+    assert s.read_text(root / "headers/exam.tex") == "<<semester>>"
+    assert s.contains(root / "headers/exam.tex", "semester")
+
+
+def test_pickle(tmp_path):
+    s = ArchiveStorage(create_zip(tmp_path / "library.zip"), root=root)
+
+    copy = pickle.loads(pickle.dumps(s))
+    assert copy.read_text(root / "headers/exam.tex") == "<<semester>>"
+
+
+def test_close(tmp_path):
+    with ArchiveStorage(create_tar(tmp_path), root=root) as s:
+        tar = s._tar
+        assert s.read_text(root / "headers/exam.tex") == "<<semester>>"
+
+    assert tar.closed
+    assert s._tar is None
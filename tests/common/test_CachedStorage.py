@@ -0,0 +1,49 @@
+from collections import Counter
+from pathlib import Path
+
+from craft_documents.common.CachedStorage import CachedStorage
+from craft_documents.common.DirectoryStorage import DirectoryStorage
+from craft_documents.common.MemoryStorage import MemoryStorage
+
+root = Path("/craft")
+
+
+class CountingStorage(MemoryStorage):
+    calls: Counter
+
+    def is_file(self, path: Path) -> bool:
+        self.calls[path] += 1
+        return super().is_file(path)
+
+
+def test_cache():
+    s = CountingStorage({"headers/exam.tex": "<<semester>>"}, root=root)
+    s.calls = Counter()
+    cache = CachedStorage(s)
+
+    exam = root / "headers/exam.tex"
+    for _ in range(3):
+        assert cache.is_file(exam)
+        assert not cache.is_file(root / "headers/worksheet.tex")
+    assert s.calls[exam] == 1
+
+    # Writes clear the cache
+    cache.write_text(root / "headers/worksheet.tex", "<<craft-exercises>>")
+    assert cache.is_file(root / "headers/worksheet.tex")
+    assert cache.read_text(root / "headers/worksheet.tex") == "<<craft-exercises>>"
+
+
+def test_resolve(tmp_path):
+    (tmp_path / "generation/exercises").mkdir(parents=True)
+    (tmp_path / "generation/exercises/intervals.tex").write_text("<<semester>>")
+    (tmp_path / "exercises").symlink_to("generation/exercises")
+    (tmp_path / "generation/exercises/link.tex").symlink_to("intervals.tex")
+
+    cache = CachedStorage(DirectoryStorage())
+    for path in [
+        tmp_path / "exercises/intervals.tex",
+        tmp_path / "exercises/link.tex",
+        tmp_path / "exercises/../exercises/missing.tex",
+        Path("config.craft/craftrc"),
+    ]:
+        assert cache.resolve(path) == path.resolve()
@@ -1,6 +1,9 @@
 from pathlib import Path
 
 from craft_documents.common.Exercise import Exercise as LiveExercise
+from craft_documents.common.RawFile import RawFile
+from craft_documents.common.Scope import Scope
+from craft_documents.common.Template import Template
 from craft_documents.configuration.Configuration import Configuration
 from tests.common.test_common_Configuration import Configuration
 
@@ -52,3 +55,67 @@ def test_instantiation():
     assert str(ly) in str(e.supplements[0].path)
 
     teardown_test_folder()
+
+
+def test_supplements_without_placeholders(tmp_path):
+    (tmp_path / "template.ly").write_text("% <<chords>>\n{ c e g }\n")
+    (tmp_path / "plain.ly").write_text("{ c e g }\n")
+    (tmp_path / "score.png").write_bytes(b"\x89PNG<<\xff\xfe")
+    (tmp_path / "notes.unknown").write_text("<<chords>>")
+    tex = tmp_path / "supplements.tex"
+    tex.write_text(r"""
+\iffalse
+supplements:
+    - template.ly
+    - plain.ly
+    - score.png
+    - notes.unknown
+\fi
+""")
+
+    e = LiveExercise(tex, Configuration())
+    template, plain, png, unknown = e.supplements
+
+    assert isinstance(template, Template)
+    assert template.placeholders == {"chords"}
+    assert isinstance(plain, RawFile)
+    assert isinstance(png, RawFile)
+    assert isinstance(unknown, RawFile)
+
+    # comments are removed from every text supplement
+    configuration = Configuration()
+    configuration["remove_comments"] = True
+    e = LiveExercise(tex, configuration)
+    template, plain, png, unknown = e.supplements
+
+    assert isinstance(plain, Template)
+    assert isinstance(png, RawFile)
+    assert isinstance(unknown, RawFile)
+
+
+def test_resolve_placeholders(tmp_path, monkeypatch):
+    tex = tmp_path / "points.tex"
+    tex.write_text(r"""
+\iffalse
+unique-placeholders: points
+\fi
+\begin{document}
+<<semester>>: <<points>> <<course>>
+\end{document}
+""")
+    values = iter(["HE 2", "3", "4"])
+
+    def prompt(question, answers):
+        answers[question["name"]] = next(values)
+
+    monkeypatch.setattr("craft_documents.common.Prompter.prompt", prompt)
+
+    c = Configuration(semester="SoSe 2023")
+    document = Scope(c).new_child()
+    first = LiveExercise(tex, c).resolve_placeholders(document)
+    second = LiveExercise(tex, c).resolve_placeholders(document)
+
+    # Shared answers are asked once, unique ones for every copy
+    assert document.maps[0] == {"course": "HE 2"}
+    assert (first["points"], second["points"]) == ("3", "4")
+    assert "course" not in c and "points" not in c
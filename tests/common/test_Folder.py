@@ -27,3 +27,26 @@ def test_instantiation():
     two.unlink(missing_ok=True)
     three.rmdir()
     test_folder.rmdir()
+
+
+def test_walk(tmp_path):
+    for name in [
+        "intervals.tex",
+        "draft-chords.tex",
+        ".hidden.tex",
+        "harmony/cadences/v-i.tex",
+        "harmony/cadences/draft-iv-i.tex",
+        "harmony/old/cadences.tex",
+        "rhythm/old/meter.tex",
+        ".git/config",
+    ]:
+        (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / name).touch()
+    (tmp_path / ".craftignore").write_text("# Drafts\ndraft-*.tex\nharmony/old/\n")
+
+    files = LiveFolderImplementation(tmp_path).walk()
+    assert [f.relative_to(tmp_path).as_posix() for f in files] == [
+        "harmony/cadences/v-i.tex",
+        "intervals.tex",
+        "rhythm/old/meter.tex",
+    ]
@@ -0,0 +1,78 @@
+import pytest
+
+from craft_documents.common.Generator import Generator
+from craft_documents.common.Template import Template
+from tests.common.test_common_Configuration import Configuration
+
+
+@pytest.fixture(params=["numpy", "random"])
+def backend(request, monkeypatch):
+    """Draw with NumPy, if it is installed, and without it."""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr("craft_documents.common.Generator.numpy", None)
+    return request.param
+
+
+def test_draw(backend):
+    integers = Generator("points", {"integers": [1, 3]}, seed=1)
+    assert set(integers.draw(1000)) == {"1", "2", "3"}
+
+    uniform = Generator("factor", {"uniform": [0.5, 1.5], "decimals": 1}, seed=1)
+    assert all(0.5 <= float(value) <= 1.5 for value in uniform.draw(1000))
+    assert all(len(value) == 3 for value in uniform.draw(1000))
+
+    choices = Generator("clef", {"choices": ["treble", "bass"], "weights": [1, 0]})
+    assert set(choices.draw(1000)) == {"treble"}
+
+
+def test_seed(backend):
+    spec = {"choices": [3, 4, 5, 6]}
+    one = Generator("interval-count", spec, seed=7)
+    two = Generator("interval-count", spec, seed=7)
+    other = Generator("other", spec, seed=7)
+
+    one.reserve(100)
+    assert [one.next() for _ in range(100)] == two.draw(100)
+    assert Generator("interval-count", spec, seed=7).draw(100) != other.draw(100)
+
+    # the same name with another spec draws from another stream
+    weighted = Generator("interval-count", spec | {"weights": [1, 1, 1, 1]}, seed=7)
+    assert Generator("interval-count", spec, seed=7).draw(100) != weighted.draw(100)
+
+
+@pytest.mark.parametrize(
+    "spec",
+    [
+        {},
+        {"integers": [3, 1]},
+        {"integers": [1, 3], "choices": [1]},
+        {"choices": []},
+        {"choices": [1, 2], "weights": [1]},
+    ],
+)
+def test_invalid(spec):
+    with pytest.raises(Exception):
+        Generator("points", spec)
+
+
+def test_template(tmp_path):
+    path = tmp_path / "exercise.tex"
+    path.write_text("""
+\\iffalse
+points:
+  generate:
+    integers: [2, 2]
+\\fi
+<<points>> points""")
+
+    c = Configuration(seed=1)
+    t = Template(c, path)
+    assert not t.will_prompt({})
+
+    values: dict[str, str] = {}
+    t.resolve_placeholders(values)
+    assert values == {"points": "2"}
+    assert t.contents.endswith("2 points")
+    assert c.generators == [t.prompts[0]["generate"]]
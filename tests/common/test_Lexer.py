@@ -0,0 +1,43 @@
+import pickle
+
+from craft_documents.common.Lexer import Lexer
+from craft_documents.common.Template import Template
+from craft_documents.configuration.TokensValidator import TokensValidator
+from tests.common.test_common_Configuration import Configuration
+
+markdown = {
+    "placeholder_prefix": "{{",
+    "placeholder_suffix": "}}",
+    "single_line_comment_prefix": "<!--",
+    "block_comment_prefix": "<!--",
+    "block_comment_suffix": "-->",
+}
+
+
+def test_registry():
+    tex = TokensValidator().default()[".tex"]
+    assert Lexer.get(tex) is Lexer.get(dict(tex))
+    assert Lexer.get(tex) is not Lexer.get(markdown)
+
+    # The registered lexer is used after unpickling
+    assert pickle.loads(pickle.dumps(Lexer.get(tex))) is Lexer.get(tex)
+
+
+def test_patterns():
+    lexer = Lexer.get(markdown)
+    assert lexer.placeholder.findall("{{name}} and {{date}}") == ["name", "date"]
+    assert lexer.named("a.b").sub("x", "{{a.b}} {{acb}}") == "x {{acb}}"
+    assert lexer.block_comment.findall("<!--\nkey: value\n-->") == ["\nkey: value\n"]
+
+
+def test_pluggable_extension(tmp_path):
+    c = Configuration(tokens={".md": markdown})
+    assert ".tex" in c.settings.tokens and ".md" in c.settings.tokens
+
+    path = tmp_path / "notes.md"
+    path.write_text("<!--\nname:\n  message: Your name?\n-->\nHello, {{name}}!")
+    t = Template(c, path)
+
+    assert t.lexer is Lexer.get(markdown)
+    assert t.placeholders == {"name"}
+    assert t.prompts[0]["message"] == "Your name?"
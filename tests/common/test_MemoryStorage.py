@@ -0,0 +1,77 @@
+from pathlib import Path
+
+import pytest
+
+from craft_documents.common.Folder import Folder
+from craft_documents.common.MemoryStorage import MemoryStorage
+from craft_documents.common.RawFile import RawFile
+
+root = Path("/craft")
+
+
+def storage() -> MemoryStorage:
+    return MemoryStorage(
+        {
+            "headers/exam.tex": "<<semester>>",
+            "exercises/intervals.ly": b"\x00\x01",
+            "preambles/": None,
+        },
+        root=root,
+    )
+
+
+def test_iterdir():
+    s = storage()
+
+    assert s.iterdir(root) == (
+        [],
+        [root / "exercises", root / "headers", root / "preambles"],
+    )
+    assert s.iterdir(root / "headers") == ([root / "headers/exam.tex"], [])
+    assert s.iterdir(root / "preambles") == ([], [])
+
+    with pytest.raises(FileNotFoundError):
+        s.iterdir(root / "missing")
+
+
+def test_files():
+    s = storage()
+
+    assert s.is_file(root / "headers/exam.tex")
+    assert not s.is_file(root / "headers")
+    assert s.is_dir(root / "headers")
+    assert not s.is_file(Path("/elsewhere/exam.tex"))
+
+    assert s.read_text(root / "headers/../headers/exam.tex") == "<<semester>>"
+    assert s.size(root / "exercises/intervals.ly") == 2
+    assert s.contains(root / "headers/exam.tex", "<<")
+    assert not s.contains(root / "exercises/intervals.ly", "<<")
+
+    with pytest.raises(FileNotFoundError):
+        s.read_text(root / "headers/missing.tex")
+
+
+def test_write(tmp_path):
+    s = storage()
+
+    s.mkdir(root / "exercises/harmony")
+    s.write_text(root / "exercises/harmony/cadences.tex", "V-I")
+    assert s.iterdir(root / "exercises") == (
+        [root / "exercises/intervals.ly"],
+        [root / "exercises/harmony"],
+    )
+
+    f = RawFile(root / "exercises/intervals.ly", storage=s)
+    f.write(tmp_path / "intervals.ly")
+    assert (tmp_path / "intervals.ly").read_bytes() == b"\x00\x01"
+
+
+def test_folder():
+    f = Folder(root, storage=storage())
+
+    assert f.subfiles == []
+    assert [folder.name for folder in f.subfolders] == [
+        "exercises",
+        "headers",
+        "preambles",
+    ]
@@ -56,3 +56,29 @@ def test_inherited_properties():
     assert len(input.prompts) == 1
     assert input.prompts[0]["name"] == "one"
     assert input.yaml == {}
+
+
+def test_dump_format(tmp_path):
+    command = "cp {source} {jobname}.fmt"
+    input = Preamble()
+
+    format_file = input.dump_format(tmp_path, command)
+    assert format_file.parent == tmp_path
+    assert format_file.name == input.format_name(command) + ".fmt"
+    assert format_file.read_text().startswith(contents)
+
+    # cached by the contents of the preamble
+    format_file.write_text("cached")
+    assert input.dump_format(tmp_path, command) == format_file
+    assert format_file.read_text() == "cached"
+
+    input.set_placeholders({"one": "1"})
+    assert input.dump_format(tmp_path, command) != format_file
+
+
+def test_dump_format_failing(tmp_path):
+    try:
+        Preamble().dump_format(tmp_path, "false {jobname}")
+        assert False
+    except Exception as error:
+        assert "Couldn't precompile the preamble" in str(error)
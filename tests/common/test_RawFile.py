@@ -0,0 +1,33 @@
+import hashlib
+
+from craft_documents.common.RawFile import RawFile
+
+binary = bytes(range(256)) * 64
+
+
+def test_write(tmp_path):
+    source = tmp_path / "audio.wav"
+    source.write_bytes(binary)
+    target = tmp_path / "copy.wav"
+
+    f = RawFile(source)
+    assert f.name == "audio"
+    assert f.extension == ".wav"
+
+    f.write(target)
+    assert target.read_bytes() == binary
+
+
+def test_fingerprint(tmp_path):
+    source = tmp_path / "audio.wav"
+    source.write_bytes(binary)
+
+    assert RawFile(source).fingerprint == hashlib.sha256(binary).hexdigest()
+
+
+def test_contents(tmp_path):
+    source = tmp_path / "plain.ly"
+    source.write_text("{ c e g }\n")
+
+    f = RawFile(source)
+    assert f.contents == "{ c e g }\n"
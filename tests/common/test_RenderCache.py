@@ -0,0 +1,77 @@
+from craft_documents.common.RenderCache import RenderCache
+from craft_documents.common.Template import Template
+from tests.common.test_common_Configuration import Configuration
+
+
+def test_memoize():
+    cache = RenderCache(size=2)
+    renders = []
+
+    def render(segment: str):
+        def inner() -> str:
+            renders.append(segment)
+            return segment
+
+        return inner
+
+    assert cache.memoize("a", render("A")) == "A"
+    assert cache.memoize("a", render("other")) == "A"
+    cache.memoize("b", render("B"))
+    cache.memoize("a", render("A"))
+    cache.memoize("c", render("C"))  # drops the least recently used "b"
+    cache.memoize("b", render("B"))
+
+    assert renders == ["A", "B", "C", "B"]
+    assert (cache.hits, cache.misses, len(cache)) == (2, 4, 2)
+    assert cache.report() == "2 hits, 4 misses (33%), 2 entries"
+
+
+def test_persistence(tmp_path):
+    path = tmp_path / "render-cache.json"
+    cache = RenderCache(path=path)
+    cache.memoize(RenderCache.key("body", "hash"), lambda: "body")
+    cache.save()
+
+    cache = RenderCache(path=path)
+    assert cache.memoize(RenderCache.key("body", "hash"), lambda: "other") == "body"
+    assert cache.hit_rate == 1.0
+
+    # a disabled cache doesn't load the entries
+    cache = RenderCache(size=0, path=path)
+    assert len(cache) == 0
+    assert cache.memoize(RenderCache.key("body", "hash"), lambda: "other") == "other"
+
+
+def test_set_placeholders(tmp_path):
+    path = tmp_path / "intervals.tex"
+    path.write_text("<<semester>>: <<count>> intervals")
+
+    c = Configuration()
+    cache = c.render_cache
+    values = {"semester": "SoSe 2023", "count": "3", "unused": "value"}
+    for _ in range(3):
+        t = Template(c, path)
+        t.set_placeholders(values)
+        assert t.contents == "SoSe 2023: 3 intervals"
+    assert (cache.hits, cache.misses) == (2, 1)
+
+    # Only the values of the placeholders in the template matter
+    t = Template(c, path)
+    t.set_placeholders(values | {"unused": "changed"})
+    assert cache.hits == 3
+    t = Template(c, path)
+    t.set_placeholders(values | {"count": "4"})
+    assert t.contents == "SoSe 2023: 4 intervals"
+
+
+def test_fingerprint(tmp_path):
+    path = tmp_path / "intervals.tex"
+    path.write_text("<<semester>>: <<count>> intervals")
+    t = Template(Configuration(), path)
+
+    fingerprint = t.fingerprint
+    assert t.fingerprint is fingerprint
+
+    # changed contents are hashed again
+    t.set_placeholders({"semester": "SoSe 2023"})
+    assert t.fingerprint != fingerprint
@@ -0,0 +1,19 @@
+from craft_documents.common.Scope import Scope
+
+
+def test_layers():
+    configuration = {"semester": "SoSe 2023", "points": "2"}
+    document = Scope(configuration).new_child()
+    document["course"] = "HE 2"
+
+    first = document.new_child({"points": "3"})
+    second = document.new_child()
+    second["points"] = "4"
+
+    assert first["points"] == "3" and second["points"] == "4"
+    assert first["semester"] == second["semester"] == "SoSe 2023"
+    assert first["course"] == "HE 2"
+
+    # The answers don't leak into the layers below
+    assert document["points"] == "2"
+    assert configuration == {"semester": "SoSe 2023", "points": "2"}
@@ -1,3 +1,4 @@
+import hashlib
 from pathlib import Path
 
 from craft_documents.common.helpers import combine_dictionaries
@@ -148,9 +149,7 @@ def test_reference_semantics_of_configuration():
 
 def test_remove_comments():
     t = TemplateImplementation(configuration=Configuration(remove_comments=True))
-    assert (
-        t.contents
-        == """
+    assert t.contents == """
 This is a template for a <<course>>. It is
 written by <<author>>.
 
@@ -158,7 +157,6 @@ What if a placeholder is customized but not as a dictionary?
 It doesn't do anything.
 
 """
-    )
 
 
 def test_tokens_not_present():
@@ -186,3 +184,84 @@ def test_set_placeholders():
     t.set_placeholders(t.configuration)
     assert not t.contents == contents
     assert t.placeholders == {"course"}
+
+
+def test_memory_mapped(tmp_path):
+    path = tmp_path / "intervals.ly"
+    path.write_text("""%{
+chords:
+    message: Which chords?
+%}
+% <<chords>> in <<key>>
+{ c e g }
+""")
+
+    t = Template(Configuration(memory_map_threshold=0), path)
+    assert t.is_memory_mapped
+    assert t.placeholders == {"chords", "key"}
+    assert t.yaml == {"chords": {"message": "Which chords?"}}
+
+    t.set_placeholders({"chords": "triads", "key": 3})
+    assert t.is_memory_mapped
+    assert t.placeholders == {"key"}
+
+    target = tmp_path / "target.ly"
+    t.write(target)
+    expectation = path.read_text().replace("<<chords>>", "triads")
+    assert target.read_text() == expectation
+    assert t.fingerprint == hashlib.sha256(expectation.encode()).hexdigest()
+
+    # decoding applies the recorded values
+    assert t.contents == expectation
+    assert not t.is_memory_mapped
+    assert t.disk_contents == path.read_text()
+
+
+def test_close(tmp_path):
+    path = tmp_path / "intervals.ly"
+    path.write_text("% <<chords>>\n")
+
+    with Template(Configuration(memory_map_threshold=0), path) as t:
+        mapping = t._mapping
+        assert t.is_memory_mapped
+        t.write(tmp_path / "target.ly")
+
+    assert mapping.closed
+    assert not t.is_memory_mapped
+    assert (tmp_path / "target.ly").read_text() == "% <<chords>>\n"
+
+
+def test_clone_memory_mapped(tmp_path, monkeypatch):
+    path = tmp_path / "intervals.ly"
+    path.write_text("% <<chords>>\n{ c e g }\n")
+    t = Template(Configuration(memory_map_threshold=0), path)
+
+    clone = t.clone()
+    assert clone.is_memory_mapped
+    assert clone._mapping is not None and clone._mapping is not t._mapping
+    assert clone.configuration is t.configuration
+
+    streamed = []
+    original = Template.stream
+
+    def stream(self, write):
+        streamed.append(self)
+        original(self, write)
+
+    monkeypatch.setattr(Template, "stream", stream)
+    clone.set_placeholders({"chords": "triads"})
+    with clone:
+        clone.write(tmp_path / "target.ly")
+    assert streamed == [clone]
+    assert (tmp_path / "target.ly").read_text() == "% triads\n{ c e g }\n"
+
+    # closing the clone keeps the original mapped
+    assert t.is_memory_mapped and t.placeholders == {"chords"}
+
+
+def test_memory_map_threshold(tmp_path):
+    path = tmp_path / "intervals.ly"
+    path.write_text("% <<chords>>\n")
+
+    assert not Template(Configuration(), path).is_memory_mapped
+    assert Template(Configuration(memory_map_threshold=4), path).is_memory_mapped
@@ -0,0 +1,99 @@
+import threading
+
+import pytest
+
+from craft_documents.common.DirectoryStorage import DirectoryStorage
+from craft_documents.common.TemplateLibrary import TemplateLibrary
+
+
+def create_folder(tmp_path):
+    for directory in ["preambles", "headers", "exercises"]:
+        (tmp_path / directory).mkdir()
+    (tmp_path / "headers/exam.tex").write_text("exam")
+    return tmp_path
+
+
+def test_migrate(tmp_path, capsys):
+    folder = create_folder(tmp_path)
+    library = TemplateLibrary(folder, DirectoryStorage())
+    assert library.root == folder
+
+    library.write("headers/worksheet.tex", "worksheet")
+    assert "'headers/'" in capsys.readouterr().out
+
+    assert (folder / "headers").is_symlink()
+    assert (folder / "headers/exam.tex").read_text() == "exam"
+    assert (folder / "headers/worksheet.tex").read_text() == "worksheet"
+    assert library.root == (folder / ".generations/current").resolve()
+
+    # Only the current generation is left
+    generations = {p.name for p in (folder / ".generations").iterdir()}
+    assert generations == {"current", library.root.name}
+
+
+def test_pinned_reader(tmp_path):
+    folder = create_folder(tmp_path)
+    writer = TemplateLibrary(folder, DirectoryStorage())
+    writer.write("headers/exam.tex", "first")
+
+    reader = TemplateLibrary(folder, DirectoryStorage())
+    writer.write("headers/exam.tex", "second")
+
+    # The reader keeps its generation until it pins again
+    assert (reader.root / "headers/exam.tex").read_text() == "first"
+    assert (writer.root / "headers/exam.tex").read_text() == "second"
+    assert (folder / "headers/exam.tex").read_text() == "second"
+
+    first = reader.root
+    reader.pin()
+    assert (reader.root / "headers/exam.tex").read_text() == "second"
+
+    # The released generation is collected with the next write
+    writer.write("headers/exam.tex", "third")
+    assert not first.exists()
+    assert (reader.root / "headers/exam.tex").read_text() == "second"
+
+
+def test_staging_links(tmp_path):
+    folder = create_folder(tmp_path)
+    writer = TemplateLibrary(folder, DirectoryStorage())
+    writer.write("headers/worksheet.tex", "worksheet")
+
+    reader = TemplateLibrary(folder, DirectoryStorage())
+    writer.write("headers/worksheet.tex", "changed")
+
+    # Unchanged files are shared, written files are replaced
+    exam = "headers/exam.tex"
+    assert (reader.root / exam).stat().st_ino == (writer.root / exam).stat().st_ino
+    assert (reader.root / "headers/worksheet.tex").read_text() == "worksheet"
+
+
+def test_failing_transaction(tmp_path):
+    folder = create_folder(tmp_path)
+    library = TemplateLibrary(folder, DirectoryStorage())
+    library.write("headers/exam.tex", "published")
+
+    with pytest.raises(RuntimeError):
+        with library.transaction() as staging:
+            (staging / "headers/exam.tex").write_text("staged")
+            raise RuntimeError
+
+    assert (folder / "headers/exam.tex").read_text() == "published"
+    assert len(list((folder / ".generations").iterdir())) == 2
+
+
+def test_concurrent_writers(tmp_path):
+    folder = create_folder(tmp_path)
+
+    def write(index: int):
+        library = TemplateLibrary(folder, DirectoryStorage())
+        library.write("exercises/%02d.tex" % index, str(index))
+
+    threads = [threading.Thread(target=write, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    names = sorted(p.name for p in (folder / "exercises").iterdir())
+    assert names == ["%02d.tex" % i for i in range(8)]
@@ -0,0 +1,37 @@
+from craft_documents.common.Variants import Variants
+
+document = r"""\begin{document}
+%<*solutions>
+\answer{A minor third.}
+%<*!grading>
+\hint{Count the semitones.}
+%</!grading>
+%</solutions>
+%<*!solutions>
+\answerlines{3}
+%</!solutions>
+%<solutions|grading>\points{2}
+\end{document}
+"""
+
+
+def test_select():
+    assert Variants().select(document) == (
+        "\\begin{document}\n\\answerlines{3}\n\\end{document}\n"
+    )
+    assert Variants(["solutions"]).select(document) == (
+        "\\begin{document}\n\\answer{A minor third.}\n"
+        "\\hint{Count the semitones.}\n\\points{2}\n\\end{document}\n"
+    )
+    assert Variants(["solutions", "grading"]).select(document) == (
+        "\\begin{document}\n\\answer{A minor third.}\n\\points{2}\n\\end{document}\n"
+    )
+    assert Variants(["grading"]).select(document) == (
+        "\\begin{document}\n\\answerlines{3}\n\\points{2}\n\\end{document}\n"
+    )
+
+
+def test_holds():
+    v = Variants(["solutions"])
+    assert v.holds("solutions") and v.holds("!grading")
+    assert v.holds("grading|solutions") and not v.holds("solutions&grading")
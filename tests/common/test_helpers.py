@@ -1,5 +1,9 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from typing import Any, Dict
 
+import pytest
+
 from craft_documents.common.helpers import *
 
 
@@ -24,3 +28,114 @@ def test_combine_dictionaries():
     }
 
     assert combine_dictionaries(one, two) == expectation
+    # The arguments are not changed
+    assert one["B"] == [1, 2, 3] and one["C"] == {"a": [1]}
+
+
+def test_copy_file(tmp_path):
+    source = tmp_path / "source.mid"
+    source.write_bytes(b"MThd" + bytes(range(256)) * 1024)
+    target = tmp_path / "target.mid"
+    target.write_bytes(b"previous contents that are longer than nothing")
+
+    copy_file(source, target)
+    assert target.read_bytes() == source.read_bytes()
+
+    empty = tmp_path / "empty.mid"
+    empty.touch()
+    copy_file(empty, target)
+    assert target.read_bytes() == b""
+
+
+def test_file_contains(tmp_path):
+    path = tmp_path / "intervals.ly"
+    path.write_text("% <<chords>>\n{ c e g }\n")
+    assert file_contains(path, "<<")
+    assert not file_contains(path, "<<<")
+
+    path.write_bytes(b"")
+    assert not file_contains(path, "<<")
+
+
+class FilesHandler(BaseHTTPRequestHandler):
+    """Serves every file, failing the first request for each."""
+
+    failures: dict[str, int] = {}
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        name = self.path.removeprefix("/files/")
+        if self.failures.setdefault(name, 0) == 0:
+            self.failures[name] += 1
+            self.respond(503, b"")
+        else:
+            self.respond(200, name.encode())
+
+    def respond(self, status: int, body: bytes):
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FilesHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield "http://%s:%d" % server.server_address
+    server.shutdown()
+    server.server_close()
+
+
+def test_create_session(server):
+    session = create_session(pool_size=4)
+
+    # failed requests are retried
+    response = session.get(server + "/files/017.tex", timeout=TIMEOUT)
+    assert response.ok
+    assert response.text == "017.tex"
+
+
+def test_load_yaml():
+    assert load_yaml("\nsupplements:\n  - intervals.ly\n") == {
+        "supplements": ["intervals.ly"]
+    }
+    assert load_yaml("# comment\n---\n- a\n") is None  # not a dictionary
+    assert load_yaml("---\nsemester: 3\n") == {"semester": 3}
+
+    # Commented-out LaTeX is never parsed
+    assert load_yaml("\n\\textbf{a}: b\n") is None
+    assert load_yaml("\nNote: [unbalanced\n") is None
+
+    # Identical blocks are parsed once, every result is a copy
+    first = load_yaml("chords:\n  options: [I, V]\n")
+    first["chords"]["options"].append("IV")  # type: ignore
+    assert load_yaml("chords:\n  options: [I, V]\n") == {
+        "chords": {"options": ["I", "V"]}
+    }
+    assert parse_yaml("semester: 3") is parse_yaml("semester: 3")
+
+
+def test_compile_expression():
+    validate = compile_expression("lambda answer: len(answer) > 0")
+    assert validate("a") and not validate("")
+
+    # Identical expressions are compiled once
+    assert compile_expression("lambda x: x") is compile_expression("lambda x: x")
+
+    when = compile_expression(
+        "lambda answers: re.match(r'\\d+', answers['semester']) is not None", True
+    )
+    assert when({"semester": "3"})
+
+    for source in [
+        "__import__('os')",
+        "lambda answer: open(answer)",
+        "lambda answer: answer.__class__",
+        "[x for x in ()]",
+    ]:
+        with pytest.raises(UnsafeExpressionError):
+            compile_expression(source, True)
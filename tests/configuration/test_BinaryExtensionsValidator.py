@@ -0,0 +1,16 @@
+from craft_documents.configuration.BinaryExtensionsValidator import (
+    BinaryExtensionsValidator,
+)
+from tests.configuration.test_Configuration import Configuration
+
+
+def test_lint():
+    v = BinaryExtensionsValidator()
+    assert v.lint(["pdf", ".PNG", "Mid"]) == [".pdf", ".png", ".mid"]
+    assert v.lint(".WAV") == [".wav"]
+
+
+def test_run():
+    c = Configuration(binary_extensions=["PDF", ".Svg"])
+    BinaryExtensionsValidator().run(c)
+    assert c == {"binary_extensions": [".pdf", ".svg"]}
@@ -1,10 +1,21 @@
+import pickle
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Mapping
 import pytest
 
 from craft_documents.configuration.Configuration import (
     Configuration as LiveConfiguration,
 )
+from craft_documents.configuration.AllowEvalValidator import AllowEvalValidator
+from craft_documents.configuration.BinaryExtensionsValidator import (
+    BinaryExtensionsValidator,
+)
+from craft_documents.configuration.FormatCommandValidator import FormatCommandValidator
+from craft_documents.configuration.ParseWorkersValidator import ParseWorkersValidator
+from craft_documents.configuration.PreambleValidator import PreambleValidator
+from craft_documents.configuration.TemplateLibraryValidator import (
+    TemplateLibraryValidator,
+)
 from craft_documents.configuration.TokensValidator import TokensValidator
 
 
@@ -42,6 +53,21 @@ def test_properties_after_validate(request):
         TokensValidator().key: TokensValidator().default(),
         "unique_exercise_placeholders": False,
         "verbose": False,
+        "precompile_preamble": False,
+        "format_command": FormatCommandValidator().default(),
+        "shared_assets": False,
+        "binary_extensions": BinaryExtensionsValidator().default(),
+        "memory_map_threshold": 1024 * 1024,
+        "sources": ["github:tobiashauser/craft-templates"],
+        "parse_workers": ParseWorkersValidator().default(),
+        "parse_executor": "thread",
+        "restrict_eval": False,
+        "render_cache_size": 256,
+        "outputs": {"": []},
+        "tree_shake_preamble": False,
+        "protected_macros": [],
+        "remember_answers": True,
+        "reuse_answers": False,
     }
 
 
@@ -66,3 +92,57 @@ def test_header_setter(request):
 
     c.header = exam
     assert c == {"header": exam}
+
+
+def test_order():
+    c = Configuration()
+    validators = c.order(
+        [
+            AllowEvalValidator(),
+            PreambleValidator(),
+            AllowEvalValidator(),
+            TemplateLibraryValidator(),
+        ]
+    )
+    assert [v.key for v in validators] == ["allow_eval", "template_library", "preamble"]
+
+    c.validate()
+    keys = [v.key for v in c.validators]
+    assert len(keys) == len(set(keys))
+    assert keys.index("template_library") < keys.index("preamble")
+
+    # The cache of the checked paths only lives while validating
+    assert c.validation_storage is c.storage
+
+
+def test_settings():
+    c = Configuration(allow_eval=True)
+    c["multiple-exercises"] = False
+    c.validate()
+
+    settings = c.settings
+    assert settings.allow_eval and not c.multiple_exercises
+    with pytest.raises(AttributeError):
+        settings.allow_eval = False  # type: ignore
+    assert pickle.loads(pickle.dumps(settings)) == settings
+
+    # Placeholders don't change the snapshot, settings do
+    c["semester"] = "SoSe 2023"
+    assert c.settings is settings
+    c["allow_eval"] = False
+    assert c.settings is not settings and not c.allow_eval
+
+    # Changed settings are validated again
+    c["allow_eval"] = "yes"
+    assert c.allow_eval is False
+    assert c["allow_eval"] is False
+
+    settings = c.settings
+    c.setdefault("seed", 3)
+    assert c.settings is not settings and c.settings.seed == 3
+
+    # Nested values are frozen copies
+    assert isinstance(c.settings.tokens[".tex"], Mapping)  # type: ignore
+    with pytest.raises(TypeError):
+        c.settings.tokens[".tex"]["placeholder_prefix"] = "{{"  # type: ignore
+    assert c.settings.tokens is not c["tokens"]
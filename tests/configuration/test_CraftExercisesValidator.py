@@ -249,3 +249,27 @@ def test_run_invalid_count(request):
     v.run(c)
 
     assert c == {}
+
+
+def test_linter_pool(request):
+    v = CraftExercisesValidator()
+    c = Configuration()
+    v._configuration = c
+
+    assert {
+        "2 from harmony/*": {
+            "count": 2,
+            "pool": "harmony/*",
+            "path": request.config.rootdir / "config.craft/exercises",
+        }
+    } == v.lint(["2 from harmony/*"])
+
+
+def test_run_pool():
+    v = CraftExercisesValidator()
+    c = Configuration()
+    c[v.key] = {"2 from *": {"count": 2}}
+    v.run(c)
+
+    # Pools are not checked against the exercises on the disk
+    assert c[v.key]["2 from *"]["pool"] == "*"
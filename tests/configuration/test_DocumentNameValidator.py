@@ -0,0 +1,21 @@
+from craft_documents.configuration.DocumentNameValidator import DocumentNameValidator
+from tests.configuration.test_Configuration import Configuration
+
+
+def test_lint():
+    v = DocumentNameValidator()
+    assert v.lint("exams/exam") == "exam.tex"
+    assert v.lint("exam.tex") == "exam.tex"
+
+
+def test_run_existing_document(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "exam.tex").touch()
+
+    c = Configuration(**{"document-name": "exam"})
+    DocumentNameValidator().run(c)
+    assert c == {}
+
+    c = Configuration(**{"document-name": "quiz"})
+    DocumentNameValidator().run(c)
+    assert c == {"document-name": "quiz.tex"}
@@ -0,0 +1,22 @@
+from craft_documents.configuration.OutputsValidator import OutputsValidator
+from tests.configuration.test_Configuration import Configuration
+
+
+def test_lint():
+    v = OutputsValidator()
+    assert v.lint("solutions") == {"": [], "solutions": ["solutions"]}
+    assert v.lint({None: [], "key": "solutions"}) == {"": [], "key": ["solutions"]}
+
+
+def test_run():
+    c = Configuration(outputs={"../exam": ["solutions"]})
+    OutputsValidator().run(c)
+    assert c == {"outputs": {"": []}}
+
+    c = Configuration(outputs=["solutions", "grading"])
+    OutputsValidator().run(c)
+    assert c["outputs"] == {
+        "": [],
+        "solutions": ["solutions"],
+        "grading": ["grading"],
+    }
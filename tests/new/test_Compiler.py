@@ -1,11 +1,24 @@
+import json
 from pathlib import Path
 
+import pytest
+
 from rich import print
 from rich.columns import Columns
 from rich.panel import Panel
 
+from craft_documents.common.Exercise import Exercise as LiveExercise
+from craft_documents.common.RawFile import RawFile
+from craft_documents.common.Template import Template as LiveTemplate
 from craft_documents.configuration.Configuration import Configuration
-from craft_documents.configuration.CraftExercisesValidator import ExerciseConfiguration
+from craft_documents.configuration.CraftExercisesValidator import (
+    CraftExercisesValidator,
+    ExerciseConfiguration,
+)
+from craft_documents.configuration.OutputsValidator import OutputsValidator
+from craft_documents.configuration.ProtectedMacrosValidator import (
+    ProtectedMacrosValidator,
+)
 from craft_documents.new.Compiler import Compiler as LiveCompiler
 from tests.common.test_common_Configuration import Configuration
 from tests.common.test_Exercise import ExerciseTest
@@ -90,13 +103,13 @@ class Compiler(LiveCompiler):
     def work_jobs(self):
         panels = reversed(
             [
-                Panel(contents, title="[bold red]" + path.name, title_align="left")
+                Panel(str(contents), title="[bold red]" + path.name, title_align="left")
                 for path, contents in self.jobs.items()
             ]
         )
         print(Columns(panels, width=82))
 
-    def __init__(self, configuration: Configuration):
+    def __init__(self, configuration: Configuration, seed: int | None = None):
         """
         Add any kwargs that should not be prompted for
         when live testing the debug version.
@@ -122,9 +135,9 @@ class Compiler(LiveCompiler):
         configuration["points"] = "2"
 
         configuration.validate()
-        super().__init__(configuration)
+        super().__init__(configuration, seed=seed)
 
-    def testing(self):
+    def testing(self, remove_comments: bool = True):
         """Control included documents for testing."""
         ly = Path("exercise.ly")
         ly.write_text(exercise_ly_contents)
@@ -141,8 +154,9 @@ class Compiler(LiveCompiler):
         self.configuration["interval-count"] = "3"
         self.configuration["points"] = "2"
         self.configuration["document-name"] = "test"
-        self.configuration["remove_comments"] = True
+        self.configuration["remove_comments"] = remove_comments
         self.configuration["unique_exercise_placeholders"] = False
+        self.configuration["remember_answers"] = False
 
         self.configuration.validate()
 
@@ -233,3 +247,209 @@ This exercise has 3 intervals.
         Path("exercise-1.ly"): exercise_ly_contents,
         Path("exercise-2.ly"): exercise_ly_contents,
     }
+
+
+def test_raw_supplements():
+    c = Compiler(Configuration())
+    c.testing(remove_comments=False)
+    c.compile()
+
+    # supplements without placeholders are copied as they are
+    assert isinstance(c.jobs[Path("exercise-1.ly")], RawFile)
+    assert isinstance(c.exercises[0].supplements[0], RawFile)
+    assert c.exercises[0].supplements[0].path == Path("exercise.ly").resolve()
+
+
+def test_precompiled_preamble(tmp_path, monkeypatch):
+    monkeypatch.setattr(Compiler, "formats_path", tmp_path)
+    c = Compiler(Configuration())
+    c.testing()
+    c.configuration["precompile_preamble"] = True
+    c.configuration["format_command"] = "cp {source} {jobname}.fmt"
+    c.compile()
+
+    format_file = tmp_path / (
+        c.preamble.format_name(c.configuration.format_command) + ".fmt"
+    )
+    assert c.jobs[Path(format_file.name)] == format_file
+    assert c.document.startswith("%&" + format_file.stem + "\n")
+    assert r"\newcounter{exerciseCounter}" not in c.document
+    assert r"\newcommand{\header}[]{Defined in the header.}" in c.document
+
+
+def test_shared_assets(tmp_path, monkeypatch):
+    c = Compiler(Configuration())
+    c.testing()
+    c.configuration["shared_assets"] = True
+    c.compile()
+
+    preamble = Path("shared") / (c.preamble.fingerprint[:16] + ".tex")
+    assert c.jobs[preamble] == c.preamble.contents
+    assert "\\input{%s}\n" % preamble.as_posix() in c.document
+    assert r"\newcounter{exerciseCounter}" not in c.document
+    assert r"\newcommand{\lorem}[]{Defined in the exercise.}" not in c.document
+
+    monkeypatch.chdir(tmp_path)
+    LiveCompiler.work_jobs(c)
+
+    one = Path("exercise-1.ly")
+    two = Path("exercise-2.ly")
+    assert one.read_text() == exercise_ly_contents
+    assert two.read_text() == exercise_ly_contents
+    assert Path("test.tex").read_text() == c.document
+    assert len(list(Path("shared").iterdir())) == 4
+
+
+def test_outputs():
+    c = Compiler(Configuration())
+    c.testing()
+    c.configuration["outputs"] = ["solutions"]
+    OutputsValidator().run(c.configuration)
+    c.header._contents = c.header.contents.replace(
+        "Hello, <<planet>>!",
+        "%<*solutions>\nSolutions\n%</solutions>\n"
+        "%<*!solutions>\nHello, <<planet>>!\n%</!solutions>",
+    )
+    c.compile()
+
+    student = c.jobs[Path("test.tex")]
+    solutions = c.jobs[Path("test-solutions.tex")]
+    assert c.documents == [Path("test.tex"), Path("test-solutions.tex")]
+    assert "Hello, Pluto!" in student and "Solutions" not in student
+    assert "Solutions" in solutions and "Hello, Pluto!" not in solutions
+    assert "%<" not in student + solutions
+
+    # The rest is rendered once and shared
+    assert student.replace("Hello, Pluto!", "Solutions") == solutions
+
+
+def test_variants(tmp_path, monkeypatch):
+    def prompt(question, answers):
+        answers[question["name"]] = "3"
+
+    monkeypatch.setattr("craft_documents.common.Prompter.prompt", prompt)
+
+    c = Compiler(Configuration(), seed=7)
+    c.testing()
+    c.configuration["craft-exercises"] = ["1 from interval*"]
+    CraftExercisesValidator().run(c.configuration)
+    c._exercises = c.draw_exercises()
+
+    with pytest.raises(Exception):
+        c.draw("interval*", 2)
+
+    monkeypatch.chdir(tmp_path)
+    c.work_jobs = lambda: LiveCompiler.work_jobs(c)  # type: ignore
+    c.compile_variants(2)
+
+    for name in ["test-1", "test-2"]:
+        document = Path(name) / "test.tex"
+        assert "This exercise has 3 intervals." in document.read_text()
+        assert (Path(name) / "intervals.ly").is_file()
+
+    manifest = json.loads(Path("test-variants.json").read_text())
+    assert manifest == {
+        "seed": 7,
+        "variants": {"test-1": ["intervals"], "test-2": ["intervals"]},
+    }
+
+
+def test_variants_pool(tmp_path, monkeypatch):
+    pool = tmp_path / "pool"
+    pool.mkdir()
+    for name in "abcde":
+        (pool / ("cadence-%s.tex" % name)).write_text(
+            "\\begin{document}\nCadence %s\n\\end{document}\n" % name
+        )
+
+    def draw(seed: int, folder: str) -> dict[str, list[str]]:
+        c = Compiler(Configuration(), seed=seed)
+        c.testing()
+        c.template_manager._exercises = [
+            LiveExercise(path, c.configuration) for path in sorted(pool.iterdir())
+        ]
+        c.configuration["craft-exercises"] = ["2 from cadence-*"]
+        CraftExercisesValidator().run(c.configuration)
+        c._exercises = c.draw_exercises()
+        c.disambiguate_exercises()
+
+        c.work_jobs = lambda: LiveCompiler.work_jobs(c)  # type: ignore
+        (tmp_path / folder).mkdir()
+        with monkeypatch.context() as context:
+            context.chdir(tmp_path / folder)
+            c.compile_variants(4)
+        return json.loads((tmp_path / folder / "test-variants.json").read_text())[
+            "variants"
+        ]
+
+    variants = draw(7, "first")
+    drawn = [tuple(exercises) for exercises in variants.values()]
+    assert all(len(set(exercises)) == 2 for exercises in drawn)
+    assert len(set(drawn)) > 1
+    document = tmp_path / "first/test-1/test.tex"
+    assert "Cadence %s" % drawn[0][0][-1] in document.read_text()
+
+    # the same seed draws the same exercises, another seed doesn't
+    assert draw(7, "second") == variants
+    assert draw(8, "third") != variants
+
+
+def test_variants_stream_supplements(tmp_path, monkeypatch):
+    (tmp_path / "cadence.tex").write_text(
+        "\\iffalse\nsupplements:\n    - cadence.ly\n\\fi\n"
+        "\\begin{document}\nCadence\n\\end{document}\n"
+    )
+    (tmp_path / "cadence.ly").write_text("% <<points>> points\n{ c f g c }\n")
+
+    streamed = []
+    original = LiveTemplate.stream
+
+    def stream(self, write):
+        streamed.append(self)
+        original(self, write)
+
+    monkeypatch.setattr(LiveTemplate, "stream", stream)
+
+    c = Compiler(Configuration(), seed=7)
+    c.testing(remove_comments=False)
+    c.configuration["memory_map_threshold"] = 1
+    parsed = LiveExercise(tmp_path / "cadence.tex", c.configuration)
+    c.template_manager._exercises = [parsed]
+    c.configuration["craft-exercises"] = ["1 from cadence"]
+    CraftExercisesValidator().run(c.configuration)
+    c._exercises = c.draw_exercises()
+    c.disambiguate_exercises()
+
+    c.work_jobs = lambda: LiveCompiler.work_jobs(c)  # type: ignore
+    with monkeypatch.context() as context:
+        context.chdir(tmp_path)
+        c.compile_variants(2)
+
+    # every drawn clone maps the supplement again and streams it
+    assert len(streamed) == 2
+    assert all(supplement is not parsed.supplements[0] for supplement in streamed)
+    assert parsed.supplements[0].is_memory_mapped
+    for name in ["test-1", "test-2"]:
+        supplement = tmp_path / name / "cadence.ly"
+        assert supplement.read_text() == "% 2 points\n{ c f g c }\n"
+
+
+def test_tree_shake_preamble():
+    c = Compiler(Configuration())
+    c.testing()
+    c.configuration["tree_shake_preamble"] = True
+    c.preamble._contents += "\\newcommand{\\unused}{}\n"
+    c.compile()
+
+    assert "\\unused" not in c.document
+    assert r"\newcommand{\exercise}[2]{%" in c.document
+
+    c = Compiler(Configuration())
+    c.testing()
+    c.configuration["tree_shake_preamble"] = True
+    c.configuration["protected_macros"] = ["\\unused"]
+    ProtectedMacrosValidator().run(c.configuration)
+    c.preamble._contents += "\\newcommand{\\unused}{}\n"
+    c.compile()
+
+    assert "\\unused" in c.document
@@ -0,0 +1,118 @@
+from craft_documents.new.Declarations import Declarations
+
+preamble = r"""\documentclass{scrreport}
+\usepackage[ngerman]{babel}
+\usepackage{amsmath,graphicx}
+
+\newcommand{\points}[1]{%
+  (#1 Punkte)}
+"""
+
+
+def test_split():
+    assert Declarations.split(preamble) == [
+        "\\documentclass{scrreport}\n",
+        "\\usepackage[ngerman]{babel}\n",
+        "\\usepackage{amsmath,graphicx}\n",
+        "\n",
+        "\\newcommand{\\points}[1]{%\n  (#1 Punkte)}\n",
+    ]
+
+
+def test_duplicates():
+    d = Declarations()
+    p = d.add(preamble)
+    one = d.add("\\usepackage{graphicx}\n\\newcommand{\\points}[1]{(#1 Punkte)}\n")
+    two = d.add("\\newcommand{\\lorem}{Lorem}\n\n% a comment\n")
+    three = d.add("\\newcommand{\\lorem}{Lorem}  % the same\n")
+
+    assert d.render(p) == preamble
+    assert d.render(one) == ""
+    assert d.render(two) == "\\newcommand{\\lorem}{Lorem}\n\n% a comment\n"
+    assert d.render(three) == ""
+
+
+def test_repeated_statements():
+    d = Declarations()
+    section = "\\makeatletter\n\\def\\@points{}\n\\makeatother\n\\setlength{\\parindent}{0pt}\n"
+    one = d.add(section)
+    two = d.add(section)
+
+    assert d.render(one) == section
+    # Only the definition is dropped
+    assert (
+        d.render(two)
+        == "\\makeatletter\n\\makeatother\n\\setlength{\\parindent}{0pt}\n"
+    )
+
+
+def test_packages():
+    d = Declarations()
+    p = d.add(preamble)
+    one = d.add("\\usepackage[dvipsnames]{xcolor}\n\\usepackage{babel}\n")
+    two = d.add("\\usepackage[table,dvipsnames]{xcolor}\n")
+    three = d.add("\\usepackage[final]{graphicx,lilyglyphs}\n")
+
+    assert d.render(one) == "\\usepackage[dvipsnames,table]{xcolor}\n"
+    assert d.render(two) == ""
+    # `graphicx` was loaded together with `amsmath` and is loaded again
+    assert d.render(three) == "\\usepackage[final]{graphicx,lilyglyphs}\n"
+    assert d.render(p) == preamble
+
+
+def test_frozen():
+    d = Declarations()
+    d.add(preamble, frozen=True)
+    one = d.add("\\usepackage[english,ngerman]{babel}\n")
+
+    assert d.render(one) == "\\usepackage[english,ngerman]{babel}\n"
+
+
+def test_shake():
+    d = Declarations()
+    p = d.add(r"""\documentclass{scrreport}
+\newcommand{\points}[1]{(#1 \unit)}
+\newcommand\unit{Punkte}
+\newcommand{\unused}{\alsounused}
+\def\alsounused{}
+\newenvironment{solution}{\begin{quote}}{\end{quote}}
+\newenvironment{hint}{}{}
+\AtBeginDocument{\kept}
+\newcommand{\kept}{}
+\newcommand{\protected}{}
+""")
+    h = d.add("\\newcommand{\\total}{\\points{10}}\n")
+
+    dropped = d.shake(p, "\\begin{solution}\\total\\end{solution}", ("protected",))
+    assert sorted(dropped) == ["\\alsounused", "\\unused", "{hint}"]
+    assert d.render(p) == (r"""\documentclass{scrreport}
+\newcommand{\points}[1]{(#1 \unit)}
+\newcommand\unit{Punkte}
+\newenvironment{solution}{\begin{quote}}{\end{quote}}
+\AtBeginDocument{\kept}
+\newcommand{\kept}{}
+\newcommand{\protected}{}
+""")
+    assert d.render(h) == "\\newcommand{\\total}{\\points{10}}\n"
+
+
+def test_shake_protected():
+    d = Declarations()
+    p = d.add("\\newcommand{\\points}[1]{\\fmt{#1}}\n\\newcommand{\\fmt}[1]{#1}\n")
+
+    # The dependencies of protected macros are kept as well
+    assert d.shake(p, "", ("points",)) == []
+    assert (
+        d.render(p)
+        == "\\newcommand{\\points}[1]{\\fmt{#1}}\n\\newcommand{\\fmt}[1]{#1}\n"
+    )
+
+
+def test_shake_several_definitions():
+    d = Declarations()
+    section = "\\newcommand{\\a}{x}\\newcommand{\\b}{y}\n\\newcommand{\\c}{z}\n"
+    p = d.add(section)
+
+    # The statement defining `\b` is kept with `\a`
+    assert d.shake(p, "\\b") == ["\\c"]
+    assert d.render(p) == "\\newcommand{\\a}{x}\\newcommand{\\b}{y}\n"
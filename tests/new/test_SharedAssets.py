@@ -0,0 +1,44 @@
+from pathlib import Path
+
+from craft_documents.new.SharedAssets import SharedAssets
+
+
+def test_store(tmp_path):
+    s = SharedAssets(tmp_path / "shared")
+
+    asset = s.store("Hello, world!", ".tex")
+    assert asset == s.address("Hello, world!", ".tex")
+    assert asset.parent == s.path
+    assert asset.read_text() == "Hello, world!"
+
+    # existing assets are not written again
+    modified = asset.stat().st_mtime_ns
+    assert s.store("Hello, world!", ".tex") == asset
+    assert asset.stat().st_mtime_ns == modified
+
+    assert s.store("Hello, world!", ".ly") != asset
+    assert s.store("Hello, planet!", ".tex") != asset
+    assert len(list(s.path.iterdir())) == 3
+
+
+def test_provide(tmp_path):
+    s = SharedAssets(tmp_path / "shared")
+    one = tmp_path / "one.ly"
+    two = tmp_path / "two.ly"
+
+    s.provide(one, "{ c d e f }")
+    s.provide(two, "{ c d e f }")
+
+    assert one.read_text() == "{ c d e f }"
+    assert len(list(s.path.iterdir())) == 1
+
+    # editing a target doesn't change the asset or the other targets
+    one.write_text("{ g a b c }")
+    assert two.read_text() == "{ c d e f }"
+    assert s.address("{ c d e f }", ".ly").read_text() == "{ c d e f }"
+
+    # targets in the shared folder are only stored
+    asset = s.address("\\newcommand{\\lorem}{}", ".tex")
+    s.provide(asset, "\\newcommand{\\lorem}{}")
+    assert asset.is_file()
+    assert len(list(s.path.iterdir())) == 2
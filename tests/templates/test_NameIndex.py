@@ -0,0 +1,91 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from craft_documents.templates.NameIndex import NameIndex
+from craft_documents.templates.TemplateManager import TemplateManager
+from craft_documents.configuration.Configuration import Configuration
+
+
+def create_library(folder: Path):
+    for directory in ["preambles", "headers", "exercises/harmony"]:
+        (folder / directory).mkdir(parents=True)
+    (folder / "preambles/default.tex").write_text(r"\documentclass{scrreport}")
+    (folder / "headers/exam.tex").write_text("<<craft-exercises>>")
+    (folder / "headers/worksheet.tex").write_text("<<craft-exercises>>")
+    (folder / "exercises/intervals.tex").write_text("")
+    (folder / "exercises/harmony/cadences.tex").write_text("")
+
+
+def index(folder: Path) -> NameIndex:
+    create_library(folder)
+    t = TemplateManager(Configuration(main=folder / "craftrc", root=folder, cwd=folder))
+    i = NameIndex(folder)
+    i.update(t)
+    return i
+
+
+def test_update(tmp_path):
+    i = index(tmp_path)
+    assert i.load() == {
+        "headers": ["exam", "worksheet"],
+        "exercises": ["harmony/cadences", "intervals"],
+        "preambles": ["default"],
+    }
+
+    # New templates in nested folders make the index stale
+    (tmp_path / "exercises/harmony/modulations.tex").write_text("")
+    assert i.load() is None
+
+
+def test_complete(tmp_path):
+    i = index(tmp_path)
+
+    bash = {
+        NameIndex.variable: "complete_bash",
+        "COMP_WORDS": "craft new ",
+        "COMP_CWORD": "2",
+    }
+    assert i.complete(bash) == "exam\nworksheet"
+    bash["COMP_WORDS"] = "craft new w"
+    assert i.complete(bash) == "worksheet"
+
+    zsh = {
+        NameIndex.variable: "complete_zsh",
+        "_TYPER_COMPLETE_ARGS": "craft new exam -e h",
+    }
+    assert i.complete(zsh) == "_arguments '*: :((\"harmony/cadences\"))'"
+
+    fish = {NameIndex.variable: "complete_fish", "_TYPER_COMPLETE_ARGS": "craft new "}
+    assert (
+        i.complete(fish)
+        == "exam\tCreate a new exam.\nworksheet\tCreate a new worksheet."
+    )
+
+    # Left to the CLI
+    assert i.complete(fish | {"_TYPER_COMPLETE_ARGS": "craft templates "}) is None
+    assert i.complete(fish | {"_TYPER_COMPLETE_ARGS": "craft new --"}) is None
+    assert NameIndex(tmp_path / "missing").complete(fish) is None
+
+
+def test_fast_path(tmp_path):
+    i = index(tmp_path / ".config/craft")
+
+    environment = os.environ | {
+        "HOME": str(tmp_path),
+        NameIndex.variable: "complete_bash",
+        "COMP_WORDS": "craft new e",
+        "COMP_CWORD": "2",
+    }
+    code = (
+        "import sys; from craft_documents.cli import main; main(); "
+        "print('typer' in sys.modules)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], env=environment, capture_output=True, text=True
+    )
+
+    # The completion is printed before the CLI is imported
+    assert result.stdout == "exam\nFalse\n"
+    assert i.load() is not None
@@ -1,5 +1,10 @@
+import zipfile
 from pathlib import Path
 
+import pytest
+
+from craft_documents.common.ArchiveStorage import ArchiveStorage
+from craft_documents.common.MemoryStorage import MemoryStorage
 from craft_documents.templates.TemplateManager import TemplateManager
 from tests.common.test_common_Configuration import Configuration
 
@@ -21,3 +26,151 @@ def test_initialisation():
     assert len(t.preambles) > 0
     assert "default" in map(lambda p: p.name, t.preambles)
     assert all(map(lambda p: p.extension == ".tex", t.preambles))
+
+
+def test_template_library(tmp_path):
+    library = tmp_path / "library.zip"
+    with zipfile.ZipFile(library, "w") as archive:
+        for path in test_templates_dir.rglob("*.*"):
+            archive.write(path, path.relative_to(test_templates_dir))
+        archive.writestr("exercises/archived.tex", "<<semester>>")
+
+    c = Configuration(template_library=str(library))
+    assert isinstance(c.storage, ArchiveStorage)
+    storage = c.storage
+
+    # validating again keeps the open archive
+    c.validate()
+    assert c.storage is storage
+
+    t = TemplateManager(c)
+    assert "archived" in map(lambda e: e.name, t.exercises)
+    assert "exam" in map(lambda h: h.name, t.headers)
+
+
+def test_memory():
+    class MemoryConfiguration(Configuration):
+        _storage = MemoryStorage(
+            {
+                "headers/exam.tex": "<<craft-exercises>>",
+                "preambles/default.tex": r"\documentclass{scrreport}",
+                "exercises/": None,
+            },
+            root=test_templates_dir,
+        )
+
+    t = TemplateManager(MemoryConfiguration())
+    assert ["exam"] == [h.name for h in t.headers]
+    assert ["default"] == [p.name for p in t.preambles]
+    assert [] == t.exercises
+
+    t.new_exercise("intervals.tex", "<<semester>>")
+    assert not (test_templates_dir / "exercises/intervals.tex").read_text() == (
+        "<<semester>>"
+    )
+    assert ["intervals"] == [
+        e.name for e in TemplateManager(MemoryConfiguration()).exercises
+    ]
+
+
+def test_unsafe_expression(capsys):
+    class UnsafeConfiguration(Configuration):
+        _storage = MemoryStorage(
+            {
+                "headers/exam.tex": "<<craft-exercises>>",
+                "preambles/default.tex": r"\documentclass{scrreport}",
+                "exercises/intervals.tex": "<<semester>>",
+                "exercises/unsafe.tex": (
+                    "\\iffalse\n"
+                    "semester:\n"
+                    "    validate: 'lambda answer: open(answer)'\n"
+                    "\\fi\n"
+                    "<<semester>>\n"
+                ),
+            },
+            root=test_templates_dir,
+        )
+
+    t = TemplateManager(UnsafeConfiguration(allow_eval=True, restrict_eval=True))
+
+    # the template is skipped instead of failing every command
+    assert [e.name for e in t.exercises] == ["intervals"]
+    assert "unsafe.tex" in capsys.readouterr().out
+
+
+class LibraryConfiguration(Configuration):
+    """A configuration with a synthetic library of 100 exercises."""
+
+    _storage = MemoryStorage(
+        {
+            "headers/exam.tex": "<<craft-exercises>>",
+            "preambles/default.tex": r"\documentclass{scrreport}",
+        }
+        | {
+            "exercises/%03d.tex" % i: "%% <<semester>>\nExercise <<number>>"
+            for i in reversed(range(100))
+        },
+        root=test_templates_dir,
+    )
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_parallel_parsing(executor):
+    sequential = TemplateManager(LibraryConfiguration(parse_workers=1))
+    parallel = TemplateManager(
+        LibraryConfiguration(parse_workers=4, parse_executor=executor)
+    )
+
+    names = ["%03d" % i for i in range(100)]
+    assert [e.name for e in sequential.exercises] == names
+    assert [e.name for e in parallel.exercises] == names
+    assert [h.name for h in parallel.headers] == ["exam"]
+
+    exercise = parallel.exercises[42]
+    assert exercise.configuration is parallel.configuration
+    assert exercise.placeholders == {"semester", "number"}
+    assert {p["name"] for p in exercise.prompts} == {"semester", "number"}
+    assert exercise.contents == sequential.exercises[42].contents
+
+
+class NestedConfiguration(Configuration):
+    _storage = MemoryStorage(
+        {
+            "headers/exam.tex": "<<craft-exercises>>",
+            "preambles/default.tex": r"\documentclass{scrreport}",
+            "exercises/intervals.tex": "<<semester>>",
+            "exercises/harmony/cadences/v-i.tex": "V-I",
+            "exercises/harmony/cadences/draft.tex": "",
+            "exercises/harmony/.craftignore": "draft.tex",
+        },
+        root=test_templates_dir,
+    )
+
+
+def test_nested_exercises():
+    c = NestedConfiguration(**{"craft-exercises": ["harmony/cadences/v-i"]})
+    t = TemplateManager(c)
+
+    assert [e.name for e in t.exercises] == ["harmony/cadences/v-i", "intervals"]
+    assert c.craft_exercises["harmony/cadences/v-i"]["path"] == t.exercises[0].path
+
+
+def test_new_nested_exercise(monkeypatch):
+    from craft_documents.templates.new import main
+
+    class NewConfiguration(Configuration):
+        _storage = MemoryStorage(
+            {"exercises/v-i.tex": "V-I", "exercises/harmony/ii-v.tex": "ii-V"},
+            root=test_templates_dir,
+        )
+
+    t = TemplateManager(NewConfiguration())
+    monkeypatch.setattr(main, "template_manager", t)
+    monkeypatch.setenv("EDITOR", "true")
+    main.create_template_exercise("harmony/v-i")
+
+    # The exercise is created in its subfolder
+    assert "\\begin{document}" in t.storage.read_text(
+        t.exercises_path / "harmony/v-i.tex"
+    )
+    assert t.storage.read_text(t.exercises_path / "v-i.tex") == "V-I"
@@ -0,0 +1,181 @@
+import hashlib
+import json
+import threading
+import zipfile
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+from craft_documents.common.MemoryStorage import MemoryStorage
+from craft_documents.templates.GitHubSource import GitHubSource
+from craft_documents.templates.sources import create_source
+from craft_documents.templates.TemplateManager import TemplateManager
+from craft_documents.templates.TemplateSync import TemplateSync
+from tests.common.test_common_Configuration import Configuration
+
+test_templates_dir = Path("config.craft").resolve()
+
+
+class GitHubHandler(BaseHTTPRequestHandler):
+    """Stand-in for the GitHub API that honors `If-None-Match`."""
+
+    files: dict[str, str] = {}
+    transfers: Counter = Counter()
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        url = "http://%s:%d" % self.server.server_address
+        prefix = "/repos/owner/repo/contents/"
+
+        if self.path.startswith(prefix):
+            directory = self.path.removeprefix(prefix)
+            listing = [
+                {
+                    "name": name.split("/")[1],
+                    "type": "file",
+                    "sha": hashlib.sha1(contents.encode()).hexdigest(),
+                    "download_url": url + "/raw/" + name,
+                }
+                for name, contents in sorted(self.files.items())
+                if name.startswith(directory + "/")
+            ]
+            self.respond(json.dumps(listing))
+        elif self.path.removeprefix("/raw/") in self.files:
+            self.respond(self.files[self.path.removeprefix("/raw/")])
+        else:
+            self.send_response(404)
+            self.end_headers()
+
+    def respond(self, body: str):
+        etag = '"%s"' % hashlib.sha256(body.encode()).hexdigest()
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        self.transfers[self.path] += 1
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body.encode())))
+        self.end_headers()
+        self.wfile.write(body.encode())
+
+
+@pytest.fixture
+def api():
+    GitHubHandler.files = {
+        "preambles/default.tex": r"\documentclass{scrreport}",
+        "headers/exam.tex": "<<craft-exercises>>",
+        "exercises/intervals.tex": "<<semester>>",
+        "exercises/cadences.tex": "V-I",
+    }
+    GitHubHandler.transfers = Counter()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), GitHubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield "http://%s:%d" % server.server_address
+    server.shutdown()
+    server.server_close()
+
+
+def template_manager() -> TemplateManager:
+    class MemoryConfiguration(Configuration):
+        _storage = MemoryStorage({"exercises/cadences.tex": "V-I"}, test_templates_dir)
+
+    return TemplateManager(MemoryConfiguration())
+
+
+def sync(t: TemplateManager, api: str):
+    return TemplateSync(t, [GitHubSource("owner", "repo", api=api)]).sync()
+
+
+def test_sync(api):
+    t = template_manager()
+
+    report = sync(t, api)
+    assert report.added == ["headers/exam.tex", "exercises/intervals.tex"]
+    # The configuration created the same default preamble
+    assert report.unchanged == ["preambles/default.tex", "exercises/cadences.tex"]
+    assert report.changed == report.kept == report.failed == []
+    assert t.storage.read_text(t.headers_path / "exam.tex") == "<<craft-exercises>>"
+
+    manifest = json.loads(t.storage.read_text(test_templates_dir / ".manifest.json"))
+    assert manifest["files"]["headers/exam.tex"]["sha256"] == (
+        hashlib.sha256(b"<<craft-exercises>>").hexdigest()
+    )
+
+
+def test_repeated_sync(api):
+    t = template_manager()
+    sync(t, api)
+    transfers = sum(GitHubHandler.transfers.values())
+
+    report = sync(t, api)
+    assert report.added == report.changed == []
+    assert len(report.unchanged) == 4
+
+    # The listings are answered with 304 and no file is requested
+    assert sum(GitHubHandler.transfers.values()) == transfers
+
+
+def test_changes(api):
+    t = template_manager()
+    sync(t, api)
+
+    GitHubHandler.files["headers/exam.tex"] = "<<semester>> <<craft-exercises>>"
+    GitHubHandler.files["exercises/intervals.tex"] = "<<semester>> <<date>>"
+    t.storage.write_text(t.exercises_path / "intervals.tex", "local changes")
+
+    report = sync(t, api)
+    assert report.changed == ["headers/exam.tex"]
+    assert report.kept == ["exercises/intervals.tex"]
+    assert t.storage.read_text(t.exercises_path / "intervals.tex") == "local changes"
+
+
+def test_sources(api, tmp_path):
+    mirror = tmp_path / "mirror"
+    (mirror / "headers").mkdir(parents=True)
+    (mirror / "headers/exam.tex").write_text("mirrored <<craft-exercises>>")
+
+    library = tmp_path / "library.zip"
+    with zipfile.ZipFile(library, "w") as archive:
+        archive.writestr("headers/exam.tex", "archived <<craft-exercises>>")
+        archive.writestr("exercises/archived.tex", "<<semester>>")
+
+    assert isinstance(create_source("github:owner/repo", tmp_path), GitHubSource)
+    sources = [
+        create_source("mirror", tmp_path),
+        create_source(library.as_uri(), tmp_path),
+        GitHubSource("owner", "repo", api=api),
+    ]
+
+    t = template_manager()
+    report = TemplateSync(t, sources).sync()
+    assert report.added == [
+        "headers/exam.tex",
+        "exercises/archived.tex",
+        "exercises/intervals.tex",
+    ]
+
+    # The first source wins
+    header = t.storage.read_text(t.headers_path / "exam.tex")
+    assert header == "mirrored <<craft-exercises>>"
+
+    manifest = json.loads(t.storage.read_text(test_templates_dir / ".manifest.json"))
+    assert manifest["files"]["headers/exam.tex"]["source"] == "mirror"
+    assert manifest["files"]["exercises/archived.tex"]["source"] == library.as_uri()
+
+    (mirror / "headers/exam.tex").write_text("updated <<craft-exercises>>")
+    report = TemplateSync(t, sources).sync()
+    assert report.changed == ["headers/exam.tex"]
+    assert report.added == []
+
+
+def test_missing_source(tmp_path):
+    with pytest.raises(Exception):
+        create_source("missing", tmp_path)